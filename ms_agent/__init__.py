@@ -1,2 +1,14 @@
 # Copyright (c) ModelScope Contributors. All rights reserved.
-from .agent.llm_agent import LLMAgent
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent.llm_agent import LLMAgent
+
+
+def __getattr__(name):
+    # Import the agent stack on first access only, so light entry points
+    # like `ms-agent --help` do not pay for it
+    if name == 'LLMAgent':
+        from .agent import llm_agent
+        return llm_agent.LLMAgent
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
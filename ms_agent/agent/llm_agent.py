@@ -2,9 +2,10 @@
 import asyncio
 import importlib
 import inspect
+import logging
 import os.path
+import secrets
 import sys
-import uuid
 from contextlib import contextmanager
 from copy import deepcopy
 from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, Union
@@ -13,7 +14,7 @@ import json
 from ms_agent.agent.runtime import Runtime
 from ms_agent.callbacks import Callback, callbacks_mapping
 from ms_agent.llm.llm import LLM
-from ms_agent.llm.utils import Message, ToolResult
+from ms_agent.llm.utils import Message, ToolCall, ToolResult
 from ms_agent.memory import Memory, get_memory_meta_safe, memory_mapping
 from ms_agent.memory.memory_manager import SharedMemoryManager
 from ms_agent.rag.base import RAG
@@ -21,7 +22,7 @@ from ms_agent.rag.utils import rag_mapping
 from ms_agent.tools import ToolManager
 from ms_agent.utils import async_retry, read_history, save_history
 from ms_agent.utils.constants import DEFAULT_TAG, DEFAULT_USER
-from ms_agent.utils.logger import get_logger
+from ms_agent.utils.logger import CONSOLE, get_logger
 from omegaconf import DictConfig, OmegaConf
 
 from ..config.config import Config, ConfigLifecycleHandler
@@ -82,6 +83,12 @@ class LLMAgent(Agent):
 
     DEFAULT_MAX_CHAT_ROUND = 20
 
+    # Number of pending streamed characters before stdout is flushed
+    STREAM_FLUSH_THRESHOLD = 64
+    # Number of pending streamed characters before they are logged even if
+    # the line is not finished
+    STREAM_LOG_THRESHOLD = 512
+
     TOTAL_PROMPT_TOKENS = 0
     TOTAL_COMPLETION_TOKENS = 0
     TOKEN_LOCK = asyncio.Lock()
@@ -118,6 +125,11 @@ class LLMAgent(Agent):
         self._last_skill_result = None
         self._skill_mode_active = False
 
+        # Arguments of the latest tool calls parsed in `handle_new_response`,
+        # reused by `parallel_tool_call` to avoid decoding them twice.
+        self._parsed_tool_calls: Optional[Tuple[List[ToolCall],
+                                                List[Any]]] = None
+
     def _get_skills_config(self) -> Optional[DictConfig]:
         """Get skills configuration from agent config."""
         if hasattr(self.config, 'skills') and self.config.skills:
@@ -225,7 +237,8 @@ class LLMAgent(Agent):
 
         # Use LLM analysis for ambiguous queries
         try:
-            needs_skills, _, _, _ = self._auto_skills._analyze_query(query)
+            needs_skills, _, _, _ = await asyncio.to_thread(
+                self._auto_skills._analyze_query, query)
             return needs_skills
         except Exception as e:
             logger.error(f'Skill analysis error: {e}')
@@ -498,27 +511,56 @@ class LLMAgent(Agent):
         Returns:
             List[Message]: Updated message list including tool responses.
         """
-        tool_call_result = await self.tool_manager.parallel_call_tool(
-            messages[-1].tool_calls)
-        assert len(tool_call_result) == len(messages[-1].tool_calls)
-        for tool_call_result, tool_call_query in zip(tool_call_result,
-                                                     messages[-1].tool_calls):
-            tool_call_result_format = ToolResult.from_raw(tool_call_result)
-            _new_message = Message(
-                role='tool',
-                content=tool_call_result_format.text,
-                tool_call_id=tool_call_query['id'],
-                name=tool_call_query['tool_name'],
-                resources=tool_call_result_format.resources)
-
-            if _new_message.tool_call_id is None:
-                # If tool call id is None, add a random one
-                _new_message.tool_call_id = str(uuid.uuid4())[:8]
-                tool_call_query['id'] = _new_message.tool_call_id
-            messages.append(_new_message)
-            self.log_output(_new_message.content)
+        tool_calls = messages[-1].tool_calls
+        parsed, self._parsed_tool_calls = self._parsed_tool_calls, None
+        if parsed is not None and parsed[0] is tool_calls:
+            tool_calls = [
+                dict(tool_call, arguments=arguments)
+                for tool_call, arguments in zip(tool_calls, parsed[1])
+            ]
+        # Results are logged as soon as each tool finishes, but appended
+        # to the history in the order of the tool calls
+        tool_messages: List[Optional[Message]] = [None] * len(tool_calls)
+        async for index, tool_call_result in self.tool_manager.stream_call_tool(
+                tool_calls):
+            tool_message = self._build_tool_message(
+                tool_call_result, messages[-1].tool_calls[index])
+            self.log_output(tool_message.content)
+            tool_messages[index] = tool_message
+        messages.extend(tool_messages)
         return messages
 
+    @staticmethod
+    def _build_tool_message(tool_call_result: Any,
+                            tool_call_query: ToolCall) -> Message:
+        """
+        Build the `tool` message answering a tool call.
+
+        Args:
+            tool_call_result (Any): The raw result returned by the tool manager.
+            tool_call_query (ToolCall): The tool call this result answers.
+
+        Returns:
+            Message: The tool message.
+        """
+        tool_call_result_format = ToolResult.from_raw(tool_call_result)
+        tool_name = tool_call_query['tool_name']
+        if isinstance(tool_name, str):
+            # The same few tool names repeat across the whole history
+            tool_name = sys.intern(tool_name)
+        _new_message = Message(
+            role='tool',
+            content=tool_call_result_format.text,
+            tool_call_id=tool_call_query['id'],
+            name=tool_name,
+            resources=tool_call_result_format.resources)
+
+        if _new_message.tool_call_id is None:
+            # If tool call id is None, add a random one
+            _new_message.tool_call_id = secrets.token_hex(4)
+            tool_call_query['id'] = _new_message.tool_call_id
+        return _new_message
+
     async def prepare_tools(self):
         """Initialize and connect the tool manager."""
         self.tool_manager = ToolManager(
@@ -689,34 +731,126 @@ class LLMAgent(Agent):
         Args:
             content (str): Content to log.
         """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        if (len(content) <= 256 and '\n' not in content
+                and '\\n' not in content):
+            # Short single-line content, nothing to truncate or split
+            logger.info('[%s] %s', self.tag, content)
+            return
         if len(content) > 1024:
             content = content[:512] + '\n...\n' + content[-512:]
-        for line in content.split('\n'):
-            for _line in line.split('\\n'):
-                logger.info(f'[{self.tag}] {_line}')
+        prefix = f'[{self.tag}] '
+        # Escaped newlines are rendered as line breaks, every line is prefixed
+        # with the tag, all of them emitted as a single record.
+        content = content.replace('\\n', '\n').replace('\n', '\n' + prefix)
+        logger.info('%s%s', prefix, content)
+
+    def _log_stream_output(self, content: str, final: bool = False) -> str:
+        """
+        Log the finished lines of a streamed response.
+
+        The streamed content is already written to stdout, so the records are
+        not echoed to the console, see `ms_agent.utils.logger.CONSOLE`.
+
+        Args:
+            content (str): The streamed content not logged yet.
+            final (bool): Whether the stream is finished, then everything is logged.
+
+        Returns:
+            str: The content kept for a later call.
+        """
+        if not final and len(content) < self.STREAM_LOG_THRESHOLD:
+            index = content.rfind('\n')
+            if index < 0:
+                return content
+            content, pending = content[:index], content[index + 1:]
+        else:
+            pending = ''
+        prefix = f'[{self.tag}] '
+        logger.info(
+            '%s%s',
+            prefix,
+            content.replace('\n', '\n' + prefix),
+            extra={CONSOLE: False})
+        return pending
+
+    @staticmethod
+    def _parse_tool_arguments(tool_call: ToolCall) -> Any:
+        """
+        Decode the JSON arguments of a tool call.
+
+        Args:
+            tool_call (ToolCall): The tool call generated by the LLM.
+
+        Returns:
+            Any: The decoded arguments, or the raw value if it is not a valid JSON string.
+        """
+        arguments = tool_call['arguments']
+        if isinstance(arguments, str):
+            try:
+                return json.loads(arguments)
+            except json.decoder.JSONDecodeError:
+                pass
+        return arguments
 
     def handle_new_response(self, messages: List[Message],
                             response_message: Message):
         assert response_message is not None, 'No response message generated from LLM.'
+        self._parsed_tool_calls = None
         if response_message.tool_calls:
-            self.log_output('[tool_calling]:')
+            log_enabled = logger.isEnabledFor(logging.INFO)
+            if log_enabled:
+                self.log_output('[tool_calling]:')
+            parsed_arguments = []
             for tool_call in response_message.tool_calls:
-                tool_call = deepcopy(tool_call)
-                if isinstance(tool_call['arguments'], str):
-                    try:
-                        tool_call['arguments'] = json.loads(
-                            tool_call['arguments'])
-                    except json.decoder.JSONDecodeError:
-                        pass
-                self.log_output(
-                    json.dumps(tool_call, ensure_ascii=False, indent=4))
+                # `arguments` must stay a string in the history, so the
+                # decoded value is kept aside for the tool calling
+                arguments = self._parse_tool_arguments(tool_call)
+                parsed_arguments.append(arguments)
+                if log_enabled:
+                    # Log the tool name and the decoded arguments only, as a
+                    # single compact line
+                    self.log_output(
+                        f'{tool_call["tool_name"]}({tool_call.get("id")}): '
+                        + json.dumps(arguments, ensure_ascii=False))
+            self._parsed_tool_calls = (response_message.tool_calls,
+                                       parsed_arguments)
 
         if messages[-1] is not response_message:
             messages.append(response_message)
 
-        if messages[-1].role == 'assistant' and not messages[
-                -1].content and response_message.tool_calls:
-            messages[-1].content = 'Let me do a tool calling.'
+        # `response_message` is the last message from here on
+        if (response_message.tool_calls
+                and response_message.role == 'assistant'
+                and not response_message.content):
+            response_message.content = 'Let me do a tool calling.'
+
+    async def _generate_stream(self, messages: List[Message],
+                               **kwargs) -> AsyncGenerator[Message, Any]:
+        """
+        Iterate a streaming LLM response without blocking the event loop.
+
+        `LLM.generate` is synchronous, both the request and each chunk pulled
+        from the returned generator are run in a worker thread, so other
+        coroutines sharing the loop can make progress between tokens.
+
+        Args:
+            messages (List[Message]): Current message history.
+            **kwargs: Extra arguments passed to `LLM.generate`.
+
+        Yields:
+            Message: The accumulated response message after each chunk.
+        """
+        iterator = await asyncio.to_thread(self.llm.generate, messages,
+                                           **kwargs)
+        sentinel = object()
+        while True:
+            response_message = await asyncio.to_thread(next, iterator,
+                                                       sentinel)
+            if response_message is sentinel:
+                break
+            yield response_message
 
     @async_retry(max_attempts=Agent.retry_count, delay=1.0)
     async def step(
@@ -744,29 +878,64 @@ class LLMAgent(Agent):
         Returns:
             List[Message]: Updated message history after this step.
         """
+        # Not a shallow copy: condensers rewrite messages in place, the
+        # caller's history and retried steps must keep the original content
         messages = deepcopy(messages)
         if (not self.load_cache) or messages[-1].role != 'assistant':
-            messages = await self.condense_memory(messages)
+            # Tool definitions do not depend on the condensed history, fetch
+            # them while the memory (maybe an LLM call) is refined
+            messages, tools = await asyncio.gather(
+                self.condense_memory(messages), self.tool_manager.get_tools())
             await self.on_generate_response(messages)
-            tools = await self.tool_manager.get_tools()
 
             if self.stream:
                 self.log_output('[assistant]:')
-                _content = ''
+                # Only the printed length is tracked, each chunk carries the
+                # accumulated content so the delta is sliced from it.
+                _content_len = 0
                 is_first = True
                 _response_message = None
-                for _response_message in self.llm.generate(
+                # Buffer the streamed deltas, only write to stdout on newlines
+                # or when enough characters are pending.
+                _buffer = []
+                _buffer_len = 0
+                # The streamed content is also logged, line by line
+                log_enabled = logger.isEnabledFor(logging.INFO)
+                _log_pending = ''
+                # Turns starting with tool calls produce no visible text
+                _to_stdout = True
+                async for _response_message in self._generate_stream(
                         messages, tools=tools):
                     if is_first:
                         messages.append(_response_message)
                         is_first = False
-                    new_content = _response_message.content[len(_content):]
-                    sys.stdout.write(new_content)
-                    sys.stdout.flush()
-                    _content = _response_message.content
                     messages[-1] = _response_message
+                    if (_to_stdout and _response_message.tool_calls
+                            and not _response_message.content):
+                        _to_stdout = False
+                    if not _to_stdout:
+                        yield messages
+                        continue
+                    new_content = _response_message.content[_content_len:]
+                    _content_len = len(_response_message.content)
+                    _buffer.append(new_content)
+                    _buffer_len += len(new_content)
+                    if ('\n' in new_content
+                            or _buffer_len >= self.STREAM_FLUSH_THRESHOLD):
+                        sys.stdout.write(''.join(_buffer))
+                        sys.stdout.flush()
+                        _buffer.clear()
+                        _buffer_len = 0
+                    if log_enabled and new_content:
+                        _log_pending = self._log_stream_output(_log_pending
+                                                               + new_content)
                     yield messages
-                sys.stdout.write('\n')
+                if _to_stdout:
+                    _buffer.append('\n')
+                    sys.stdout.write(''.join(_buffer))
+                    sys.stdout.flush()
+                if _log_pending:
+                    self._log_stream_output(_log_pending, final=True)
             else:
                 _response_message = self.llm.generate(messages, tools=tools)
                 if _response_message.content:
@@ -1,17 +1,12 @@
 # Copyright (c) ModelScope Contributors. All rights reserved.
 import argparse
 import asyncio
+import functools
 import os
 from importlib import resources as importlib_resources
 
-from ms_agent.config import Config
-from ms_agent.utils import get_logger, strtobool
-from ms_agent.utils.constants import AGENT_CONFIG_FILE, MS_AGENT_ASCII
-
 from .base import CLICommand
 
-logger = get_logger()
-
 
 def subparser_func(args):
     """ Function which will be called for a specific sub parser.
@@ -19,16 +14,19 @@ def subparser_func(args):
     return RunCMD(args)
 
 
+@functools.lru_cache(maxsize=1)
 def list_builtin_projects():
+    # Cached as a tuple, the packaged projects do not change during a run
     try:
         root = importlib_resources.files('ms_agent').joinpath('projects')
         if not root.exists():
-            return []
-        return sorted([p.name for p in root.iterdir() if p.is_dir()])
+            return ()
+        return tuple(sorted(p.name for p in root.iterdir() if p.is_dir()))
     except Exception as e:
         # Fallback: don't let help crash just because a resource is unavailable.
-        logger.warning(f'Could not list built-in projects: {e}')
-        return []
+        from ms_agent.utils import get_logger
+        get_logger().warning(f'Could not list built-in projects: {e}')
+        return ()
 
 
 def project_help_text():
@@ -133,13 +131,7 @@ class RunCMD(CLICommand):
                 'projects', project)
 
             if not project_trav.exists():
-                projects_root = importlib_resources.files('ms_agent').joinpath(
-                    'projects')
-                available = []
-                if projects_root.exists():
-                    available = [
-                        p.name for p in projects_root.iterdir() if p.is_dir()
-                    ]
+                available = list(list_builtin_projects())
                 raise ValueError(
                     f'Unknown project: {project}. Available: {available}')
 
@@ -150,6 +142,11 @@ class RunCMD(CLICommand):
         return self._execute_with_config()
 
     def _execute_with_config(self):
+        # Imported here to keep `ms-agent --help` and argument parsing light
+        from ms_agent.config import Config
+        from ms_agent.utils import strtobool
+        from ms_agent.utils.constants import AGENT_CONFIG_FILE, MS_AGENT_ASCII
+
         if not self.args.config:
             current_dir = os.getcwd()
             if os.path.exists(os.path.join(current_dir, AGENT_CONFIG_FILE)):
@@ -1,14 +1,20 @@
 # Copyright (c) ModelScope Contributors. All rights reserved.
 import argparse
+import hashlib
 import os
 import sys
-import threading
-import time
-import webbrowser
 from pathlib import Path
 
 from .base import CLICommand
 
+# Files and directories the frontend build depends on
+FRONTEND_BUILD_FILES = ('package.json', 'package-lock.json', 'index.html',
+                        'vite.config.ts', 'tsconfig.json',
+                        'tsconfig.node.json')
+FRONTEND_BUILD_DIRS = ('src', 'public')
+# Written into `dist` after a successful build, holds the sources fingerprint
+FRONTEND_BUILD_STAMP = '.build_stamp'
+
 
 def subparser_func(args):
     """ Function which will be called for a specific sub parser.
@@ -82,13 +88,11 @@ class UICMD(CLICommand):
             )
             sys.exit(1)
 
-        if not self.args.production and not frontend_built:
+        if not self.args.production and (
+                not frontend_built or self._frontend_outdated(frontend_dir)):
             if self._build_frontend(frontend_dir):
                 frontend_built = True
 
-        browser_host = 'localhost' if self.args.host == '0.0.0.0' else self.args.host
-        browser_url = f'http://{browser_host}:{self.args.port}'
-
         backend_str = str(backend_dir)
         if backend_str not in sys.path:
             sys.path.insert(0, backend_str)
@@ -110,14 +114,7 @@ class UICMD(CLICommand):
                 sys.argv.append('--reload')
 
             if not self.args.no_browser and frontend_built:
-
-                def open_browser():
-                    time.sleep(1.5)
-                    webbrowser.open(browser_url)
-
-                browser_thread = threading.Thread(
-                    target=open_browser, daemon=True)
-                browser_thread.start()
+                self._open_browser_later()
 
             main()
         except KeyboardInterrupt:
@@ -132,18 +129,56 @@ class UICMD(CLICommand):
             sys.argv = original_argv
             os.chdir(original_cwd)
 
-    def _build_frontend(self, frontend_dir: Path) -> bool:
-        import subprocess
+    def _open_browser_later(self):
+        """Open the WebUI in a browser once the server had time to start."""
+        # Only imported when a browser is requested, `webbrowser` probes
+        # the environment on import
+        import threading
+        import time
+        import webbrowser
 
-        try:
-            subprocess.run(['npm', '--version'],
-                           capture_output=True,
-                           check=True,
-                           timeout=5)
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError,
-                FileNotFoundError):
+        browser_host = 'localhost' if self.args.host == '0.0.0.0' else self.args.host
+        browser_url = f'http://{browser_host}:{self.args.port}'
+
+        def open_browser():
+            time.sleep(1.5)
+            webbrowser.open(browser_url)
+
+        threading.Thread(target=open_browser, daemon=True).start()
+
+    @staticmethod
+    def _frontend_stamp(frontend_dir: Path) -> str:
+        """Fingerprint the frontend sources, the stamp changes whenever a
+        source file is added, removed or modified."""
+        digest = hashlib.sha1()
+        for name in FRONTEND_BUILD_FILES:
+            file = frontend_dir / name
+            if file.is_file():
+                digest.update(name.encode())
+                digest.update(file.read_bytes())
+        for name in FRONTEND_BUILD_DIRS:
+            for file in sorted((frontend_dir / name).rglob('*')):
+                if file.is_file():
+                    stat = file.stat()
+                    digest.update(
+                        f'{file.relative_to(frontend_dir)}:{stat.st_mtime_ns}:'
+                        f'{stat.st_size}'.encode())
+        return digest.hexdigest()
+
+    def _frontend_outdated(self, frontend_dir: Path) -> bool:
+        """Whether the sources changed since the last build done by this command.
+
+        Builds without a stamp (e.g. done manually) are considered up to date.
+        """
+        stamp_file = frontend_dir / 'dist' / FRONTEND_BUILD_STAMP
+        if not stamp_file.is_file():
             return False
+        return stamp_file.read_text() != self._frontend_stamp(frontend_dir)
 
+    def _build_frontend(self, frontend_dir: Path) -> bool:
+        import subprocess
+
+        stamp = self._frontend_stamp(frontend_dir)
         node_modules = frontend_dir / 'node_modules'
         if not node_modules.exists():
             try:
@@ -153,7 +188,8 @@ class UICMD(CLICommand):
                                timeout=300,
                                stdout=subprocess.PIPE,
                                stderr=subprocess.PIPE)
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError,
+                    FileNotFoundError):
                 return False
 
         try:
@@ -163,6 +199,8 @@ class UICMD(CLICommand):
                            timeout=300,
                            stdout=subprocess.PIPE,
                            stderr=subprocess.PIPE)
-            return True
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError,
+                FileNotFoundError):
             return False
+        (frontend_dir / 'dist' / FRONTEND_BUILD_STAMP).write_text(stamp)
+        return True
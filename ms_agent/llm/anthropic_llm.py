@@ -1,3 +1,4 @@
+import functools
 import inspect
 from typing import Any, Dict, Generator, Iterator, List, Optional, Union
 
@@ -8,6 +9,13 @@ from ms_agent.utils.constants import get_service_config
 from omegaconf import DictConfig, OmegaConf
 
 
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str, base_url: Optional[str]):
+    """Share one client, and so its connection pool, per endpoint and key."""
+    import anthropic
+    return anthropic.Anthropic(api_key=api_key, base_url=base_url)
+
+
 class Anthropic(LLM):
 
     def __init__(
@@ -18,7 +26,6 @@ class Anthropic(LLM):
     ):
         super().__init__(config)
         assert_package_exist('anthropic', 'anthropic')
-        import anthropic
 
         self.model: str = config.llm.model
 
@@ -29,10 +36,7 @@ class Anthropic(LLM):
         if not api_key:
             raise ValueError('Anthropic API key is required.')
 
-        self.client = anthropic.Anthropic(
-            api_key=api_key,
-            base_url=base_url,
-        )
+        self.client = _get_client(api_key, base_url)
 
         self.args: Dict = OmegaConf.to_container(
             getattr(config, 'generation_config', DictConfig({})))
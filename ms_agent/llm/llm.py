@@ -1,4 +1,5 @@
 # Copyright (c) ModelScope Contributors. All rights reserved.
+import asyncio
 import os
 from abc import abstractmethod
 from typing import Any, Dict, List, Optional
@@ -41,6 +42,26 @@ class LLM:
         """
         pass
 
+    async def agenerate(self,
+                        messages: List[Message],
+                        tools: Optional[List[Tool]] = None,
+                        **kwargs) -> Any:
+        """Generate response by the given messages without blocking the event loop.
+
+        The default runs `generate` in a worker thread, subclasses backed by an
+        async client can override it to await the request directly.
+
+        Args:
+            messages(`List[Message]`): The previous messages.
+            tools(`List[Tool]`): The tools to use.
+            **kwargs: Extra generation arguments.
+
+        Returns:
+            The response.
+        """
+        return await asyncio.to_thread(
+            self.generate, messages=messages, tools=tools, **kwargs)
+
     @classmethod
     def from_task(cls,
                   config_dir_or_id: str,
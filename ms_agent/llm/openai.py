@@ -147,7 +147,9 @@ class OpenAIChat:
                     'total_tokens': chunk.usage.total_tokens
                 }
 
-            yield res_d
+            # A fresh dict per chunk, so that collected chunks are not all
+            # aliases of the last one and need no copying by the caller
+            yield dict(res_d)
 
     @staticmethod
     def aggregate_stream_chunks(
@@ -180,13 +182,16 @@ class OpenAIChat:
                 'total_tokens': 0
             },
         )
+        # Joined once at the end, growing the strings chunk by chunk copies
+        # the whole response on every chunk
+        reasoning_parts: List[str] = []
+        content_parts: List[str] = []
         for chunk_d in stream_chunks:
             res_d['role'] = chunk_d.get('role')
-            res_d['reasoning_content'] += chunk_d.get(
-                'reasoning_content',
-                '') if chunk_d.get('reasoning_content') is not None else ''
-            res_d['content'] += chunk_d.get(
-                'content', '') if chunk_d.get('content') is not None else ''
+            if chunk_d.get('reasoning_content') is not None:
+                reasoning_parts.append(chunk_d['reasoning_content'])
+            if chunk_d.get('content') is not None:
+                content_parts.append(chunk_d['content'])
 
             if chunk_d.get('tool_calls') is not None:
                 res_d['tool_calls'].extend(chunk_d.get('tool_calls', []))
@@ -202,6 +207,8 @@ class OpenAIChat:
                 res_d['usage']['total_tokens'] = chunk_d['usage'].get(
                     'total_tokens', 0)
 
+        res_d['reasoning_content'] = ''.join(reasoning_parts)
+        res_d['content'] = ''.join(content_parts)
         return res_d
 
     @staticmethod
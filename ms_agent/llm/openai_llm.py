@@ -1,6 +1,7 @@
 # Copyright (c) ModelScope Contributors. All rights reserved.
+import functools
 import inspect
-from copy import deepcopy
+from dataclasses import replace
 from typing import Any, Dict, Generator, Iterable, List, Optional
 
 from ms_agent.llm import LLM
@@ -15,6 +16,13 @@ from openai.types.chat.chat_completion_message_tool_call import (
 logger = get_logger()
 
 
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: Optional[str], base_url: Optional[str]):
+    """Share one client, and so its connection pool, per endpoint and key."""
+    import openai
+    return openai.OpenAI(api_key=api_key, base_url=base_url)
+
+
 class OpenAI(LLM):
     """Base Class for OpenAI SDK LLMs.
 
@@ -38,7 +46,6 @@ class OpenAI(LLM):
     ):
         super().__init__(config)
         assert_package_exist('openai')
-        import openai
         self.model: str = config.llm.model
         self.max_continue_runs = getattr(config.llm, 'max_continue_runs',
                                          None) or MAX_CONTINUE_RUNS
@@ -47,10 +54,7 @@ class OpenAI(LLM):
             None) or get_service_config('openai').base_url
         api_key = api_key or getattr(config.llm, 'openai_api_key', None)
 
-        self.client = openai.OpenAI(
-            api_key=api_key,
-            base_url=base_url,
-        )
+        self.client = _get_client(api_key, base_url)
         self.args: Dict = OmegaConf.to_container(
             getattr(config, 'generation_config', DictConfig({})))
 
@@ -164,7 +168,13 @@ class OpenAI(LLM):
         """
         if not pre_message_chunk:
             return message_chunk
-        message = deepcopy(pre_message_chunk)
+        # Only the tool calls are modified in place, copy them and share the
+        # rest. Text-only chunks carry no tool calls at all
+        tool_calls = pre_message_chunk.tool_calls
+        message = replace(
+            pre_message_chunk,
+            tool_calls=[dict(tool_call) for tool_call in tool_calls]
+            if tool_calls else tool_calls)
         message.reasoning_content += message_chunk.reasoning_content
         message.content += message_chunk.content
         if message_chunk.tool_calls:
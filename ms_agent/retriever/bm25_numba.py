@@ -0,0 +1,40 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import threading
+
+import numba
+import numpy as np
+
+# Parallel kernels must not be entered by two threads at once unless numba
+# runs on the tbb or omp threading layer, the default workqueue layer aborts
+_KERNEL_LOCK = threading.Lock()
+
+
+def bm25_score(query_ids: np.ndarray, offsets: np.ndarray, doc_ids: np.ndarray,
+               tfs: np.ndarray, idf: np.ndarray, len_norm: np.ndarray,
+               k1: float, out: np.ndarray):
+    """Accumulate the BM25 scores of `query_ids` into `out`.
+
+    The postings of term `t` live in `doc_ids[offsets[t]:offsets[t + 1]]` and
+    `tfs[offsets[t]:offsets[t + 1]]`, and `len_norm` holds the precomputed
+    `1 - b + b * doc_len / avgdl` of every document. Query terms are visited
+    one after the other and the postings of each term are split across
+    threads. Doc ids are unique within a posting list, so threads write to
+    distinct entries of `out` and no per-thread buffer is needed.
+
+    Safe to call from several threads, calls are serialized.
+    """
+    with _KERNEL_LOCK:
+        _bm25_score(query_ids, offsets, doc_ids, tfs, idf, len_norm, k1, out)
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def _bm25_score(query_ids, offsets, doc_ids, tfs, idf, len_norm, k1, out):
+    for qi in range(query_ids.shape[0]):
+        term_id = query_ids[qi]
+        weight = idf[term_id] * (k1 + 1)
+        start = offsets[term_id]
+        for i in numba.prange(offsets[term_id + 1] - start):
+            p = start + i
+            doc_id = doc_ids[p]
+            tf = tfs[p]
+            out[doc_id] += weight * tf / (tf + k1 * len_norm[doc_id])
@@ -1,8 +1,14 @@
 import asyncio
+import functools
+import hashlib
+import itertools
 import math
 import os
+import sys
 import threading
-from typing import List, Tuple
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 
 import faiss
 import numpy as np
@@ -12,76 +18,255 @@ os.environ['OMP_NUM_THREADS'] = '1'
 os.environ['MKL_NUM_THREADS'] = '1'
 os.environ['TOKENIZERS_PARALLELISM'] = 'false'
 
+# CPU dense indices shared by all retrievers of the process, keyed by encoder,
+# index configuration and corpus content. Indices are only read once built.
+# GPU copies are not shared, each retriever makes its own with its resources
+_DENSE_INDEX_CACHE: 'OrderedDict[Tuple, faiss.Index]' = OrderedDict()
+_DENSE_INDEX_CACHE_SIZE = 8
+_DENSE_INDEX_LOCK = threading.Lock()
+
+# Dense and sparse scoring of all retrievers, both release the GIL. Shared so
+# that retrievers need no shutdown, threads are only started on first use
+_SCORING_POOL = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix='HybridRetriever')
+
+
+def set_dense_index_cache_size(size: int):
+    """
+    Set how many dense indices are shared between retrievers.
+
+    Args:
+        size: Maximum number of cached indices, 0 disables the cache. The
+            least recently used indices are dropped first.
+    """
+    global _DENSE_INDEX_CACHE_SIZE
+    with _DENSE_INDEX_LOCK:
+        _DENSE_INDEX_CACHE_SIZE = max(0, size)
+        while len(_DENSE_INDEX_CACHE) > _DENSE_INDEX_CACHE_SIZE:
+            _DENSE_INDEX_CACHE.popitem(last=False)
+
+
+def clear_dense_index_cache():
+    """Drop the dense indices shared between retrievers."""
+    with _DENSE_INDEX_LOCK:
+        _DENSE_INDEX_CACHE.clear()
+
 
 class BM25Retriever:
     """
     Sparse retriever based on BM25 algorithm.
+
+    The index is kept as an inverted index of NumPy arrays: every term maps to
+    a posting list of document ids and term frequencies, so scoring a query
+    only touches the documents that contain its terms.
     """
 
     def __init__(self,
                  tokenized_corpus: List[List[str]],
                  k1: float = 1.5,
-                 b: float = 0.75):
+                 b: float = 0.75,
+                 backend: str = 'numpy'):
+        """
+        Args:
+            tokenized_corpus: Tokenized documents to index.
+            k1: BM25 k1 parameter.
+            b: BM25 b parameter.
+            backend: Scoring backend, `numpy` or `numba`. The numba backend
+                JIT-compiles a parallel scoring kernel and requires the
+                optional `numba` package.
+        """
+        if backend not in ('numpy', 'numba'):
+            raise ValueError(f'Unsupported BM25 backend: {backend}')
         self.k1 = k1
         self.b = b
+        self.backend = backend
         self.corpus_size = len(tokenized_corpus)
-        self.tokenized_corpus = tokenized_corpus
+
+        self._numba_score = None
+        if backend == 'numba':
+            try:
+                from ms_agent.retriever.bm25_numba import bm25_score
+            except ImportError as e:
+                raise ImportError(
+                    'The numba BM25 backend requires numba, '
+                    'please install it via `pip install numba`.') from e
+            self._numba_score = bm25_score
 
         self.avgdl = 0
-        self.idf = {}
-        self.doc_len = []
-        self.doc_term_freqs = []
-        self._initialize(self.tokenized_corpus)
+        self.token_to_id: Dict[str, int] = {}
+        # Flat postings: the postings of term t are
+        # doc_ids[offsets[t]:offsets[t + 1]] and tfs[offsets[t]:offsets[t + 1]]
+        self.offsets = np.zeros(1, dtype=np.int32)
+        self.doc_ids = np.empty(0, dtype=np.int32)
+        self.tfs = np.empty(0, dtype=np.float32)
+        self.postings: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.idf_arr = np.empty(0, dtype=np.float32)
+        self.doc_len = np.empty(0, dtype=np.float32)
+        self.len_norm = np.empty(0, dtype=np.float32)
+        # The tokenized corpus is not kept, the postings hold all we need
+        self._initialize(tokenized_corpus)
 
     def _initialize(self, tokenized_corpus: List[List[str]]):
-        """Calculate IDF and average document length."""
-        total_length = 0
-        doc_count = len(tokenized_corpus)
-
-        for doc_tokens in tokenized_corpus:
-            length = len(doc_tokens)
-            self.doc_len.append(length)
-            total_length += length
-
-            unique_tokens = set(doc_tokens)
-            for token in unique_tokens:
-                self.idf[token] = self.idf.get(token, 0) + 1
-
-        self.avgdl = total_length / doc_count if doc_count > 0 else 0
-
-        for word, freq in self.idf.items():
-            self.idf[word] = math.log((self.corpus_size - freq + 0.5)
-                                      / (freq + 0.5) + 1)
-
-        for doc_tokens in tokenized_corpus:
-            freqs = {}
-            for token in doc_tokens:
-                freqs[token] = freqs.get(token, 0) + 1
-            self.doc_term_freqs.append(freqs)
-
-    def get_scores(self, tokenized_query: List[str]) -> List[float]:
-        scores = [0.0] * self.corpus_size
-
-        for token in tokenized_query:
-            if token not in self.idf:
-                continue
-            idf_score = self.idf[token]
-            for index, doc_freqs in enumerate(self.doc_term_freqs):
-                freq = doc_freqs.get(token, 0)
-                if freq == 0: continue  # noqa: E701
-                doc_len = self.doc_len[index]
-                numerator = freq * (self.k1 + 1)
-                denominator = freq + self.k1 * (
-                    1 - self.b + self.b * (doc_len / self.avgdl))  # noqa: W504
-                scores[index] += idf_score * (numerator / denominator)
+        """Build the inverted index, IDF and document lengths."""
+        doc_len = [len(doc_tokens) for doc_tokens in tokenized_corpus]
+
+        # One (token, doc, tf) entry per distinct token of each document
+        pair_tokens: List[str] = []
+        pair_docs: List[int] = []
+        pair_tfs: List[int] = []
+        for doc_idx, doc_tokens in enumerate(tokenized_corpus):
+            counts = Counter(doc_tokens)
+            pair_tokens.extend(counts.keys())
+            pair_tfs.extend(counts.values())
+            pair_docs.extend(itertools.repeat(doc_idx, len(counts)))
+
+        self.token_to_id = {
+            token: term_id
+            for term_id, token in enumerate(dict.fromkeys(pair_tokens))
+        }
+        nnz = len(pair_tokens)
+        pair_term_ids = np.fromiter(
+            map(self.token_to_id.__getitem__, pair_tokens), np.int32, nnz)
+
+        self.doc_len = np.asarray(doc_len, dtype=np.float32)
+        self.avgdl = float(self.doc_len.mean()) if doc_len else 0
+        # Per-document length normalization of the BM25 denominator
+        self.len_norm = np.ones(self.corpus_size, dtype=np.float32)
+        if self.avgdl:
+            self.len_norm = 1 - self.b + self.b * self.doc_len / self.avgdl
+
+        # Group entries by term, a stable sort keeps postings in doc order
+        order = np.argsort(pair_term_ids, kind='stable')
+        doc_freqs = np.bincount(
+            pair_term_ids, minlength=len(self.token_to_id)).astype(np.int32)
+        self.offsets = np.zeros(len(doc_freqs) + 1, dtype=np.int32)
+        np.cumsum(doc_freqs, out=self.offsets[1:])
+        self.doc_ids = np.asarray(pair_docs, dtype=np.int32)[order]
+        self.tfs = np.asarray(pair_tfs, dtype=np.float32)[order]
+        # Per-term views into the flat arrays
+        self.postings = [
+            (self.doc_ids[start:end], self.tfs[start:end])
+            for start, end in zip(self.offsets[:-1], self.offsets[1:])
+        ]
+        self.idf_arr = np.log((self.corpus_size - doc_freqs + 0.5)
+                              / (doc_freqs + 0.5) + 1).astype(np.float32)
+
+        # Upper bound of each term's contribution, used by MaxScore pruning
+        self.max_score = np.zeros(len(doc_freqs), dtype=np.float32)
+        if nnz:
+            term_ids = np.repeat(
+                np.arange(len(doc_freqs), dtype=np.int32), doc_freqs)
+            contributions = self._term_scores(term_ids, self.doc_ids, self.tfs)
+            self.max_score = np.maximum.reduceat(contributions,
+                                                 self.offsets[:-1])
+
+    def _term_scores(self, term_id: Union[int, np.ndarray],
+                     doc_ids: np.ndarray, tfs: np.ndarray) -> np.ndarray:
+        """BM25 contribution of `term_id` to each of `doc_ids`."""
+        denominator = tfs + self.k1 * self.len_norm[doc_ids]
+        return self.idf_arr[term_id] * (tfs * (self.k1 + 1) / denominator)
+
+    def _query_term_ids(self, tokenized_query: List[str]) -> List[int]:
+        return [
+            self.token_to_id[token] for token in tokenized_query
+            if token in self.token_to_id
+        ]
+
+    def get_scores(self, tokenized_query: List[str]) -> np.ndarray:
+        scores = np.zeros(self.corpus_size, dtype=np.float32)
+
+        query_ids = self._query_term_ids(tokenized_query)
+
+        if self._numba_score is not None:
+            if query_ids:
+                query_ids = np.asarray(query_ids, dtype=np.int32)
+                self._numba_score(query_ids, self.offsets, self.doc_ids,
+                                  self.tfs, self.idf_arr, self.len_norm,
+                                  self.k1, scores)
+            return scores
+
+        for term_id in query_ids:
+            doc_ids, tfs = self.postings[term_id]
+            # Doc ids are unique within a posting list, no need for np.add.at
+            scores[doc_ids] += self._term_scores(term_id, doc_ids, tfs)
         return scores
 
+    def get_topk(self, tokenized_query: List[str],
+                 k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the `k` best scoring documents using MaxScore pruning.
+
+        Query terms are visited by descending score upper bound. Once the
+        bounds of the remaining terms cannot lift an unseen document into the
+        top-k, only the surviving candidates are looked up in the remaining
+        posting lists instead of scanning them.
+
+        Args:
+            tokenized_query: Tokenized query.
+            k: Number of documents to return.
+
+        Returns:
+            Tuple of (doc_ids, scores), sorted by score descending. Scores
+            are identical to `get_scores` for the returned documents.
+        """
+        term_counts = Counter(self._query_term_ids(tokenized_query))
+        if not term_counts or k <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        # A term repeated in the query contributes once per occurrence
+        terms = sorted(
+            term_counts.items(),
+            key=lambda item: self.max_score[item[0]] * item[1],
+            reverse=True)
+        bounds = np.asarray(
+            [self.max_score[term_id] * count for term_id, count in terms],
+            dtype=np.float32)
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1][1:], 0)
+
+        scores = np.zeros(self.corpus_size, dtype=np.float32)
+        candidates = np.empty(0, dtype=np.int32)
+        pruned = False
+        for i, (term_id, count) in enumerate(terms):
+            doc_ids, tfs = self.postings[term_id]
+            if pruned:
+                # Posting lists are sorted by doc id, look candidates up
+                pos = np.searchsorted(doc_ids, candidates)
+                pos[pos == len(doc_ids)] = 0
+                hit = doc_ids[pos] == candidates
+                doc_ids, tfs = candidates[hit], tfs[pos[hit]]
+            else:
+                unseen = doc_ids[scores[doc_ids] == 0]
+                candidates = np.concatenate((candidates, unseen))
+            scores[doc_ids] += count * self._term_scores(term_id, doc_ids, tfs)
+
+            if len(candidates) > k and remaining[i] > 0:
+                candidate_scores = scores[candidates]
+                threshold = np.partition(candidate_scores, -k)[-k]
+                if remaining[i] < threshold:
+                    pruned = True
+                    candidates = candidates[candidate_scores
+                                            + remaining[i] >= threshold]
+
+        candidate_scores = scores[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-candidate_scores[top], kind='stable')]
+        return candidates[top], candidate_scores[top]
+
 
 class HybridRetriever:
     """
     Hybrid retriever combining Dense Retrieval (FAISS) and Sparse Retrieval (BM25).
     """
 
+    # Corpus size from which `index_type='auto'` switches to HNSW
+    HNSW_MIN_DOCS = 2000
+    # Bits per product quantizer code for `index_type='ivfpq'`
+    PQ_NBITS = 8
+    EMBED_BATCH_SIZE = 256
+
     def __init__(
             self,
             corpus: List[str] = None,
@@ -89,7 +274,12 @@ class HybridRetriever:
         str = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',  # noqa
             tokenizer_model_id: str = 'Qwen/Qwen3-8B',
             bm25_k1: float = 1.5,
-            bm25_b: float = 0.75):
+            bm25_b: float = 0.75,
+            bm25_backend: str = 'numpy',
+            bm25_top_k: Optional[int] = None,
+            index_type: str = 'auto',
+            hnsw_ef_search: int = 64,
+            use_gpu: Optional[bool] = None):
         """
         Initialize Hybrid Retriever with both Dense and Sparse indices.
 
@@ -99,6 +289,20 @@ class HybridRetriever:
             tokenizer_model_id: Model ID for the tokenizer used in Sparse Retrieval.
             bm25_k1: BM25 k1 parameter.
             bm25_b: BM25 b parameter.
+            bm25_backend: BM25 scoring backend, `numpy` or `numba`.
+            bm25_top_k: If set, only the `bm25_top_k` best BM25 documents are
+                scored, with MaxScore pruning, the others count as 0. Faster
+                on large corpora, but the zeros shift the mean and std of the
+                Z-score normalization, so rankings may differ from exact
+                scoring. Defaults to scoring every document.
+            index_type: FAISS index for Dense Retrieval, one of `flat`
+                (exhaustive), `hnsw` (graph based), `ivf` (inverted lists),
+                `ivfpq` (inverted lists over product quantized codes, much
+                smaller in memory at some cost in recall) or `auto`, which
+                uses `hnsw` from 2000 documents on.
+            hnsw_ef_search: HNSW search depth, trades speed for recall.
+            use_gpu: Whether to move the FAISS index to GPU. Defaults to
+                using GPUs when FAISS sees any. HNSW indices stay on CPU.
 
         Attributes:
             self.corpus: The list of documents.
@@ -108,7 +312,8 @@ class HybridRetriever:
             self.bm25: BM25Retriever instance for sparse retrieval.
 
         Raises:
-            ValueError: If the corpus is empty.
+            ValueError: If the corpus is empty or the index type is unknown.
+            RuntimeError: If `use_gpu` is True but FAISS sees no GPU.
 
         Example:
             my_documents = [
@@ -138,16 +343,32 @@ class HybridRetriever:
             )
         """
         self.corpus = corpus
+        self._corpus_sig: Optional[Tuple[int, int]] = None
+        self.bm25_backend = bm25_backend
+        self.bm25_top_k = bm25_top_k
+        if index_type not in ('auto', 'flat', 'hnsw', 'ivf', 'ivfpq'):
+            raise ValueError(f'Unsupported index type: {index_type}')
+        self.index_type = index_type
+        self.hnsw_ef_search = hnsw_ef_search
+        self.use_gpu = use_gpu
+        self._gpu_res = None
 
         # Lock for corpus re-initialization (prevent concurrent modification)
         self._corpus_lock = threading.Lock()
+        # Dense and sparse scoring run side by side
+        self._pool = _SCORING_POOL
 
         # Initialize Tokenizer Utility
         print(f'Loading Tokenizer: {tokenizer_model_id}...')
         self.tokenizer_util = TokenizerUtil(model_id=tokenizer_model_id)
+        # Segmentation caches: hot queries, and documents of the current
+        # corpus so that re-indexing an edited corpus only segments new docs
+        self._segment_query = functools.lru_cache(maxsize=4096)(
+            self.tokenizer_util.segment)
+        self._doc_segments: Dict[str, List[str]] = {}
 
         # Initialize Dense Retriever (FAISS)
-        embed_model_path: str = self._load_model(
+        self._embed_model_path: str = self._load_model(
             model_id=embed_model,
             ignore_patterns=[
                 'openvino/*', 'onnx/*', 'pytorch_model.bin', 'rust_model.ot',
@@ -156,7 +377,13 @@ class HybridRetriever:
 
         from sentence_transformers import SentenceTransformer
 
-        self.embed_model = SentenceTransformer(embed_model_path)
+        self.embed_model = SentenceTransformer(self._embed_model_path)
+        if self.embed_model.device.type == 'cuda':
+            self.embed_model.half()
+        # Query embeddings only depend on the encoder, not on the corpus, so
+        # they stay valid across re-indexing
+        self._embed_query = functools.lru_cache(
+            maxsize=512)(lambda query: self._get_embeddings([query]))
         self.index = None
 
         self._init_corpus(
@@ -200,47 +427,161 @@ class HybridRetriever:
         if not corpus or len(corpus) <= 0:
             return
         self.corpus = corpus
+        self._corpus_sig = self._corpus_signature(corpus)
+
+        # Build the Sparse index (BM25) while the corpus is being encoded
+        sparse_future = self._pool.submit(self._build_sparse_index,
+                                          self.corpus, bm25_k1, bm25_b)
         self._build_dense_index(texts=self.corpus)
+        self.tokenized_corpus, self.bm25 = sparse_future.result()
+        self._doc_segments = dict(zip(self.corpus, self.tokenized_corpus))
 
-        # Initialize Sparse Retriever (BM25)
+    def _build_sparse_index(
+            self, corpus: List[str], bm25_k1: float,
+            bm25_b: float) -> Tuple[List[List[str]], BM25Retriever]:
+        """Segment `corpus` and build its BM25 index."""
         print('Building BM25 index...')
-        self.tokenized_corpus = [
-            self.tokenizer_util.segment(doc) for doc in self.corpus
+        # Interned tokens share one string object across the whole corpus
+        tokenized_corpus = [
+            self._doc_segments[doc] if doc in self._doc_segments else list(
+                map(sys.intern, self.tokenizer_util.segment(doc)))
+            for doc in corpus
         ]
-        self.bm25 = BM25Retriever(
-            tokenized_corpus=self.tokenized_corpus,
+        bm25 = BM25Retriever(
+            tokenized_corpus=tokenized_corpus,
             k1=bm25_k1,
             b=bm25_b,
+            backend=self.bm25_backend,
         )
         print('BM25 index built.')
+        return tokenized_corpus, bm25
 
     def _get_embeddings(self, texts: List[str]) -> np.ndarray:
-        embeddings = self.embed_model.encode(texts, convert_to_numpy=True)
-        return embeddings.astype('float32')
+        # Embeddings come out L2 normalized, ready for inner product search
+        embeddings = self.embed_model.encode(
+            texts,
+            batch_size=self.EMBED_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False)
+        return embeddings.astype('float32', copy=False)
 
     def _build_dense_index(self, texts: List[str]):
+        corpus_hash = hashlib.sha256()
+        for text in texts:
+            corpus_hash.update(text.encode('utf-8'))
+            corpus_hash.update(b'\0')
+        key = (self._embed_model_path, self.index_type, len(texts),
+               corpus_hash.hexdigest())
+        with _DENSE_INDEX_LOCK:
+            index = _DENSE_INDEX_CACHE.get(key)
+            if index is not None:
+                _DENSE_INDEX_CACHE.move_to_end(key)
+        if index is not None:
+            self.index = self._maybe_to_gpu(index)
+            print(f'Reusing Dense Retrieval index of {len(texts)} documents.')
+            return
+
         embeddings = self._get_embeddings(texts)
-        faiss.normalize_L2(embeddings)
-        self.index = faiss.IndexFlatIP(embeddings.shape[1])
-        self.index.add(embeddings)
+        index = self._create_dense_index(embeddings)
+        index.add(embeddings)
+        with _DENSE_INDEX_LOCK:
+            if _DENSE_INDEX_CACHE_SIZE > 0:
+                _DENSE_INDEX_CACHE[key] = index
+            while len(_DENSE_INDEX_CACHE) > _DENSE_INDEX_CACHE_SIZE:
+                _DENSE_INDEX_CACHE.popitem(last=False)
+        self.index = self._maybe_to_gpu(index)
         print(
             f'Successfully indexed {len(texts)} documents for Dense Retrieval.'
         )
 
+    def _create_dense_index(self, embeddings: np.ndarray) -> faiss.Index:
+        """
+        Create (and train, if needed) an inner product index for `embeddings`.
+
+        Args:
+            embeddings: L2 normalized document embeddings.
+
+        Returns:
+            An empty FAISS index ready for `add`.
+        """
+        num_docs, dim = embeddings.shape
+        index_type = self.index_type
+        if index_type == 'auto':
+            index_type = 'hnsw' if num_docs >= self.HNSW_MIN_DOCS else 'flat'
+        elif index_type == 'ivfpq' and num_docs < 2**self.PQ_NBITS:
+            # Not enough vectors to train the PQ codebooks
+            index_type = 'flat'
+
+        if index_type == 'hnsw':
+            index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+        elif index_type == 'ivf':
+            nlist = max(1, int(math.sqrt(num_docs)))
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist,
+                                       faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            index.nprobe = max(1, int(math.sqrt(nlist)))
+        elif index_type == 'ivfpq':
+            nlist = max(1, int(math.sqrt(num_docs)))
+            # Number of sub-quantizers must divide the dimension
+            m = max(1, dim // 8)
+            while dim % m:
+                m -= 1
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, self.PQ_NBITS,
+                                     faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            index.nprobe = min(nlist, max(8, int(math.sqrt(nlist))))
+        else:
+            index = faiss.IndexFlatIP(dim)
+        return index
+
+    def _maybe_to_gpu(self, index: faiss.Index) -> faiss.Index:
+        """
+        Copy `index` to GPU according to `self.use_gpu`.
+
+        The copy uses this retriever's GPU resources, `index` itself is left
+        on CPU and may be shared.
+        """
+        num_gpus = faiss.get_num_gpus()
+        if self.use_gpu is None:
+            use_gpu = num_gpus > 0
+        elif self.use_gpu and num_gpus == 0:
+            raise RuntimeError(
+                'use_gpu=True but no GPU is available to FAISS, '
+                'please install faiss-gpu or set use_gpu=False.')
+        else:
+            use_gpu = self.use_gpu
+        # FAISS has no GPU implementation of HNSW
+        if not use_gpu or isinstance(index, faiss.IndexHNSW):
+            return index
+
+        if num_gpus > 1:
+            return faiss.index_cpu_to_all_gpus(index)
+        if self._gpu_res is None:
+            self._gpu_res = faiss.StandardGpuResources()
+        return faiss.index_cpu_to_gpu(self._gpu_res, 0, index)
+
     @staticmethod
-    def _z_score_normalization(scores: List[float]) -> List[float]:
+    def _z_score_normalization(scores: np.ndarray) -> np.ndarray:
         """Apply Z-score normalization: z = (x - mean) / std."""
-        if not scores: return []  # noqa: E701
-        arr = np.array(scores)
+        arr = np.asarray(scores, dtype=np.float64)
+        if len(arr) == 0: return arr  # noqa: E701
         std = np.std(arr)
-        if std == 0: return [0.0] * len(scores)  # noqa: E701
-        mean = np.mean(arr)
-        return ((arr - mean) / std).tolist()
+        if std == 0: return np.zeros_like(arr)  # noqa: E701
+        return (arr - np.mean(arr)) / std
 
     @staticmethod
-    def _sigmoid(x: float) -> float:
+    def _sigmoid(x: np.ndarray) -> np.ndarray:
         """Map Z-score to [0, 1]."""
-        return 1 / (1 + math.exp(-x))
+        return 1 / (1 + np.exp(-x))
+
+    @staticmethod
+    def _corpus_signature(corpus: List[str]) -> Tuple[int, int]:
+        """Cheap corpus fingerprint, str hashes are cached by Python."""
+        return len(corpus), hash(tuple(corpus))
 
     def _validate_corpus(self, corpus: List[str] = None):
         """
@@ -253,8 +594,9 @@ class HybridRetriever:
             ValueError: If corpus is empty or index not built.
         """
         with self._corpus_lock:
-            # Only re-initialize if new corpus is provided
-            if corpus is not None and corpus != self.corpus:
+            # Only re-initialize if a different corpus is provided
+            if (corpus is not None
+                    and self._corpus_signature(corpus) != self._corpus_sig):
                 self._init_corpus(corpus=corpus)
             elif self.corpus is None:
                 raise ValueError(
@@ -263,7 +605,22 @@ class HybridRetriever:
             if self.index is None:
                 raise ValueError('Index not built.')
 
-    def _compute_dense_scores(self, query: str) -> List[float]:
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a query with the Dense Retrieval encoder.
+
+        Embeddings of recent queries are cached, the returned array must not
+        be modified.
+
+        Args:
+            query: The query string.
+
+        Returns:
+            L2 normalized embedding of shape (1, dim).
+        """
+        return self._embed_query(query)
+
+    def _compute_dense_scores(self, query: str) -> np.ndarray:
         """
         Compute dense retrieval scores using FAISS.
 
@@ -271,38 +628,63 @@ class HybridRetriever:
             query: The search query string.
 
         Returns:
-            List of raw dense scores for all documents in corpus.
+            Array of raw dense scores for all documents in corpus.
         """
-        query_vec = self._get_embeddings([query])
-        faiss.normalize_L2(query_vec)
-        search_k: int = min(len(self.corpus), 500)
-        dense_dists, dense_indices = self.index.search(x=query_vec, k=search_k)
+        return self._dense_scores(self._embed_query(query))[0]
 
-        dense_scores_map = {
-            idx: float(score)
-            for idx, score in zip(dense_indices[0], dense_dists[0])
-            if idx != -1
-        }
-        return [dense_scores_map.get(i, 0.0) for i in range(len(self.corpus))]
+    def _dense_scores(self, query_vecs: np.ndarray) -> np.ndarray:
+        """
+        Search the FAISS index for a batch of query embeddings.
 
-    def _compute_sparse_scores(self, query: str) -> List[float]:
+        Args:
+            query_vecs: Query embeddings of shape (num_queries, dim).
+
+        Returns:
+            Array of raw dense scores of shape (num_queries, num_docs).
+        """
+        search_k: int = min(len(self.corpus), 500)
+        params = None
+        if isinstance(self.index, faiss.IndexHNSW):
+            # Passed per search, the index may be shared with other retrievers
+            params = faiss.SearchParametersHNSW(efSearch=self.hnsw_ef_search)
+        dense_dists, dense_indices = self.index.search(
+            x=query_vecs, k=search_k, params=params)
+
+        rows, cols = np.nonzero(dense_indices != -1)
+        dense_scores = np.zeros((len(query_vecs), len(self.corpus)),
+                                dtype=np.float32)
+        dense_scores[rows, dense_indices[rows, cols]] = dense_dists[rows, cols]
+        return dense_scores
+
+    def _compute_sparse_scores(self, query: str) -> np.ndarray:
         """
         Compute sparse retrieval scores using BM25.
 
+        Every document is scored, unless `bm25_top_k` is set and smaller than
+        the corpus, then only the top documents are and the rest are left at 0.
+
         Args:
             query: The search query string.
 
         Returns:
-            List of raw BM25 scores for all documents in corpus.
+            Array of raw BM25 scores for all documents in corpus.
         """
-        return self.bm25.get_scores(self.tokenizer_util.segment(query))
+        tokenized_query = self._segment_query(query)
+        if self.bm25_top_k is None or self.bm25_top_k >= len(self.corpus):
+            return self.bm25.get_scores(tokenized_query)
+
+        doc_ids, top_scores = self.bm25.get_topk(tokenized_query,
+                                                 self.bm25_top_k)
+        scores = np.zeros(len(self.corpus), dtype=np.float32)
+        scores[doc_ids] = top_scores
+        return scores
 
     def _fuse_and_normalize_scores(
         self,
-        raw_dense_scores: List[float],
-        raw_bm25_scores: List[float],
+        raw_dense_scores: np.ndarray,
+        raw_bm25_scores: np.ndarray,
         alpha: float,
-    ) -> List[dict]:
+    ) -> np.ndarray:
         """
         Normalize scores using Z-score, fuse with weighted sum, and map to [0, 1].
 
@@ -312,54 +694,51 @@ class HybridRetriever:
             alpha: Weight for dense component. [0.0, 1.0].
 
         Returns:
-            List of dicts with 'text' and 'score' keys, sorted by score descending.
+            Array of fused scores in [0, 1], aligned with the corpus.
         """
         # Normalization (Z-score)
         norm_dense = self._z_score_normalization(raw_dense_scores)
         norm_bm25 = self._z_score_normalization(raw_bm25_scores)
 
-        # Weighted Fusion & Range Normalization
-        candidates = []
-        for i in range(len(self.corpus)):
-            # Weighted sum of Z-scores
-            z_fused = (alpha * norm_dense[i]) + ((1.0 - alpha) * norm_bm25[i])
-            # Normalize to [0, 1] using Sigmoid
-            final_score = self._sigmoid(z_fused)
-            candidates.append({'text': self.corpus[i], 'score': final_score})
+        # Weighted sum of Z-scores, normalized to [0, 1] using Sigmoid
+        return self._sigmoid(alpha * norm_dense + (1.0 - alpha) * norm_bm25)
 
-        # Sort descending
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        return candidates
+    def _rank(self, raw_dense_scores: np.ndarray, raw_bm25_scores: np.ndarray,
+              alpha: float, top_k: int,
+              min_score: float) -> List[Tuple[str, float]]:
+        """Fuse the raw scores of one query and return its top results."""
+        scores = self._fuse_and_normalize_scores(raw_dense_scores,
+                                                 raw_bm25_scores, alpha)
+        return self._filter_and_rank(scores, top_k, min_score)
 
     def _filter_and_rank(
         self,
-        candidates: List[dict],
+        scores: np.ndarray,
         top_k: int,
         min_score: float,
     ) -> List[Tuple[str, float]]:
         """
-        Filter candidates by minimum score and return top_k results.
+        Filter documents by minimum score and return top_k results.
 
         Args:
-            candidates: List of candidate dicts with 'text' and 'score'.
+            scores: Fused scores aligned with the corpus.
             top_k: Maximum number of results to return.
             min_score: Minimum score threshold for filtering.
 
         Returns:
-            List of (document, score) tuples.
+            List of (document, score) tuples, sorted by score descending.
         """
-        total_score_sum = sum(c['score'] for c in candidates)
-        if total_score_sum == 0:
+        if top_k <= 0:
             return []
 
-        final_results = []
-        for item in candidates:
-            current_score: float = item['score']
-            if current_score < min_score:
-                continue
-            final_results.append((item['text'], current_score))
-
-        return final_results[:top_k]
+        # Select the top_k without sorting the whole corpus
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.corpus[i], float(scores[i])) for i in top
+                if scores[i] >= min_score]
 
     def search(
         self,
@@ -389,16 +768,55 @@ class HybridRetriever:
         # Validate and initialize corpus
         self._validate_corpus(corpus)
 
-        # Compute dense and sparse scores
-        raw_dense_scores = self._compute_dense_scores(query)
-        raw_bm25_scores = self._compute_sparse_scores(query)
+        # Compute dense and sparse scores concurrently
+        dense_future = self._pool.submit(self._compute_dense_scores, query)
+        sparse_future = self._pool.submit(self._compute_sparse_scores, query)
+        return self._rank(dense_future.result(), sparse_future.result(), alpha,
+                          top_k, min_score)
 
-        # Fuse and normalize scores
-        candidates = self._fuse_and_normalize_scores(raw_dense_scores,
-                                                     raw_bm25_scores, alpha)
+    def batch_search(
+        self,
+        queries: List[str],
+        corpus: List[str] = None,
+        top_k: int = 3,
+        min_score: float = 0.7,
+        alpha: float = 0.7,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Perform hybrid search for several queries at once.
 
-        # Filter and rank results
-        return self._filter_and_rank(candidates, top_k, min_score)
+        All queries are encoded in one call to the embedding model and
+        searched in one FAISS call, instead of one round per query.
+
+        Args:
+            queries: The search query strings.
+            top_k: Number of results to return per query (hard limit).
+            alpha: Weight for dense (semantic) component. [0.0, 1.0].
+            min_score: Minimum score threshold for filtering. [0.0, 1.0].
+            corpus: Optional new corpus to re-initialize the retriever.
+
+        Returns:
+            One list of (document, combined_score) tuples per query, as
+            returned by `search()`.
+        """
+        # Validate and initialize corpus
+        self._validate_corpus(corpus)
+        if not queries:
+            return []
+
+        # BM25 scoring runs in the pool while the queries are encoded
+        sparse_futures = [
+            self._pool.submit(self._compute_sparse_scores, query)
+            for query in queries
+        ]
+        raw_dense_scores = self._dense_scores(
+            self._get_embeddings(list(queries)))
+
+        raw_bm25_scores = [future.result() for future in sparse_futures]
+        return [
+            self._rank(dense_row, bm25_row, alpha, top_k, min_score)
+            for dense_row, bm25_row in zip(raw_dense_scores, raw_bm25_scores)
+        ]
 
     async def async_search(
         self,
@@ -429,15 +847,39 @@ class HybridRetriever:
         self._validate_corpus(corpus)
 
         # Compute dense and sparse scores concurrently
-        dense_task = asyncio.to_thread(self._compute_dense_scores, query)
-        sparse_task = asyncio.to_thread(self._compute_sparse_scores, query)
+        loop = asyncio.get_running_loop()
+        dense_task = loop.run_in_executor(self._pool,
+                                          self._compute_dense_scores, query)
+        sparse_task = loop.run_in_executor(self._pool,
+                                           self._compute_sparse_scores, query)
 
         raw_dense_scores, raw_bm25_scores = await asyncio.gather(
             dense_task, sparse_task)
+        return self._rank(raw_dense_scores, raw_bm25_scores, alpha, top_k,
+                          min_score)
+
+    async def async_batch_search(
+        self,
+        queries: List[str],
+        corpus: List[str] = None,
+        top_k: int = 3,
+        min_score: float = 0.7,
+        alpha: float = 0.7,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Perform async hybrid search for several queries at once.
 
-        # Fuse and normalize scores
-        candidates = self._fuse_and_normalize_scores(raw_dense_scores,
-                                                     raw_bm25_scores, alpha)
+        Args:
+            queries: The search query strings.
+            top_k: Number of results to return per query (hard limit).
+            alpha: Weight for dense (semantic) component. [0.0, 1.0].
+            min_score: Minimum score threshold for filtering. [0.0, 1.0].
+            corpus: Optional new corpus to re-initialize the retriever.
 
-        # Filter and rank results
-        return self._filter_and_rank(candidates, top_k, min_score)
+        Returns:
+            One list of (document, combined_score) tuples per query, as
+            returned by `batch_search()`.
+        """
+        # Encoding and FAISS search block, run the sync version off the loop
+        return await asyncio.to_thread(self.batch_search, queries, corpus,
+                                       top_k, min_score, alpha)
@@ -1,5 +1,10 @@
+import asyncio
+import atexit
+import hashlib
+import threading
 import uuid
-from typing import Any, Dict, List, Union
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, List, Optional, Set, Union
 
 from ms_agent.utils.utils import install_package, logger
 
@@ -25,10 +30,53 @@ class Sandbox:
         ...
 
 
+class _SandboxLoop:
+    """
+    Event loop thread owning one sandbox container.
+
+    The `ms-enclave` sandbox and its lock are bound to the loop they are
+    created on, so every call on them is submitted to this loop, whichever
+    thread or loop the caller runs on.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.sandbox = None
+        # Created on `loop` by the first coroutine that needs it
+        self.lock: Optional[asyncio.Lock] = None
+        # Requirement sets already installed in the container
+        self.reqs_installed: Set[str] = set()
+        self.thread = threading.Thread(
+            target=self._run, name='EnclaveSandbox', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, coro) -> Future:
+        """Run `coro` on the owned loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        """Stop the loop once the callbacks already scheduled have run."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
 class EnclaveSandbox(Sandbox):
     """
     A sandbox environment for securely executing code and commands based on `ms-enclave`.
 
+    The Docker container is started on first use and reused by subsequent
+    `execute()`/`async_execute()` calls. It lives on an event loop thread of
+    its own, so sync calls, async calls and calls from different loops all
+    share it. Call `close()`/`aclose()`, or use the instance as an async
+    context manager, to stop it; containers still open at interpreter exit
+    are stopped then.
+
     See `https://github.com/modelscope/ms-enclave`
     """
 
@@ -71,6 +119,10 @@ class EnclaveSandbox(Sandbox):
             volumes=self.volume_dict,
         )
 
+        # Loop thread owning the current container, started on first use
+        self._owner: Optional[_SandboxLoop] = None
+        self._owner_lock = threading.Lock()
+
     @staticmethod
     def _init():
         """
@@ -88,10 +140,136 @@ class EnclaveSandbox(Sandbox):
         except Exception as e:
             raise e
 
+    def _get_owner(self) -> _SandboxLoop:
+        """Return the loop thread owning the container, starting it if needed."""
+        with self._owner_lock:
+            if self._owner is None:
+                self._owner = _SandboxLoop()
+                atexit.register(self.close)
+            return self._owner
+
+    def _detach_owner(self) -> Optional[_SandboxLoop]:
+        """Take the current loop thread, later calls start a new one."""
+        with self._owner_lock:
+            owner, self._owner = self._owner, None
+            if owner is not None:
+                atexit.unregister(self.close)
+            return owner
+
+    async def _ensure_sandbox(self, owner: _SandboxLoop):
+        """Start the sandbox container if it is not running yet, on `owner`."""
+        if owner.lock is None:
+            owner.lock = asyncio.Lock()
+        async with owner.lock:
+            if owner.sandbox is None:
+                from ms_enclave.sandbox import SandboxFactory
+                from ms_enclave.sandbox.model import SandboxType
+
+                sandbox = SandboxFactory.create_sandbox(
+                    SandboxType.DOCKER, self.sandbox_config)
+                await sandbox.__aenter__()
+                owner.sandbox = sandbox
+        return owner.sandbox
+
+    @staticmethod
+    async def _shutdown(owner: _SandboxLoop):
+        """Stop the container of `owner`, on `owner`."""
+        async with owner.lock or asyncio.Lock():
+            sandbox, owner.sandbox = owner.sandbox, None
+            owner.reqs_installed.clear()
+        if sandbox is not None:
+            await sandbox.__aexit__(None, None, None)
+
+    def _submit_shutdown(self) -> Optional[Future]:
+        """Stop the container and then its loop thread, None if not started."""
+        owner = self._detach_owner()
+        if owner is None:
+            return None
+        future = owner.submit(self._shutdown(owner))
+        future.add_done_callback(lambda _: owner.stop())
+        return future
+
+    async def aclose(self):
+        """Stop the sandbox container, if any."""
+        future = self._submit_shutdown()
+        if future is not None:
+            await asyncio.wrap_future(future)
+
+    def close(self):
+        """
+        Stop the sandbox container, if any.
+
+        Blocks until the container is stopped, except inside a running event
+        loop, where the shutdown goes on in the background.
+        """
+        future = self._submit_shutdown()
+        if future is None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f'Failed to stop sandbox: {e}')
+
+    async def __aenter__(self):
+        owner = self._get_owner()
+        await asyncio.wrap_future(owner.submit(self._ensure_sandbox(owner)))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    @staticmethod
+    async def _install_requirements(owner: _SandboxLoop, sandbox,
+                                    requirements: List[str]):
+        """
+        Install `requirements` into the sandbox unless already installed.
+
+        A marker file named after the hash of the requirement set is touched
+        in the container's /tmp after a successful install, so containers that
+        already have them (e.g. restarted ones) skip pip entirely. /tmp stays
+        writable when the container does not run as root.
+        """
+        key = hashlib.sha256('\n'.join(
+            sorted(requirements)).encode()).hexdigest()[:16]
+        if key in owner.reqs_installed:
+            return
+
+        marker = f'/tmp/.ms_agent_reqs_{key}'
+        result_marker = await sandbox.execute_command(f'test -f {marker}')
+        if result_marker.exit_code != 0:
+            requirements_file = f'/{str(uuid.uuid4())}/requirements.txt'
+            await sandbox.execute_tool(
+                'file_operation', {
+                    'operation': 'write',
+                    'file_path': f'{requirements_file}',
+                    'content': '\n'.join(requirements)
+                })
+
+            # A marker that cannot be written must not fail the install
+            result_requirements = await sandbox.execute_command(
+                f'pip install --no-cache-dir -r {requirements_file} '
+                f'&& {{ touch {marker} || true; }}')
+            logger.info(result_requirements.stdout)
+            if result_requirements.exit_code != 0:
+                return
+        owner.reqs_installed.add(key)
+
+    @staticmethod
+    async def _run_all(coros: List[Awaitable[Any]],
+                       parallel: bool) -> List[Any]:
+        """Await `coros` concurrently or one by one, results in order."""
+        if parallel:
+            return await asyncio.gather(*coros)
+        return [await coro for coro in coros]
+
     async def async_execute(self,
                             python_code: Union[str, List[str]] = None,
                             shell_command: Union[str, List[str]] = None,
-                            requirements: List[str] = None) -> Dict[str, Any]:
+                            requirements: List[str] = None,
+                            parallel: bool = False) -> Dict[str, Any]:
         """
         Asynchronously execute Python code and shell commands within the sandbox.
 
@@ -101,6 +279,9 @@ class EnclaveSandbox(Sandbox):
             shell_command (Union[str, List[str]]): Shell command(s) to execute.
                 e.g. "ls -al /data", or ["ls -al /data", "echo 'Hello World'"]
             requirements (List[str]): List of Python packages to install before execution.
+            parallel (bool): Run the Python snippets concurrently, then the shell commands concurrently.
+                Defaults to False: items run one by one in order, so they may depend on each other's
+                side effects (e.g. write a file, then read it).
 
         Returns:
             Dict[str, Any]: A dictionary containing the results of the executions.
@@ -124,69 +305,67 @@ class EnclaveSandbox(Sandbox):
                     ]
                 }
         """
-        from ms_enclave.sandbox import SandboxFactory
-        from ms_enclave.sandbox.model import SandboxType
-
+        owner = self._get_owner()
+        return await asyncio.wrap_future(
+            owner.submit(
+                self._execute(owner, python_code, shell_command, requirements,
+                              parallel)))
+
+    async def _execute(self, owner: _SandboxLoop,
+                       python_code: Union[str, List[str]],
+                       shell_command: Union[str, List[str]],
+                       requirements: List[str],
+                       parallel: bool) -> Dict[str, Any]:
+        """Body of `async_execute()`, run on the loop owning the container."""
         results: Dict[str, Any] = {
             'python_executor': [],
             'shell_executor': [],
         }
 
-        async with SandboxFactory.create_sandbox(
-                SandboxType.DOCKER, self.sandbox_config) as sandbox:
-
-            if requirements:
-                requirements_file = f'/{str(uuid.uuid4())}/requirements.txt'
-                await sandbox.execute_tool(
-                    'file_operation', {
-                        'operation': 'write',
-                        'file_path': f'{requirements_file}',
-                        'content': '\n'.join(requirements)
-                    })
-
-                result_requirements = await sandbox.execute_command(
-                    f'pip install -r {requirements_file}')
-                logger.info(result_requirements.stdout)
-
-            if python_code:
-                if isinstance(python_code, str):
-                    python_code = [python_code]
-
-                for py_item in python_code:
-                    py_result = await sandbox.execute_tool(
-                        'python_executor', {'code': py_item})
-
-                    results['python_executor'].append({
-                        'output':
-                        py_result.output,
-                        'error':
-                        py_result.error,
-                        'status':
-                        py_result.status
-                    })
-
-            if shell_command:
-                if isinstance(shell_command, str):
-                    shell_command = [shell_command]
-
-                for shell_item in shell_command:
-                    shell_result = await sandbox.execute_command(shell_item)
-
-                    results['shell_executor'].append({
-                        'output':
-                        shell_result.stdout,
-                        'error':
-                        shell_result.stderr,
-                        'status':
-                        shell_result.status
-                    })
+        sandbox = await self._ensure_sandbox(owner)
+
+        if requirements:
+            await self._install_requirements(owner, sandbox, requirements)
+
+        if python_code:
+            if isinstance(python_code, str):
+                python_code = [python_code]
+
+            py_results = await self._run_all([
+                sandbox.execute_tool('python_executor', {'code': py_item})
+                for py_item in python_code
+            ], parallel)
+
+            for py_result in py_results:
+                results['python_executor'].append({
+                    'output': py_result.output,
+                    'error': py_result.error,
+                    'status': py_result.status
+                })
+
+        if shell_command:
+            if isinstance(shell_command, str):
+                shell_command = [shell_command]
+
+            shell_results = await self._run_all([
+                sandbox.execute_command(shell_item)
+                for shell_item in shell_command
+            ], parallel)
+
+            for shell_result in shell_results:
+                results['shell_executor'].append({
+                    'output': shell_result.stdout,
+                    'error': shell_result.stderr,
+                    'status': shell_result.status
+                })
 
         return results
 
     def execute(self,
                 python_code: Union[str, List[str]] = None,
                 shell_command: Union[str, List[str]] = None,
-                requirements: List[str] = None) -> Dict[str, Any]:
+                requirements: List[str] = None,
+                parallel: bool = False) -> Dict[str, Any]:
         """
         Synchronously execute Python code and shell commands within the sandbox.
 
@@ -196,14 +375,14 @@ class EnclaveSandbox(Sandbox):
             shell_command (Union[str, List[str]]): Shell command(s) to execute.
                 e.g. "ls -al /data", or ["ls -al /data", "echo 'Hello World'"]
             requirements (List[str]): List of Python packages to install before execution.
+            parallel (bool): Run the Python snippets concurrently, then the shell commands concurrently.
+                Defaults to False: items run one by one in order, so they may depend on each other's
+                side effects (e.g. write a file, then read it).
 
         Returns:
             Dict[str, Any]: A dictionary containing the results of the executions.
         """
-        import asyncio
-
-        return asyncio.run(
-            self.async_execute(
-                python_code=python_code,
-                shell_command=shell_command,
-                requirements=requirements))
+        owner = self._get_owner()
+        return owner.submit(
+            self._execute(owner, python_code, shell_command, requirements,
+                          parallel)).result()
@@ -2,13 +2,29 @@
 # isort: skip_file
 # yapf: disable
 import asyncio
+import copy
+import functools
+import hashlib
+import heapq
+import itertools
 import logging
+import os
 import re
-from dataclasses import dataclass, field
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field, fields, replace
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
 
 import json
+try:
+    # Optional, only speeds up parsing and dumping JSON
+    import orjson
+except ImportError:
+    orjson = None
 from ms_agent.llm import LLM
 from ms_agent.llm.utils import Message
 from ms_agent.retriever.hybrid_retriever import HybridRetriever
@@ -16,18 +32,212 @@ from ms_agent.skill.container import (ExecutionInput, ExecutionOutput,
                                       ExecutorType, SkillContainer)
 from ms_agent.skill.loader import load_skills
 from ms_agent.skill.prompts import (PROMPT_ANALYZE_EXECUTION_ERROR,
+                                    PROMPT_ANALYZE_EXECUTION_ERRORS_BATCH,
                                     PROMPT_ANALYZE_QUERY_FOR_SKILLS,
                                     PROMPT_BUILD_SKILLS_DAG,
                                     PROMPT_DIRECT_SELECT_SKILLS,
                                     PROMPT_FILTER_SKILLS_DEEP,
                                     PROMPT_FILTER_SKILLS_FAST,
                                     PROMPT_SKILL_ANALYSIS_PLAN,
-                                    PROMPT_SKILL_EXECUTION_COMMAND)
+                                    PROMPT_SKILL_BATCH_ENTRY,
+                                    PROMPT_SKILL_CONTEXT,
+                                    PROMPT_SKILL_EXECUTION_COMMAND,
+                                    PROMPT_SKILLS_BATCH_ANALYSIS_PLAN,
+                                    PROMPT_SKILLS_BATCH_CONTEXT)
 from ms_agent.skill.schema import SkillContext, SkillExecutionPlan, SkillSchema
+from ms_agent.skill.semantic_cache import SemanticCache
 from ms_agent.utils.logger import get_logger
 
 logger = get_logger()
 
+_json_loads = orjson.loads if orjson else json.loads
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """Dump JSON, compactly unless `indent`, with orjson when it is installed."""
+    if orjson:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+        except TypeError:
+            # Values orjson rejects, such as integers over 64 bits
+            pass
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _load_json_cache(path: Optional[Path], name: str) -> Dict[str, Any]:
+    """Load a persisted cache, empty if none or unreadable."""
+    if not path or not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return _json_loads(f.read())
+    except Exception as e:
+        logger.warning(f'Failed to load {name}: {e}')
+        return {}
+
+
+def _save_json_cache(path: Optional[Path], cache: Dict[str, Any], name: str):
+    """Atomically persist a cache, a crash never leaves a partial file."""
+    if not path:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(_json_dumps(cache))
+        os.replace(tmp_file, path)
+    except Exception as e:
+        logger.warning(f'Failed to save {name}: {e}')
+
+
+def _parse_json_response(response: str, log_chars: int = 300) -> Dict[str, Any]:
+    """Parse JSON from LLM response with robust extraction."""
+    response = response.strip()
+    # Remove a markdown code block wrapping the whole response
+    if response.startswith('```'):
+        response = response[3:]
+        if response.startswith('json'):
+            response = response[4:]
+        if response.endswith('```'):
+            response = response[:-3]
+        response = response.strip()
+
+    # Try direct parsing first
+    try:
+        return _json_loads(response)
+    except json.JSONDecodeError:
+        pass
+
+    # Decode the first valid JSON object embedded in the response, up to its
+    # closing brace. The decoder tracks strings, so braces inside them do not
+    # count, and braces in surrounding prose are skipped
+    start = response.find('{')
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(response, start)[0]
+        except json.JSONDecodeError:
+            start = response.find('{', start + 1)
+
+    logger.warning(f'Failed to parse JSON: {response[:log_chars]}...')
+    return {}
+
+
+# Characters of upstream stdout/stderr passed on in UPSTREAM_OUTPUTS, full
+# outputs stay in the execution spec
+_UPSTREAM_TEXT_LIMIT = 8192
+# UTF-8 bytes of the whole UPSTREAM_OUTPUTS value. A single environment string
+# over 128 KiB makes exec fail on Linux
+_UPSTREAM_OUTPUTS_LIMIT = 96 * 1024
+
+
+# Result objects have a fixed schema, slot them where dataclasses support it
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Executor of a skill by the extension of its primary script
+_EXT_TO_EXECUTOR = {
+    '.py': ExecutorType.PYTHON_SCRIPT,
+    '.sh': ExecutorType.SHELL,
+    '.bash': ExecutorType.SHELL,
+    '.js': ExecutorType.JAVASCRIPT,
+    '.mjs': ExecutorType.JAVASCRIPT,
+}
+
+# Error analyses kept per DAGExecutor, least recently used are dropped
+_ERROR_ANALYSIS_CACHE_SIZE = 256
+
+# Parts of stderr that differ between runs of the same failure
+_STDERR_NOISE_RE = re.compile(r'/tmp/\S+|line \d+')
+
+# Environmental failures that no code fix can resolve
+_UNFIXABLE_RE = re.compile(
+    r'\b(?:ConnectionError|ConnectTimeout|ReadTimeout|MemoryError|Killed|'
+    r'No space left on device|CUDA out of memory)\b')
+
+
+def _start_task(coro) -> 'asyncio.Future':
+    """Schedule `coro`, running it eagerly up to its first suspension.
+
+    Eager tasks (Python 3.12+) that finish without suspending never go
+    through the event loop, the loop wide task factory is left untouched.
+    """
+    if sys.version_info >= (3, 12):
+        return asyncio.eager_task_factory(asyncio.get_running_loop(), coro)
+    return asyncio.ensure_future(coro)
+
+
+def _summarize_stderr(text: str,
+                      head: int = 40,
+                      tail: int = 40,
+                      limit: int = 3000) -> str:
+    """
+    Shorten stderr for an error analysis prompt.
+
+    Runs of identical lines, e.g. repeated warnings or recursion frames,
+    are collapsed to one, and only the first `head` and last `tail` lines
+    are kept. Whatever still exceeds `limit` characters is cut from the
+    middle, the exception itself is at the end of a traceback.
+    """
+    lines = [line for line, _ in itertools.groupby(text.splitlines())]
+    if len(lines) > head + tail:
+        lines = (lines[:head]
+                 + [f'... [{len(lines) - head - tail} lines omitted] ...']
+                 + lines[-tail:])
+    summary = '\n'.join(lines)
+    if len(summary) > limit:
+        summary = (summary[:limit // 3] + '\n... [truncated] ...\n'
+                   + summary[-(limit - limit // 3):])
+    return summary
+
+
+def _condense(text: str, limit: int) -> str:
+    """Drop blank lines and indentation, then cap `text` at `limit` chars."""
+    return '\n'.join(
+        line for line in map(str.strip, text.splitlines()) if line)[:limit]
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(
+        text.encode('utf-8', errors='replace'), digest_size=8).hexdigest()
+
+
+def _fit_upstream_json(data: Dict[str, Any], data_json: str,
+                       max_bytes: int) -> str:
+    """
+    JSON of upstream `data` within `max_bytes` UTF-8 bytes.
+
+    Over the limit, stdout, stderr and a large return value (as text) are
+    truncated further until it fits, and `truncated` is set.
+    """
+    if len(data_json.encode('utf-8')) <= max_bytes:
+        return data_json
+    return_value = data['return_value']
+    return_value_json = _json_dumps(return_value)
+    limit = _UPSTREAM_TEXT_LIMIT
+    while limit:
+        limit //= 2
+        fitted = dict(
+            data,
+            stdout=data['stdout'][:limit],
+            stderr=data['stderr'][:limit],
+            truncated=True)
+        if len(return_value_json) > limit:
+            fitted['return_value'] = str(return_value)[:limit]
+        fitted_json = _json_dumps(fitted)
+        if len(fitted_json.encode('utf-8')) <= max_bytes:
+            return fitted_json
+    # Too many output files even without any text
+    return _json_dumps({'exit_code': data['exit_code'], 'truncated': True})
+
+
+@functools.lru_cache(maxsize=1024)
+def _env_safe_key(skill_id: str) -> str:
+    """Turn a skill id into an environment variable name fragment."""
+    return skill_id.replace('-', '_').replace('.', '_').upper()
+
 
 def _configure_logger_to_dir(log_dir: Path) -> None:
     """
@@ -37,27 +247,29 @@ def _configure_logger_to_dir(log_dir: Path) -> None:
         log_dir: Directory path for log files.
     """
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'ms_agent.log'
+    log_file = str((log_dir / 'ms_agent.log').resolve())
+    file_handlers = [
+        h for h in logger.handlers if isinstance(h, logging.FileHandler)
+    ]
 
-    # Check if file handler for this path already exists
-    for handler in logger.handlers:
-        if isinstance(handler, logging.FileHandler):
-            if Path(handler.baseFilename).resolve() == log_file.resolve():
-                return  # Already configured
+    # Check if file handler for this path already exists. Handlers are
+    # created from the resolved path, so comparing strings is enough
+    if any(h.baseFilename == log_file for h in file_handlers):
+        return  # Already configured
 
     # Remove existing file handlers and add new one
-    for handler in logger.handlers[:]:
-        if isinstance(handler, logging.FileHandler):
-            logger.removeHandler(handler)
+    for handler in file_handlers:
+        logger.removeHandler(handler)
+        handler.close()
 
-    file_handler = logging.FileHandler(str(log_file), mode='a')
+    file_handler = logging.FileHandler(log_file, mode='a')
     file_handler.setFormatter(logging.Formatter('[%(levelname)s:%(name)s] %(message)s'))
     file_handler.setLevel(logger.level)
     logger.addHandler(file_handler)
     logger.info(f'Logger configured to output to: {log_file}')
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SkillExecutionResult:
     """
     Result of executing a single skill.
@@ -74,7 +286,7 @@ class SkillExecutionResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DAGExecutionResult:
     """
     Result of executing the entire skill DAG.
@@ -105,64 +317,227 @@ class SkillAnalyzer:
     2. Load Phase: Load only required resources based on plan
     """
 
-    def __init__(self, llm: 'LLM'):
+    def __init__(self,
+                 llm: 'LLM',
+                 cache_dir: Optional[Path] = None,
+                 enable_fast_path: bool = False,
+                 max_cache_entries: int = 512,
+                 cache_flush_delay: float = 2.0):
         """
         Initialize skill analyzer.
 
         Args:
             llm: LLM instance for analysis.
+            cache_dir: Optional directory to persist analysis results in,
+                kept in memory only if None.
+            enable_fast_path: Whether to skip the plan phase for skills whose
+                only resource is a single script, see `fast_path_plan` for
+                what the plan phase would have provided. Off by default.
+            max_cache_entries: Maximum number of analyses kept, the least
+                recently used ones are dropped first.
+            cache_flush_delay: Seconds to wait after a new analysis before
+                writing the cache, so that the analyses of a run are written
+                at once, from a timer thread.
         """
         self.llm = llm
+        self.enable_fast_path = enable_fast_path
+        self.max_cache_entries = max_cache_entries
+        self.cache_flush_delay = cache_flush_delay
+
+        # Parsed LLM analyses keyed by prompt hash. A prompt embeds the query
+        # and all skill content it is built from, so any edit misses
+        self._cache_file: Optional[Path] = (
+            Path(cache_dir) / 'analysis_cache.json' if cache_dir else None)
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = self._load_cache()
+        self._cache_lock = threading.Lock()
+        # Pending write of the cache file, see _schedule_flush()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        # Pending LLM calls by the same key, identical prompts issued while
+        # one is in flight wait for its result instead of calling again
+        self._inflight: Dict[str, Future] = {}
+
+    def _load_cache(self) -> 'OrderedDict[str, Dict[str, Any]]':
+        """Load persisted analysis results, empty if none or unreadable."""
+        # Saved least recently used first, keep the most recent ones
+        cache = OrderedDict(
+            _load_json_cache(self._cache_file, 'analysis cache'))
+        while len(cache) > self.max_cache_entries:
+            cache.popitem(last=False)
+        return cache
+
+    def _schedule_flush(self):
+        """Write the cache after `cache_flush_delay`, caller holds the lock."""
+        if not self._cache_file or self._flush_timer is not None:
+            return
+        self._flush_timer = threading.Timer(self.cache_flush_delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        """Write pending analysis results to the cache file now."""
+        with self._flush_lock:
+            with self._cache_lock:
+                if self._flush_timer is None:
+                    return
+                self._flush_timer.cancel()
+                self._flush_timer = None
+                snapshot = dict(self._cache)
+            _save_json_cache(self._cache_file, snapshot, 'analysis cache')
+
+    @staticmethod
+    def _analysis_key(prompt: str, cached_prefix: Optional[str]) -> str:
+        return hashlib.sha256(
+            f'{cached_prefix or ""}\0{prompt}'.encode('utf-8')).hexdigest()
+
+    def _context_cache_key(self, context: SkillContext, prompt: str) -> str:
+        """
+        Cache key of a prompt about `context`, with the query canonicalized.
+
+        Queries differing only in surrounding or repeated whitespace share
+        their analyses. Case is kept, extracted parameters may depend on it.
+        """
+        canonical_query = ' '.join(context.query.split())
+        return self._analysis_key(
+            prompt, self._skill_context_prefix(context, canonical_query))
+
+    def _begin_analysis(
+        self, key: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Future], Optional[Future]]:
+        """
+        Look up `key` and claim it if nobody else computes it.
 
-    def _llm_generate(self, prompt: str) -> str:
-        """Generate LLM response from prompt."""
-        from ms_agent.llm.utils import Message
-        messages = [Message(role='user', content=prompt)]
-        response = self.llm.generate(messages=messages)
-        return response.content if hasattr(response,
-                                           'content') else str(response)
-
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
-        """Parse JSON from LLM response with robust extraction."""
-        # Remove markdown code blocks if present
-        response = re.sub(r'```json\s*', '', response)
-        response = re.sub(r'```\s*$', '', response)
-        response = response.strip()
+        Returns:
+            Tuple of (cached result, pending future of another caller, future
+            claimed by this caller), exactly one of which is set.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                logger.info('Reusing cached skill analysis')
+                return cached, None, None
+            pending = self._inflight.get(key)
+            if pending is not None:
+                logger.info('Waiting for identical skill analysis in flight')
+                return None, pending, None
+            future = self._inflight[key] = Future()
+            return None, None, future
+
+    def _finish_analysis(self,
+                         key: str,
+                         future: Future,
+                         parsed: Optional[Dict[str, Any]] = None,
+                         error: Optional[BaseException] = None):
+        """Cache a claimed result and hand it to the waiting callers."""
+        snapshot = copy.deepcopy(parsed) if error is None else None
+        with self._cache_lock:
+            # Unparsable responses are not cached, the next call retries
+            if snapshot:
+                self._cache[key] = snapshot
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+                self._schedule_flush()
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(snapshot)
+
+    def _llm_generate_json(self,
+                           prompt: str,
+                           cached_prefix: Optional[str] = None,
+                           cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Generate and parse a JSON LLM response, cached by prompt."""
+        key = cache_key or self._analysis_key(prompt, cached_prefix)
+        cached, pending, future = self._begin_analysis(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        if pending is not None:
+            return copy.deepcopy(pending.result())
 
-        # Try direct parsing first
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            pass
+            parsed = self._parse_json_response(
+                self._llm_generate(prompt, cached_prefix=cached_prefix))
+        except BaseException as e:
+            self._finish_analysis(key, future, error=e)
+            raise
+        self._finish_analysis(key, future, parsed)
+        return parsed
+
+    async def _async_llm_generate_json(
+            self,
+            prompt: str,
+            cached_prefix: Optional[str] = None,
+            cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of `_llm_generate_json`, sharing its cache."""
+        key = cache_key or self._analysis_key(prompt, cached_prefix)
+        cached, pending, future = self._begin_analysis(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.wrap_future(pending))
 
-        # Try to extract JSON object from response
         try:
-            # Find the outermost JSON object
-            start = response.find('{')
-            if start != -1:
-                # Find matching closing brace
-                depth = 0
-                for i, char in enumerate(response[start:], start):
-                    if char == '{':
-                        depth += 1
-                    elif char == '}':
-                        depth -= 1
-                        if depth == 0:
-                            json_str = response[start:i + 1]
-                            return json.loads(json_str)
-        except json.JSONDecodeError:
-            pass
+            parsed = self._parse_json_response(
+                await self._async_llm_generate(
+                    prompt, cached_prefix=cached_prefix))
+        except BaseException as e:
+            self._finish_analysis(key, future, error=e)
+            raise
+        self._finish_analysis(key, future, parsed)
+        return parsed
 
-        # Try regex extraction as fallback
-        try:
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
+    @staticmethod
+    def _build_messages(prompt: str,
+                        cached_prefix: Optional[str] = None) -> List[Message]:
+        """
+        Build the messages of an analysis call.
 
-        logger.warning(f'Failed to parse JSON: {response[:500]}...')
-        return {}
+        Args:
+            prompt: The call specific prompt.
+            cached_prefix: Optional context shared by several calls, sent
+                first as its own message so providers with prompt caching
+                can reuse the common prefix.
+        """
+        messages = [Message(role='user', content=prompt)]
+        if cached_prefix:
+            messages.insert(0, Message(role='user', content=cached_prefix))
+        return messages
+
+    def _llm_generate(self,
+                      prompt: str,
+                      cached_prefix: Optional[str] = None) -> str:
+        """Generate LLM response from prompt."""
+        response = self.llm.generate(
+            messages=self._build_messages(prompt, cached_prefix))
+        return response.content if hasattr(response,
+                                           'content') else str(response)
+
+    async def _async_llm_generate(self,
+                                  prompt: str,
+                                  cached_prefix: Optional[str] = None) -> str:
+        """Generate LLM response from prompt without blocking the loop."""
+        response = await self.llm.agenerate(
+            messages=self._build_messages(prompt, cached_prefix))
+        return response.content if hasattr(response,
+                                           'content') else str(response)
+
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """Parse JSON from LLM response with robust extraction."""
+        return _parse_json_response(response, log_chars=500)
+
+    @staticmethod
+    def _skill_context_prefix(context: SkillContext,
+                              query: Optional[str] = None) -> str:
+        """Build the skill context shared by the plan and command prompts."""
+        skill = context.skill
+        return PROMPT_SKILL_CONTEXT.format(
+            query=context.query if query is None else query,
+            skill_id=skill.skill_id,
+            skill_name=skill.name,
+            skill_description=skill.description,
+            skill_content=skill.content[:4000] if skill.content else '')
 
     def analyze_skill_plan(self,
                            skill: SkillSchema,
@@ -187,20 +562,116 @@ class SkillAnalyzer:
             query=query,
             root_path=root_path or skill.skill_path.parent)
 
-        # Build prompt with skill overview (not full content)
-        prompt = PROMPT_SKILL_ANALYSIS_PLAN.format(
+        prompt = self._plan_prompt(context)
+        parsed = self._llm_generate_json(
+            prompt,
+            cached_prefix=self._skill_context_prefix(context),
+            cache_key=self._context_cache_key(context, prompt))
+        return self._apply_plan(context, parsed)
+
+    async def async_analyze_skill_plan(self,
+                                       skill: SkillSchema,
+                                       query: str,
+                                       root_path: Path = None) -> SkillContext:
+        """Async version of `analyze_skill_plan`."""
+        context = SkillContext(
+            skill=skill,
             query=query,
-            skill_id=skill.skill_id,
-            skill_name=skill.name,
-            skill_description=skill.description,
-            skill_content=skill.content[:4000] if skill.content else '',
+            root_path=root_path or skill.skill_path.parent)
+
+        prompt = self._plan_prompt(context)
+        parsed = await self._async_llm_generate_json(
+            prompt,
+            cached_prefix=self._skill_context_prefix(context),
+            cache_key=self._context_cache_key(context, prompt))
+        return self._apply_plan(context, parsed)
+
+    async def async_analyze_skills_batch(
+            self, skills: List[SkillSchema],
+            query: str) -> Dict[str, SkillContext]:
+        """
+        Phase 1 for several skills, e.g. a parallel group, with one LLM call.
+
+        Skills taking the fast path need no call, and skills missing from
+        the batched response are analyzed one by one.
+
+        Args:
+            skills: Skills to analyze, rooted at their skill directories.
+            query: User's query to fulfill.
+
+        Returns:
+            Dict of skill_id to SkillContext with execution plan.
+        """
+        contexts: Dict[str, SkillContext] = {}
+        pending: List[SkillContext] = []
+        for skill in skills:
+            context = None
+            if self.enable_fast_path:
+                context = self.fast_path_plan(skill, query, skill.skill_path)
+            if context is None:
+                pending.append(
+                    SkillContext(
+                        skill=skill, query=query, root_path=skill.skill_path))
+            else:
+                contexts[skill.skill_id] = context
+
+        plans: Dict[str, Dict[str, Any]] = {}
+        if len(pending) > 1:
+            skills_context = '\n'.join(
+                PROMPT_SKILL_BATCH_ENTRY.format(
+                    skill_id=context.skill.skill_id,
+                    skill_name=context.skill.name,
+                    skill_description=context.skill.description,
+                    skill_content=(context.skill.content or '')[:4000],
+                    scripts_list=', '.join(context.get_scripts_list()) or 'None',
+                    references_list=', '.join(context.get_references_list()) or 'None',
+                    resources_list=', '.join(context.get_resources_list()) or 'None')
+                for context in pending)
+            # Fixed instructions go first so they stay prompt cached
+            parsed = await self._async_llm_generate_json(
+                PROMPT_SKILLS_BATCH_CONTEXT.format(
+                    query=query, skills_context=skills_context),
+                cached_prefix=PROMPT_SKILLS_BATCH_ANALYSIS_PLAN)
+            entries = parsed.get('plans', []) if isinstance(parsed, dict) else parsed
+            plans = {
+                entry.get('skill_id'): entry
+                for entry in entries if isinstance(entry, dict)
+            }
+
+        missing = []
+        for context in pending:
+            plan = plans.get(context.skill.skill_id)
+            if plan is None:
+                missing.append(context.skill)
+            else:
+                contexts[context.skill.skill_id] = self._apply_plan(context, plan)
+
+        if missing:
+            if len(pending) > 1:
+                logger.warning(
+                    f'Batched analysis missed {[s.skill_id for s in missing]}, '
+                    f'analyzing them one by one')
+            fallback = await asyncio.gather(*[
+                self.async_analyze_skill_plan(skill, query, skill.skill_path)
+                for skill in missing
+            ])
+            for context in fallback:
+                contexts[context.skill.skill_id] = context
+
+        return contexts
+
+    @staticmethod
+    def _plan_prompt(context: SkillContext) -> str:
+        """Build the plan prompt with the skill overview (not full content)."""
+        return PROMPT_SKILL_ANALYSIS_PLAN.format(
             scripts_list=', '.join(context.get_scripts_list()) or 'None',
             references_list=', '.join(context.get_references_list()) or 'None',
             resources_list=', '.join(context.get_resources_list()) or 'None')
 
-        response = self._llm_generate(prompt)
-        parsed = self._parse_json_response(response)
-
+    @staticmethod
+    def _apply_plan(context: SkillContext,
+                    parsed: Dict[str, Any]) -> SkillContext:
+        """Attach the execution plan parsed from the LLM to `context`."""
         # Build execution plan
         plan = SkillExecutionPlan(
             can_handle=parsed.get('can_handle', False),
@@ -224,6 +695,67 @@ class SkillAnalyzer:
 
         return context
 
+    @staticmethod
+    def _is_single_script_skill(context: SkillContext) -> bool:
+        """Whether the skill has one script and nothing else to load."""
+        return (len(context.get_scripts_list()) == 1
+                and not context.get_references_list()
+                and not context.get_resources_list())
+
+    def fast_path_plan(self,
+                       skill: SkillSchema,
+                       query: str,
+                       root_path: Path = None) -> Optional[SkillContext]:
+        """
+        Phase 1 without the LLM, for skills with a single script.
+
+        Such a skill has exactly one resource to load, so the plan phase
+        cannot change what is loaded. The plan simply runs the script.
+
+        Compared to the LLM plan, this drops:
+            - the relevance check, the skill is assumed to handle the query
+              (`can_handle=True`), it must come from retrieval or the DAG;
+            - `required_packages`, nothing extra is installed for the script;
+            - `parameters`, command generation has to extract them from the
+              query on its own.
+
+        Args:
+            skill: SkillSchema to analyze.
+            query: User's query to fulfill.
+            root_path: Root path for skill context.
+
+        Returns:
+            SkillContext with a plan for the script, None if the skill
+            does not qualify.
+        """
+        context = SkillContext(
+            skill=skill,
+            query=query,
+            root_path=root_path or skill.skill_path.parent)
+        if not self._is_single_script_skill(context):
+            return None
+
+        script_name = context.get_scripts_list()[0]
+        plan = SkillExecutionPlan(
+            can_handle=True,
+            plan_summary=f'Run {script_name} for the query',
+            steps=[{'step': 1, 'action': f'Run {script_name}', 'type': 'script'}],
+            required_scripts=[script_name],
+            reasoning='Single script skill, plan phase skipped')
+
+        context.plan = plan
+        context.spec.plan = plan.plan_summary
+
+        logger.info(f'Skill analysis fast path: scripts={plan.required_scripts}')
+
+        return context
+
+    @staticmethod
+    def _prefetch_skill_files(skill: SkillSchema):
+        """Warm the file cache with the skill's scripts and references."""
+        for skill_file in itertools.chain(skill.scripts, skill.references):
+            SkillContext._read_file_content(skill_file.path.resolve())
+
     def load_skill_resources(self, context: SkillContext) -> SkillContext:
         """
         Phase 2: Load resources based on execution plan.
@@ -259,23 +791,47 @@ class SkillAnalyzer:
         if not context.plan:
             return []
 
-        prompt = PROMPT_SKILL_EXECUTION_COMMAND.format(
-            query=context.query,
-            skill_id=context.skill.skill_id,
-            execution_plan=json.dumps(
+        prompt = self._commands_prompt(context)
+        parsed = self._llm_generate_json(
+            prompt,
+            cached_prefix=self._skill_context_prefix(context),
+            cache_key=self._context_cache_key(context, prompt))
+        return self._apply_commands(context, parsed)
+
+    async def async_generate_execution_commands(
+            self, context: SkillContext) -> List[Dict[str, Any]]:
+        """Async version of `generate_execution_commands`."""
+        if not context.plan:
+            return []
+
+        prompt = self._commands_prompt(context)
+        parsed = await self._async_llm_generate_json(
+            prompt,
+            cached_prefix=self._skill_context_prefix(context),
+            cache_key=self._context_cache_key(context, prompt))
+        return self._apply_commands(context, parsed)
+
+    @staticmethod
+    def _commands_prompt(context: SkillContext) -> str:
+        """Build the command prompt from the plan and loaded resources."""
+        return PROMPT_SKILL_EXECUTION_COMMAND.format(
+            execution_plan=_json_dumps(
                 {
                     'plan_summary': context.plan.plan_summary,
                     'steps': context.plan.steps,
                     'parameters': context.plan.parameters,
                 },
-                indent=2),
+                indent=True),
             scripts_content=context.get_loaded_scripts_content(),
-            references_content=context.get_loaded_references_content()[:2000],
-            resources_content=context.get_loaded_resources_content()[:2000])
-
-        response = self._llm_generate(prompt)
-        parsed = self._parse_json_response(response)
-
+            references_content=context.get_loaded_references_content(
+                max_chars=2000),
+            resources_content=context.get_loaded_resources_content(
+                max_chars=2000))
+
+    @staticmethod
+    def _apply_commands(context: SkillContext,
+                        parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract the commands parsed from the LLM, falling back to scripts."""
         commands = parsed.get('commands', [])
 
         # Fallback: if no commands generated, try to use loaded scripts directly
@@ -305,7 +861,7 @@ class SkillAnalyzer:
                             'code': script_content
                         })
 
-        context.spec.tasks = json.dumps(commands, indent=2)
+        context.spec.tasks = _json_dumps(commands, indent=True)
 
         return commands
 
@@ -313,7 +869,8 @@ class SkillAnalyzer:
             self,
             skill: SkillSchema,
             query: str,
-            root_path: Path = None
+            root_path: Path = None,
+            context: Optional[SkillContext] = None
     ) -> Tuple[SkillContext, List[Dict[str, Any]]]:
         """
         Complete progressive analysis: plan -> load -> generate commands.
@@ -322,28 +879,35 @@ class SkillAnalyzer:
             skill: SkillSchema to analyze.
             query: User's query.
             root_path: Root path for context.
+            context: Optional context already holding a plan, e.g. from
+                `async_analyze_skills_batch`, skips the plan phase.
 
         Returns:
             Tuple of (SkillContext, execution_commands).
         """
-        # Phase 1: Create plan
-        context = await asyncio.to_thread(self.analyze_skill_plan, skill,
-                                          query, root_path)
+        # Phase 1: Create plan, single script skills need no LLM for it
+        if context is None and self.enable_fast_path:
+            context = self.fast_path_plan(skill, query, root_path)
+        if context is None:
+            # Text files are read while the plan call is in flight, so the
+            # load phase below finds them cached
+            context, _ = await asyncio.gather(
+                self.async_analyze_skill_plan(skill, query, root_path),
+                asyncio.to_thread(self._prefetch_skill_files, skill))
 
         if not context.plan or not context.plan.can_handle:
             return context, []
 
-        # Phase 2: Load resources
+        # Phase 2: Load resources, file reads stay off the event loop
         await asyncio.to_thread(self.load_skill_resources, context)
 
         # Phase 3: Generate commands
-        commands = await asyncio.to_thread(self.generate_execution_commands,
-                                           context)
+        commands = await self.async_generate_execution_commands(context)
 
         return context, commands
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SkillDAGResult:
     """
     Result of AutoSkills run containing the skill execution DAG.
@@ -382,10 +946,121 @@ class SkillDAGResult:
             'chat_response':
             self.chat_response,
             'execution_result':
-            self.execution_result.__dict__ if self.execution_result else None,
+            {
+                f.name: getattr(self.execution_result, f.name)
+                for f in fields(self.execution_result)
+            } if self.execution_result else None,
         }
 
 
+class _ErrorAnalysisBatcher:
+    """
+    Collect error analysis prompts submitted within a short window and send
+    them to the LLM as one request.
+
+    Skills of a parallel group often fail together, each of them then waits
+    for the same batched call instead of issuing its own.
+    """
+
+    def __init__(self,
+                 llm: 'LLM',
+                 max_batch: int = 8,
+                 max_wait: float = 0.02):
+        """
+        Args:
+            llm: LLM instance to analyze the errors with.
+            max_batch: Number of pending prompts that triggers a request.
+            max_wait: Seconds to wait for more prompts after the first one.
+        """
+        self.llm = llm
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[Tuple[str, 'asyncio.Future']] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Running requests, referenced until done so they are not collected
+        self._requests: Set['asyncio.Task'] = set()
+
+    async def submit(self, prompt: str) -> Dict[str, Any]:
+        """
+        Queue an error analysis prompt and wait for its parsed response.
+
+        Args:
+            prompt: Formatted PROMPT_ANALYZE_EXECUTION_ERROR.
+
+        Returns:
+            Parsed JSON response, empty if the analysis failed.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            request = asyncio.ensure_future(self._request(batch))
+            self._requests.add(request)
+            request.add_done_callback(self._requests.discard)
+
+    async def _request(self, batch: List[Tuple[str, 'asyncio.Future']]):
+        try:
+            results = await self._analyze([prompt for prompt, _ in batch])
+        except Exception as e:
+            logger.warning(f'Error analyzing execution failures: {e}')
+            results = [{}] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _analyze_one(self, prompt: str) -> Dict[str, Any]:
+        try:
+            response = await self.llm.agenerate(
+                messages=[Message(role='user', content=prompt)])
+        except Exception as e:
+            logger.warning(f'Error analyzing execution failure: {e}')
+            return {}
+        return _parse_json_response(
+            response.content if hasattr(response, 'content') else str(response))
+
+    async def _analyze(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        if len(prompts) == 1:
+            return [await self._analyze_one(prompts[0])]
+
+        tasks = '\n\n'.join(
+            f'### Task {i}\n{prompt}' for i, prompt in enumerate(prompts, 1))
+        # Fixed instructions go first so they stay prompt cached
+        response = await self.llm.agenerate(messages=[
+            Message(role='user', content=PROMPT_ANALYZE_EXECUTION_ERRORS_BATCH),
+            Message(role='user', content=tasks)
+        ])
+        parsed = _parse_json_response(
+            response.content if hasattr(response, 'content') else str(response))
+        entries = parsed.get('results', []) if isinstance(parsed, dict) else []
+        by_task = {
+            str(entry.pop('task', None)): entry
+            for entry in entries if isinstance(entry, dict)
+        }
+
+        results = [by_task.get(str(i)) for i in range(1, len(prompts) + 1)]
+        missing = [i for i, result in enumerate(results) if not result]
+        if missing:
+            logger.warning(
+                f'Batched error analysis missed {len(missing)} of '
+                f'{len(prompts)} tasks, analyzing them one by one')
+            fallback = await asyncio.gather(
+                *[self._analyze_one(prompts[i]) for i in missing])
+            for i, result in zip(missing, fallback):
+                results[i] = result
+        return results
+
+
 class DAGExecutor:
     """
     Executor for skill DAG with dependency-aware parallel execution.
@@ -402,7 +1077,11 @@ class DAGExecutor:
                  llm: 'LLM' = None,
                  enable_progressive_analysis: bool = True,
                  enable_self_reflection: bool = True,
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 enable_fast_path: bool = False,
+                 batch_plans: bool = False,
+                 batch_error_analysis: bool = False,
+                 cache_flush_delay: float = 2.0):
         """
         Initialize DAG executor.
 
@@ -414,6 +1093,15 @@ class DAGExecutor:
             enable_progressive_analysis: Whether to use progressive analysis.
             enable_self_reflection: Whether to analyze errors and retry on failure.
             max_retries: Maximum retry attempts for failed executions.
+            enable_fast_path: Whether to skip the plan phase of progressive
+                analysis for single script skills, off by default. See
+                `SkillAnalyzer.fast_path_plan` for what is skipped.
+            batch_plans: Whether to plan the skills of a parallel group with a
+                single LLM call instead of one call per skill.
+            batch_error_analysis: Whether to send the error analyses of skills
+                failing at the same time in a single LLM call.
+            cache_flush_delay: Seconds to wait after a change of the error
+                analysis cache before writing it, from a timer thread.
         """
         self.container = container
         self.skills = skills
@@ -422,11 +1110,19 @@ class DAGExecutor:
         self.enable_progressive_analysis = enable_progressive_analysis and llm is not None
         self.enable_self_reflection = enable_self_reflection and llm is not None
         self.max_retries = max_retries
+        self.batch_plans = batch_plans
+        self.cache_flush_delay = cache_flush_delay
+        self._error_batcher: Optional[_ErrorAnalysisBatcher] = None
+        if batch_error_analysis and self.enable_self_reflection:
+            self._error_batcher = _ErrorAnalysisBatcher(llm)
 
         # Skill analyzer for progressive analysis
         self._analyzer: Optional[SkillAnalyzer] = None
         if self.enable_progressive_analysis:
-            self._analyzer = SkillAnalyzer(llm)
+            self._analyzer = SkillAnalyzer(
+                llm,
+                cache_dir=Path(self.workspace_dir) / '.cache',
+                enable_fast_path=enable_fast_path)
 
         # Execution state: stores outputs keyed by skill_id
         self._outputs: Dict[str, ExecutionOutput] = {}
@@ -437,6 +1133,60 @@ class DAGExecutor:
         # Track execution attempts for retry logging
         self._execution_attempts: Dict[str, int] = {}
 
+        # Upstream data of each output and its JSON, shared by all the
+        # downstream skills: skill_id -> (output, data, json)
+        self._upstream_cache: Dict[str, Tuple[ExecutionOutput, Dict[str, Any], str]] = {}
+
+        # Error analyses that offered a fix, see _error_analysis_key(). A
+        # failure seen before, in this run or an earlier one, reuses its fix
+        # without another LLM call, until that fix fails itself. Persisted
+        # next to the skill analyses, least recently used first. Skill
+        # contexts are not persisted, they are rebuilt from those analyses
+        self._analysis_cache_file: Optional[Path] = (
+            Path(self.workspace_dir) / '.cache' / 'error_analysis_cache.json'
+            if self.enable_self_reflection else None)
+        self._analysis_cache: 'OrderedDict[str, Dict[str, Any]]' = (
+            self._load_analysis_cache())
+        self._analysis_cache_lock = threading.Lock()
+        # Pending write of the cache file, see _schedule_analysis_flush()
+        self._analysis_flush_timer: Optional[threading.Timer] = None
+        self._analysis_flush_lock = threading.Lock()
+
+    def _load_analysis_cache(self) -> 'OrderedDict[str, Dict[str, Any]]':
+        """Load persisted error analyses, empty if none or unreadable."""
+        cache = OrderedDict(
+            _load_json_cache(self._analysis_cache_file, 'error analysis cache'))
+        while len(cache) > _ERROR_ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return cache
+
+    def _schedule_analysis_flush(self):
+        """Write the cache after `cache_flush_delay`, caller holds the lock."""
+        if not self._analysis_cache_file or self._analysis_flush_timer is not None:
+            return
+        self._analysis_flush_timer = threading.Timer(self.cache_flush_delay,
+                                                     self._flush_analysis_cache)
+        self._analysis_flush_timer.daemon = True
+        self._analysis_flush_timer.start()
+
+    def _flush_analysis_cache(self):
+        """Write pending error analyses to the cache file now."""
+        with self._analysis_flush_lock:
+            with self._analysis_cache_lock:
+                if self._analysis_flush_timer is None:
+                    return
+                self._analysis_flush_timer.cancel()
+                self._analysis_flush_timer = None
+                snapshot = dict(self._analysis_cache)
+            _save_json_cache(self._analysis_cache_file, snapshot,
+                             'error analysis cache')
+
+    def flush(self):
+        """Write pending skill and error analyses to their cache files now."""
+        if self._analyzer:
+            self._analyzer.flush()
+        self._flush_analysis_cache()
+
     def _get_skill_dependencies(self, skill_id: str,
                                 dag: Dict[str, List[str]]) -> List[str]:
         """
@@ -471,31 +1221,26 @@ class DAGExecutor:
 
         # Get outputs from upstream dependencies
         dependencies = self._get_skill_dependencies(skill_id, dag)
-        upstream_data: Dict[str, Any] = {}
-
-        for dep_id in dependencies:
-            if dep_id in self._outputs:
-                dep_output = self._outputs[dep_id]
-                # Pass stdout/return_value as upstream data
-                upstream_data[dep_id] = {
-                    'stdout': dep_output.stdout,
-                    'stderr': dep_output.stderr,
-                    'return_value': dep_output.return_value,
-                    'exit_code': dep_output.exit_code,
-                    'output_files':
-                    {k: str(v)
-                     for k, v in dep_output.output_files.items()},
-                }
+        upstream = [(dep_id, self._get_upstream_data(dep_id))
+                    for dep_id in dependencies if dep_id in self._outputs]
 
         # Inject upstream data into environment variables as JSON
         env_vars = base_input.env_vars.copy()
-        if upstream_data:
-            env_vars['UPSTREAM_OUTPUTS'] = json.dumps(upstream_data)
+        if upstream:
+            # Assembled from the JSON of each upstream output, same as
+            # dumping the whole mapping. Each output gets an equal share of
+            # the size limit
+            budget = _UPSTREAM_OUTPUTS_LIMIT // len(upstream)
+            entries = []
+            for dep_id, (data, data_json) in upstream:
+                key = _json_dumps(dep_id)
+                entries.append(f'{key}:' + _fit_upstream_json(
+                    data, data_json, budget - len(key.encode('utf-8')) - 2))
+            env_vars['UPSTREAM_OUTPUTS'] = '{' + ','.join(entries) + '}'
             # Also provide individual upstream references
-            for dep_id, data in upstream_data.items():
-                safe_key = dep_id.replace('-', '_').replace('.', '_').upper()
+            for dep_id, (data, _) in upstream:
                 if data.get('stdout'):
-                    env_vars[f'UPSTREAM_{safe_key}_STDOUT'] = data[
+                    env_vars[f'UPSTREAM_{_env_safe_key(dep_id)}_STDOUT'] = data[
                         'stdout'][:4096]
 
         return ExecutionInput(
@@ -508,6 +1253,38 @@ class DAGExecutor:
             requirements=base_input.requirements,
         )
 
+    def _get_upstream_data(self, dep_id: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Get the data passed downstream from a skill's output, and its JSON.
+
+        Computed once per output, skills sharing a dependency reuse it.
+
+        Args:
+            dep_id: The upstream skill, must have an output.
+
+        Returns:
+            Tuple of (upstream data, upstream data as JSON).
+        """
+        dep_output = self._outputs[dep_id]
+        cached = self._upstream_cache.get(dep_id)
+        if cached is not None and cached[0] is dep_output:
+            return cached[1], cached[2]
+
+        # Pass stdout/return_value as upstream data, the text truncated once
+        # here rather than serialized in full
+        data = {
+            'stdout': (dep_output.stdout or '')[:_UPSTREAM_TEXT_LIMIT],
+            'stderr': (dep_output.stderr or '')[:_UPSTREAM_TEXT_LIMIT],
+            'return_value': dep_output.return_value,
+            'exit_code': dep_output.exit_code,
+            'output_files':
+            {k: str(v)
+             for k, v in dep_output.output_files.items()},
+        }
+        data_json = _json_dumps(data)
+        self._upstream_cache[dep_id] = (dep_output, data, data_json)
+        return data, data_json
+
     def _determine_executor_type(self, skill: SkillSchema) -> ExecutorType:
         """
         Determine the executor type based on skill scripts.
@@ -520,26 +1297,16 @@ class DAGExecutor:
         """
         if not skill.scripts:
             return ExecutorType.PYTHON_CODE
-
-        # Check first script's extension
-        primary_script = skill.scripts[0]
-        ext = primary_script.type.lower()
-
-        if ext in ['.py']:
-            return ExecutorType.PYTHON_SCRIPT
-        elif ext in ['.sh', '.bash']:
-            return ExecutorType.SHELL
-        elif ext in ['.js', '.mjs']:
-            return ExecutorType.JAVASCRIPT
-        else:
-            return ExecutorType.PYTHON_CODE
+        return _EXT_TO_EXECUTOR.get(skill.scripts[0].type.lower(),
+                                    ExecutorType.PYTHON_CODE)
 
     async def _execute_single_skill(
             self,
             skill_id: str,
             dag: Dict[str, List[str]],
             execution_input: Optional[ExecutionInput] = None,
-            query: str = '') -> SkillExecutionResult:
+            query: str = '',
+            context: Optional[SkillContext] = None) -> SkillExecutionResult:
         """
         Execute a single skill with dependency-linked input.
 
@@ -553,6 +1320,7 @@ class DAGExecutor:
             dag: Skill dependency DAG.
             execution_input: Optional user-provided input.
             query: User query for progressive analysis.
+            context: Optional context already planned for the skill.
 
         Returns:
             SkillExecutionResult with execution outcome.
@@ -571,7 +1339,7 @@ class DAGExecutor:
             # Use progressive analysis if enabled
             if self.enable_progressive_analysis and self._analyzer:
                 return await self._execute_with_progressive_analysis(
-                    skill, skill_id, exec_input, query)
+                    skill, skill_id, exec_input, query, context)
 
             # Fallback: direct execution without progressive analysis
             return await self._execute_direct(skill, skill_id, exec_input)
@@ -582,8 +1350,12 @@ class DAGExecutor:
                 skill_id=skill_id, success=False, error=str(e))
 
     async def _execute_with_progressive_analysis(
-            self, skill: SkillSchema, skill_id: str,
-            exec_input: ExecutionInput, query: str) -> SkillExecutionResult:
+            self,
+            skill: SkillSchema,
+            skill_id: str,
+            exec_input: ExecutionInput,
+            query: str,
+            context: Optional[SkillContext] = None) -> SkillExecutionResult:
         """
         Execute skill using progressive analysis.
 
@@ -592,6 +1364,7 @@ class DAGExecutor:
             skill_id: Skill identifier.
             exec_input: Execution input with upstream data.
             query: User query for context.
+            context: Optional context already planned for the skill.
 
         Returns:
             SkillExecutionResult with execution outcome.
@@ -599,7 +1372,7 @@ class DAGExecutor:
         # Phase 1 & 2: Analyze and load resources
         # Use skill's directory as root_path for proper file resolution
         context, commands = await self._analyzer.analyze_and_prepare(
-            skill, query, skill.skill_path)
+            skill, query, skill.skill_path, context=context)
 
         # Store context for reference
         self._contexts[skill_id] = context
@@ -721,19 +1494,12 @@ class DAGExecutor:
         # Use skill directory as working directory for proper file access
         working_dir = exec_input.working_dir or context.skill_dir
 
-        # Collect all requirements: from plan, command, and input
-        all_requirements = []
-        if context.plan and context.plan.required_packages:
-            all_requirements.extend(context.plan.required_packages)
-        all_requirements.extend(cmd.get('requirements', []))
-        all_requirements.extend(exec_input.requirements)
-        # Deduplicate while preserving order
-        seen = set()
-        unique_requirements = []
-        for req in all_requirements:
-            if req not in seen:
-                seen.add(req)
-                unique_requirements.append(req)
+        # Collect all requirements: from plan, command, and input,
+        # deduplicated while preserving order
+        unique_requirements = list(dict.fromkeys(itertools.chain(
+            context.plan.required_packages if context.plan else (),
+            cmd.get('requirements', []),
+            exec_input.requirements)))
 
         merged_input = ExecutionInput(
             args=exec_input.args + list(params.values()),
@@ -814,10 +1580,13 @@ class DAGExecutor:
         """
         current_cmd = cmd.copy()
         last_output = None
+        # Cache key of the analysis whose fix the current attempt runs
+        applied_key: Optional[str] = None
 
         for attempt in range(1, self.max_retries + 1):
             self._execution_attempts[skill_id] = attempt
-            logger.info(f'[{skill_id}] Execution attempt {attempt}/{self.max_retries}')
+            logger.info('[%s] Execution attempt %d/%d', skill_id, attempt,
+                        self.max_retries)
 
             # Execute the command
             output = await self._execute_command(
@@ -827,61 +1596,75 @@ class DAGExecutor:
             # Check if successful
             if output.exit_code == 0:
                 if attempt > 1:
-                    logger.info(
-                        f'[{skill_id}] Execution succeeded after {attempt} attempts')
+                    logger.info('[%s] Execution succeeded after %d attempts',
+                                skill_id, attempt)
                 return output
 
-            # Collect error info
-            error_msg = output.stderr[:500] if output.stderr else 'Unknown error'
-            logger.warning(f'[{skill_id}] Attempt {attempt} failed: {error_msg[:200]}')
+            # Lazy formatting, stderr is only truncated if the record is emitted
+            logger.warning('[%s] Attempt %d failed: %.200s', skill_id, attempt,
+                           output.stderr or 'Unknown error')
+
+            # The fix did not work, a later run of the same code asks again
+            if applied_key is not None:
+                with self._analysis_cache_lock:
+                    if self._analysis_cache.pop(applied_key, None) is not None:
+                        self._schedule_analysis_flush()
+                applied_key = None
 
             # Last attempt - no need to analyze
             if attempt >= self.max_retries:
-                logger.warning(
-                    f'[{skill_id}] Max retries ({self.max_retries}) reached')
+                logger.warning('[%s] Max retries (%d) reached', skill_id,
+                               self.max_retries)
+                continue
+
+            # Not worth an LLM call, retry as is
+            if _UNFIXABLE_RE.search(output.stderr or ''):
+                logger.info('[%s] Environmental error, retrying without analysis',
+                            skill_id)
                 continue
 
             # Try to analyze and fix if self-reflection is enabled
             if self.enable_self_reflection and cmd_type in ('python_code', 'python_script'):
                 code = current_cmd.get('code', '')
                 if code:
-                    logger.info(f'[{skill_id}] Analyzing error for retry...')
-                    analysis = self._analyze_execution_error(
+                    logger.info('[%s] Analyzing error for retry...', skill_id)
+                    analysis = await self._analyze_execution_error(
                         skill=skill,
                         failed_code=code,
                         output=output,
                         query=query,
-                        attempt=attempt)
+                        attempt=attempt,
+                        cmd_type=cmd_type)
 
                     error_info = analysis.get('error_analysis', {})
                     is_fixable = error_info.get('is_fixable', False)
                     fixed_code = analysis.get('fixed_code')
                     additional_reqs = analysis.get('additional_requirements', [])
 
-                    logger.info(
-                        f'[{skill_id}] Error analysis: type={error_info.get("error_type")}, '
-                        f'fixable={is_fixable}')
+                    logger.info('[%s] Error analysis: type=%s, fixable=%s',
+                                skill_id, error_info.get('error_type'), is_fixable)
 
                     # Apply fix if available
                     if is_fixable and fixed_code:
+                        applied_key = self._error_analysis_key(
+                            skill_id, cmd_type, code,
+                            _summarize_stderr(output.stderr or ''))
                         current_cmd = current_cmd.copy()
                         current_cmd['code'] = fixed_code
-                        logger.info(f'[{skill_id}] Applying fix')
+                        logger.info('[%s] Applying fix', skill_id)
 
                     # Add additional requirements
                     if additional_reqs:
-                        logger.info(f'[{skill_id}] Adding requirements: {additional_reqs}')
-                        exec_input = ExecutionInput(
-                            args=exec_input.args,
-                            kwargs=exec_input.kwargs,
-                            env_vars=exec_input.env_vars,
-                            input_files=exec_input.input_files,
-                            working_dir=exec_input.working_dir,
-                            requirements=list(set(exec_input.requirements + additional_reqs)))
+                        logger.info('[%s] Adding requirements: %s', skill_id,
+                                    additional_reqs)
+                        exec_input = replace(
+                            exec_input,
+                            requirements=list(dict.fromkeys(itertools.chain(
+                                exec_input.requirements, additional_reqs))))
             else:
-                logger.info(f'[{skill_id}] Retrying without code modification')
+                logger.info('[%s] Retrying without code modification', skill_id)
 
-        logger.error(f'[{skill_id}] All {self.max_retries} attempts failed')
+        logger.error('[%s] All %d attempts failed', skill_id, self.max_retries)
         return last_output
 
     def _merge_outputs(self,
@@ -892,41 +1675,56 @@ class DAGExecutor:
         if len(outputs) == 1:
             return outputs[0]
 
-        # Merge all outputs
-        merged_stdout = '\n'.join(o.stdout for o in outputs if o.stdout)
-        merged_stderr = '\n'.join(o.stderr for o in outputs if o.stderr)
-        final_exit_code = next(
-            (o.exit_code for o in outputs if o.exit_code != 0), 0)
-        total_duration = sum(o.duration_ms for o in outputs)
-
-        # Merge output files
+        # Merge all outputs in one pass, the first non-zero exit code wins
+        stdout_parts, stderr_parts = [], []
         merged_files = {}
+        final_exit_code = 0
+        total_duration = 0
         for o in outputs:
+            if o.stdout:
+                stdout_parts.append(o.stdout)
+            if o.stderr:
+                stderr_parts.append(o.stderr)
+            if not final_exit_code:
+                final_exit_code = o.exit_code
+            total_duration += o.duration_ms
             merged_files.update(o.output_files)
 
         return ExecutionOutput(
-            stdout=merged_stdout,
-            stderr=merged_stderr,
+            stdout='\n'.join(stdout_parts),
+            stderr='\n'.join(stderr_parts),
             exit_code=final_exit_code,
             output_files=merged_files,
             duration_ms=total_duration)
 
-    def _analyze_execution_error(
+    @staticmethod
+    def _error_analysis_key(skill_id: str, cmd_type: str, failed_code: str,
+                            stderr: str) -> str:
+        """Cache key of a failure, `stderr` as given by _summarize_stderr()."""
+        return '\0'.join((skill_id, cmd_type, _digest(failed_code),
+                          _digest(_STDERR_NOISE_RE.sub('', stderr))))
+
+    async def _analyze_execution_error(
             self,
             skill: SkillSchema,
             failed_code: str,
             output: ExecutionOutput,
             query: str,
-            attempt: int) -> Dict[str, Any]:
+            attempt: int,
+            cmd_type: str = '') -> Dict[str, Any]:
         """
         Analyze failed execution and generate a fix using LLM.
 
+        Fixable analyses are cached per skill, command type, failed code and
+        stderr, with temp paths and line numbers stripped from stderr.
+
         Args:
             skill: The skill that failed.
             failed_code: The code that failed.
             output: ExecutionOutput with error details.
             query: Original user query.
             attempt: Current retry attempt number.
+            cmd_type: Type of the failed command.
 
         Returns:
             Dict with error analysis and fixed code.
@@ -935,26 +1733,49 @@ class DAGExecutor:
             return {'error_analysis': {'is_fixable': False},
                     'fixed_code': None}
 
+        stderr = _summarize_stderr(output.stderr or '')
+        cache_key = self._error_analysis_key(skill.skill_id, cmd_type,
+                                             failed_code, stderr)
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info(f'[{skill.skill_id}] Reusing cached error analysis')
+            return cached
+
         prompt = PROMPT_ANALYZE_EXECUTION_ERROR.format(
             query=query,
             skill_id=skill.skill_id,
             skill_name=skill.name,
             failed_code=failed_code[:8000],  # Limit code length
-            stderr=output.stderr[:3000] if output.stderr else '',
+            stderr=stderr,
             stdout=output.stdout[:1000] if output.stdout else '',
             attempt=attempt,
             max_attempts=self.max_retries)
 
         try:
-            response = self.llm.generate(
-                messages=[Message(role='user', content=prompt)])
-            # Parse JSON response - handle different response formats
-            response_text = (response.content if hasattr(response, 'content')
-                             else str(response)).strip()
-            # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                return json.loads(json_match.group())
+            if self._error_batcher:
+                parsed = await self._error_batcher.submit(prompt)
+            else:
+                # Off the event loop, so parallel skills keep running meanwhile
+                response = await self.llm.agenerate(
+                    messages=[Message(role='user', content=prompt)])
+                # Parse JSON response - handle different response formats
+                response_text = (response.content if hasattr(response, 'content')
+                                 else str(response))
+                # Extract JSON from response
+                parsed = _parse_json_response(response_text)
+            if parsed:
+                # An unfixable verdict may be a one-off, the next failure
+                # asks again
+                if parsed.get('error_analysis', {}).get('is_fixable'):
+                    with self._analysis_cache_lock:
+                        self._analysis_cache[cache_key] = parsed
+                        if len(self._analysis_cache) > _ERROR_ANALYSIS_CACHE_SIZE:
+                            self._analysis_cache.popitem(last=False)
+                        self._schedule_analysis_flush()
+                return parsed
         except Exception as e:
             logger.warning(f'Error analyzing execution failure: {e}')
 
@@ -978,8 +1799,21 @@ class DAGExecutor:
         Returns:
             List of SkillExecutionResult for each skill.
         """
+        planned: Dict[str, SkillContext] = {}
+        if (self.batch_plans and self.enable_progressive_analysis
+                and self._analyzer):
+            try:
+                planned = await self._analyzer.async_analyze_skills_batch(
+                    [self.skills[sid] for sid in skill_ids if sid in self.skills],
+                    query)
+            except Exception as e:
+                # Each skill then plans on its own
+                logger.warning(f'Batched skill analysis failed: {e}')
+
         tasks = [
-            self._execute_single_skill(sid, dag, execution_input, query)
+            _start_task(
+                self._execute_single_skill(sid, dag, execution_input, query,
+                                           planned.get(sid)))
             for sid in skill_ids
         ]
         return await asyncio.gather(*tasks)
@@ -1007,13 +1841,20 @@ class DAGExecutor:
         Returns:
             DAGExecutionResult with all execution outcomes.
         """
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         results: Dict[str, SkillExecutionResult] = {}
         actual_order: List[Union[str, List[str]]] = []
         all_success = True
 
+        # Mount every skill up front, so the sandbox is created once for the
+        # whole DAG rather than recreated for each newly mounted skill
+        for item in execution_order:
+            for sid in (item if isinstance(item, list) else [item]):
+                if sid in self.skills:
+                    self.container.mount_skill_directory(
+                        sid, self.skills[sid].skill_path)
+
         for item in execution_order:
             if isinstance(item, list):
                 # Parallel execution group
@@ -1044,7 +1885,10 @@ class DAGExecutor:
                             f'Stopping DAG execution due to failure: {item}')
                         break
 
-        total_duration = (time.time() - start_time) * 1000
+        total_duration = (time.perf_counter() - start_time) * 1000
+
+        # Analyses of this run are on disk before the caller may exit
+        await asyncio.to_thread(self.flush)
 
         return DAGExecutionResult(
             success=all_success,
@@ -1083,6 +1927,11 @@ class AutoSkills:
                  max_retries: int = 3,
                  work_dir: Optional[Union[str, Path]] = None,
                  use_sandbox: bool = True,
+                 semantic_cache: bool = False,
+                 tau: float = 0.85,
+                 enable_fast_path: bool = False,
+                 batch_plans: bool = False,
+                 batch_error_analysis: bool = False,
                  **kwargs):
         """
         Initialize AutoSkills with skills corpus and retriever.
@@ -1103,6 +1952,19 @@ class AutoSkills:
             max_retries: Maximum retry attempts for failed executions for each skill.
             work_dir: Working directory for skill execution.
             use_sandbox: Whether to use Docker sandbox for execution.
+            semantic_cache: Whether to reuse the skill DAG of a previous query
+                whose embedding is similar enough, skipping all LLM calls of
+                `get_skill_dag()`. Only complete skill DAGs are cached, not
+                chat replies. Only applies when retrieval is enabled,
+                persisted under `work_dir/.cache` if work_dir is given.
+            tau: Minimum cosine similarity for a semantic cache hit.
+            enable_fast_path: Whether to skip the plan phase of progressive
+                analysis for single script skills, see
+                `SkillAnalyzer.fast_path_plan` for what is skipped.
+            batch_plans: Whether to plan the skills of a parallel group with a
+                single LLM call instead of one call per skill.
+            batch_error_analysis: Whether to send the error analyses of skills
+                failing at the same time in a single LLM call.
 
         Examples:
             >>> from omegaconf import DictConfig
@@ -1143,6 +2005,9 @@ class AutoSkills:
         self.max_retries = max_retries
         self.work_dir = Path(work_dir) if work_dir else None
         self.use_sandbox = use_sandbox
+        self.enable_fast_path = enable_fast_path
+        self.batch_plans = batch_plans
+        self.batch_error_analysis = batch_error_analysis
         self.kwargs = kwargs
 
         if self.use_sandbox:
@@ -1161,11 +2026,25 @@ class AutoSkills:
         self.corpus_to_skill_id: Dict[str, str] = {}
         self._build_corpus()
 
+        # Prompt sections built from the skills, which are fixed once loaded
+        self._skills_overview: Dict[int, str] = {}
+        self._all_skills_context: Optional[str] = None
+
         # Initialize retriever only if search is enabled
         self.retriever: Optional[HybridRetriever] = None
         if self.enable_retrieve and self.corpus:
             self.retriever = HybridRetriever(corpus=self.corpus, **kwargs)
 
+        # Semantic cache over query embeddings of the retriever's encoder
+        self._semantic_cache: Optional[SemanticCache] = None
+        if semantic_cache and self.retriever:
+            self._semantic_cache = SemanticCache(
+                dim=self.retriever.embed_model.
+                get_sentence_embedding_dimension(),
+                tau=tau,
+                path=self.work_dir / '.cache' / 'semcache.faiss'
+                if self.work_dir else None)
+
         # Container and executor (lazy initialization)
         self._container: Optional[SkillContainer] = None
         self._executor: Optional[DAGExecutor] = None
@@ -1181,78 +2060,46 @@ class AutoSkills:
     def _extract_skill_id_from_doc(self, doc: str) -> Optional[str]:
         """Extract skill_id from corpus document string."""
         # First try direct lookup
-        if doc in self.corpus_to_skill_id:
-            return self.corpus_to_skill_id[doc]
-        # Fallback: extract from [skill_id] pattern
-        match = re.match(r'\[([^\]]+)\]', doc)
-        return match.group(1) if match else None
+        skill_id = self.corpus_to_skill_id.get(doc)
+        if skill_id is not None:
+            return skill_id
+        # Fallback: extract from the leading [skill_id]
+        if doc.startswith('['):
+            end = doc.find(']')
+            if end > 1:
+                return doc[1:end]
+        return None
 
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """Parse JSON from LLM response with robust extraction."""
-        # Remove markdown code blocks if present
-        response = re.sub(r'```json\s*', '', response)
-        response = re.sub(r'```\s*$', '', response)
-        response = response.strip()
-
-        # Try direct parsing first
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            pass
-
-        # Try to extract JSON object from response
-        try:
-            # Find the outermost JSON object
-            start = response.find('{')
-            if start != -1:
-                # Find matching closing brace
-                depth = 0
-                for i, char in enumerate(response[start:], start):
-                    if char == '{':
-                        depth += 1
-                    elif char == '}':
-                        depth -= 1
-                        if depth == 0:
-                            json_str = response[start:i + 1]
-                            return json.loads(json_str)
-        except json.JSONDecodeError:
-            pass
-
-        # Try regex extraction as fallback
-        try:
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-
-        logger.warning(f'Failed to parse JSON response: {response[:300]}...')
-        return {}
+        return _parse_json_response(response)
 
     def _get_skills_overview(self, limit: int = 20) -> str:
         """Generate a brief overview of all available skills."""
-        lines = []
-        for skill_id, skill in self.all_skills.items():
-            lines.append(
-                f'- [{skill_id}] {skill.name}: {skill.description[:200]}')
-        return '\n'.join(lines[:limit])  # Limit to avoid token overflow
+        overview = self._skills_overview.get(limit)
+        if overview is None:
+            # Limit to avoid token overflow, skills past the limit are not
+            # formatted at all
+            overview = self._skills_overview[limit] = '\n'.join(
+                f'- [{skill_id}] {skill.name}: {skill.description[:200]}'
+                for skill_id, skill in itertools.islice(
+                    self.all_skills.items(), limit))
+        return overview
 
     def _get_all_skills_context(self) -> str:
         """Generate full context of all skills for direct LLM selection."""
-        lines = []
-        for skill_id, skill in self.all_skills.items():
-            lines.append(f'- [{skill_id}] {skill.name}\n  {skill.description}')
-        return '\n'.join(lines)
+        if self._all_skills_context is None:
+            self._all_skills_context = '\n'.join(
+                f'- [{skill_id}] {skill.name}\n  {skill.description}'
+                for skill_id, skill in self.all_skills.items())
+        return self._all_skills_context
 
     def _format_retrieved_skills(self, skill_ids: Set[str]) -> str:
         """Format retrieved skills for LLM prompt."""
-        lines = []
-        for skill_id in skill_ids:
-            if skill_id in self.all_skills:
-                skill = self.all_skills[skill_id]
-                lines.append(
-                    f'- [{skill_id}] {skill.name}\n  {skill.description}\n Main Content: {skill.content[:3000]}')
-        return '\n'.join(lines)
+        return '\n'.join(
+            f'- [{sid}] {skill.name}\n  {skill.description}\n Main Content: {skill.content[:3000]}'
+            for sid, skill in ((sid, self.all_skills.get(sid))
+                               for sid in skill_ids) if skill)
 
     def _llm_generate(self, prompt: str) -> str:
         """Generate LLM response from prompt."""
@@ -1292,7 +2139,7 @@ class AutoSkills:
 
     async def _async_retrieve_skills(self, queries: List[str]) -> Set[str]:
         """
-        Retrieve skills for multiple queries in parallel.
+        Retrieve skills for multiple queries in one batched search.
 
         Args:
             queries: List of search queries.
@@ -1303,13 +2150,9 @@ class AutoSkills:
         if not self.retriever:
             return set()
 
-        # Run parallel async searches
-        tasks = [
-            self.retriever.async_search(
-                query=q, top_k=self.top_k, min_score=self.min_score)
-            for q in queries
-        ]
-        results = await asyncio.gather(*tasks)
+        # One batched search, all queries are embedded in a single call
+        results = await self.retriever.async_batch_search(
+            queries, top_k=self.top_k, min_score=self.min_score)
 
         # Collect unique skill_ids
         skill_ids = set()
@@ -1342,29 +2185,23 @@ class AutoSkills:
 
         # Format candidate skills based on mode
         if mode == 'deep':
-            # Include name, description, and content (truncated)
-            skill_entries = []
-            for sid in skill_ids:
-                if sid not in self.all_skills:
-                    continue
-                skill = self.all_skills[sid]
-                content = skill.content[:3000] if skill.content else ''
-                entry = (
-                    f'### [{sid}] {skill.name}\n'
-                    f'**Description**: {skill.description}\n'
-                    f'**Content**: {content}'
-                )
-                skill_entries.append(entry)
-            candidate_skills_text = '\n\n'.join(skill_entries)
+            # Include name, description, and content (truncated). Whitespace
+            # only costs tokens here, the budget goes to actual content
+            candidate_skills_text = '\n\n'.join(
+                f'### [{sid}] {skill.name}\n'
+                f'**Description**: {skill.description}\n'
+                f'**Content**: {_condense(skill.content or "", 3000)}'
+                for sid, skill in ((sid, self.all_skills.get(sid))
+                                   for sid in skill_ids) if skill)
             prompt = PROMPT_FILTER_SKILLS_DEEP.format(
                 query=query,
                 candidate_skills=candidate_skills_text)
         else:
             # Fast mode: name and description only
-            candidate_skills_text = '\n'.join([
-                f'- [{sid}] {self.all_skills[sid].name}: {self.all_skills[sid].description}'
-                for sid in skill_ids if sid in self.all_skills
-            ])
+            candidate_skills_text = '\n'.join(
+                f'- [{sid}] {skill.name}: {skill.description}'
+                for sid, skill in ((sid, self.all_skills.get(sid))
+                                   for sid in skill_ids) if skill)
             prompt = PROMPT_FILTER_SKILLS_FAST.format(
                 query=query,
                 candidate_skills=candidate_skills_text)
@@ -1497,44 +2334,32 @@ class AutoSkills:
         if not dag:
             return []
 
-        # Calculate in-degree for each node
-        in_degree = {node: 0 for node in dag}
-        for node, deps in dag.items():
-            for dep in deps:
-                if dep in in_degree:
-                    pass  # dep is a dependency, node depends on it
-            # Count how many nodes depend on this node
-        for node, deps in dag.items():
-            for dep in deps:
-                if dep not in in_degree:
-                    in_degree[dep] = 0
-
-        # Recalculate: in dag[A] = [B], A depends on B, so B must come before A
-        # We need to build reverse mapping
-        in_degree = {node: 0 for node in dag}
-        for dep in set(d for deps in dag.values() for d in deps):
-            if dep not in in_degree:
-                in_degree[dep] = 0
-
+        # In dag[A] = [B], A depends on B, so B must come before A. Build
+        # the reverse mapping once so each node only visits its dependents
+        in_degree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {}
         for node, deps in dag.items():
+            deps = set(deps)
             in_degree[node] = len(deps)
+            for dep in deps:
+                in_degree.setdefault(dep, 0)
+                dependents.setdefault(dep, []).append(node)
 
-        # Start with nodes that have no dependencies
+        # Start with nodes that have no dependencies, a heap keeps the
+        # order deterministic without re-sorting
         queue = [node for node, degree in in_degree.items() if degree == 0]
+        heapq.heapify(queue)
         result = []
 
         while queue:
-            # Sort for deterministic order
-            queue.sort()
-            node = queue.pop(0)
+            node = heapq.heappop(queue)
             result.append(node)
 
             # Reduce in-degree for nodes that depend on this node
-            for other_node, deps in dag.items():
-                if node in deps and other_node in in_degree:
-                    in_degree[other_node] -= 1
-                    if in_degree[other_node] == 0:
-                        queue.append(other_node)
+            for other_node in dependents.get(node, ()):
+                in_degree[other_node] -= 1
+                if in_degree[other_node] == 0:
+                    heapq.heappush(queue, other_node)
 
         # If not all nodes processed, there might be a cycle or disconnected nodes
         remaining = set(dag.keys()) - set(result)
@@ -1620,7 +2445,70 @@ class AutoSkills:
             is_complete=bool(valid_ids),
             clarification=None if valid_ids else 'No relevant skills found.')
 
+    @staticmethod
+    def _dag_result_to_cache(dag_result: SkillDAGResult) -> Dict[str, Any]:
+        """Convert a SkillDAGResult to a JSON serializable cache value."""
+        return {
+            'dag': dag_result.dag,
+            'execution_order': dag_result.execution_order,
+            'selected_skill_ids': list(dag_result.selected_skills),
+            'is_complete': dag_result.is_complete,
+            'clarification': dag_result.clarification,
+        }
+
+    def _dag_result_from_cache(
+            self, cached: Dict[str, Any]) -> Optional[SkillDAGResult]:
+        """Rebuild a SkillDAGResult from a cache value, None if stale."""
+        selected_ids = cached.get('selected_skill_ids', [])
+        # Entries without skills (e.g. chat replies) are never replayed
+        if not selected_ids or not cached.get('execution_order'):
+            return None
+        if any(sid not in self.all_skills for sid in selected_ids):
+            return None
+        return SkillDAGResult(
+            dag=cached.get('dag', {}),
+            execution_order=cached.get('execution_order', []),
+            selected_skills={sid: self.all_skills[sid] for sid in selected_ids},
+            is_complete=cached.get('is_complete', False),
+            clarification=cached.get('clarification'))
+
     async def get_skill_dag(self, query: str) -> SkillDAGResult:
+        """
+        Get the skill execution DAG for a query.
+
+        With the semantic cache enabled, the DAG of a previous query similar
+        to this one is returned without any LLM call, and complete skill
+        DAGs are cached for later queries. Chat-only results are not cached.
+
+        Args:
+            query: User's task query.
+
+        Returns:
+            SkillDAGResult containing the skill execution DAG.
+        """
+        query_vec = None
+        if self._semantic_cache is not None:
+            query_vec = await asyncio.to_thread(self.retriever.embed_query,
+                                                query)
+            cached, sim = self._semantic_cache.get(query_vec)
+            dag_result = self._dag_result_from_cache(cached) if cached else None
+            if dag_result is not None:
+                logger.info(f'Semantic cache hit (similarity={sim:.3f})')
+                return dag_result
+
+        dag_result = await self._get_skill_dag(query)
+
+        if (query_vec is not None and dag_result.is_complete
+                and dag_result.selected_skills
+                and dag_result.execution_order
+                and not dag_result.chat_response):
+            self._semantic_cache.put(query_vec,
+                                     self._dag_result_to_cache(dag_result))
+            # File writes stay off the event loop
+            await asyncio.to_thread(self._semantic_cache.save)
+        return dag_result
+
+    async def _get_skill_dag(self, query: str) -> SkillDAGResult:
         """
         Run the autonomous skill retrieval and DAG construction loop.
 
@@ -1644,16 +2532,17 @@ class AutoSkills:
         # Direct selection mode: put all skills into LLM context
         if not self.enable_retrieve:
             logger.info('Direct selection mode (enable_retrieve=False)')
-            return self._direct_select_skills(query)
+            return await asyncio.to_thread(self._direct_select_skills, query)
 
         # Search mode: use HybridRetriever
         if not self.retriever:
             logger.warning('Retriever not initialized, returning empty result')
             return SkillDAGResult()
 
-        # Step 1: Analyze query to determine if skills are needed
-        needs_skills, intent, skill_queries, chat_response = self._analyze_query(
-            query)
+        # Step 1: Analyze query to determine if skills are needed. The LLM
+        # steps run in threads, the event loop keeps serving other tasks
+        needs_skills, intent, skill_queries, chat_response = await asyncio.to_thread(
+            self._analyze_query, query)
         logger.info(f'Needs skills: {needs_skills}, Intent: {intent}')
 
         # If chat-only, return empty DAG with chat response
@@ -1684,11 +2573,13 @@ class AutoSkills:
             collected_skills = set(list(collected_skills)[:self.max_candidate_skills])
 
         # Step 3: Fast filter by name/description
-        collected_skills = self._filter_skills(query, collected_skills, mode='fast')
+        collected_skills = await asyncio.to_thread(
+            self._filter_skills, query, collected_skills, mode='fast')
         logger.info(f'After fast filter: {collected_skills}')
 
         if len(collected_skills) > 1:
-            collected_skills = self._filter_skills(query, collected_skills, mode='deep')
+            collected_skills = await asyncio.to_thread(
+                self._filter_skills, query, collected_skills, mode='deep')
             logger.info(f'After deep filter: {collected_skills}')
 
         if not collected_skills:
@@ -1697,7 +2588,8 @@ class AutoSkills:
                 is_complete=False, clarification=clarification)
 
         # Step 4: Build DAG with integrated deep filtering
-        dag_result = self._build_dag(query, collected_skills)
+        dag_result = await asyncio.to_thread(
+            self._build_dag, query, collected_skills)
 
         filtered_ids = dag_result.get('filtered_skill_ids', collected_skills)
         skills_dag: Dict[str, Any] = dag_result.get('dag', {})
@@ -1750,7 +2642,10 @@ class AutoSkills:
                 workspace_dir=self.work_dir,
                 llm=self.llm,
                 enable_progressive_analysis=True,
-                max_retries=self.max_retries)
+                max_retries=self.max_retries,
+                enable_fast_path=self.enable_fast_path,
+                batch_plans=self.batch_plans,
+                batch_error_analysis=self.batch_error_analysis)
         return self._executor
 
     async def execute_dag(self,
@@ -11,19 +11,23 @@ Execution modes:
 - use_sandbox=False: Execute locally with security checks (for trusted code or no Docker)
 """
 import asyncio
+import importlib.metadata
 import os
 import platform
 import re
+import shlex
 import shutil
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 from ms_agent.utils.logger import get_logger
 
@@ -48,6 +52,15 @@ LOCAL_DANGEROUS_PATTERNS = DANGEROUS_PATTERNS + [
     r'pathlib\.Path\s*\([^)]*["\']/',  # Accessing root paths
 ]
 
+# Compiled once at import, `_security_check` runs on every execution
+_DANGEROUS_RES = [(p, re.compile(p, re.IGNORECASE))
+                  for p in DANGEROUS_PATTERNS]
+_LOCAL_DANGEROUS_RES = [(p, re.compile(p, re.IGNORECASE))
+                        for p in LOCAL_DANGEROUS_PATTERNS]
+
+# A requirement that is just a distribution name, without version or extras
+_BARE_REQUIREMENT_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
 # Allowed file extensions for local script execution
 ALLOWED_SCRIPT_EXTENSIONS = {'.py', '.sh', '.bash', '.js', '.mjs'}
 
@@ -317,8 +330,11 @@ class ExecutionSpec:
         """Save spec to markdown file."""
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
+        # Write aside and swap in, a crash never leaves a truncated spec
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write(self.to_markdown())
+        os.replace(tmp_path, output_path)
         logger.info(f'Execution spec saved to: {output_path}')
 
 
@@ -342,6 +358,11 @@ class SkillContainer:
     SANDBOX_OUTPUT_DIR = '/sandbox/outputs'
     SANDBOX_WORK_DIR = '/sandbox/scripts'
 
+    # Requirements installed locally by any container of this process, and
+    # the lock serializing pip runs of concurrently executing skills
+    _installed_requirements: Set[str] = set()
+    _install_lock = threading.Lock()
+
     def __init__(self,
                  workspace_dir: Optional[Union[str, Path]] = None,
                  timeout: int = 300,
@@ -442,8 +463,14 @@ class SkillContainer:
             skill_id: Unique identifier for the skill.
             skill_dir: Path to the skill directory.
         """
-        self._skill_dirs[skill_id] = str(Path(skill_dir).resolve())
+        skill_dir = str(Path(skill_dir).resolve())
+        # Already mounted, keep the running sandbox instead of recreating it
+        if self._skill_dirs.get(skill_id) == skill_dir:
+            return
+        self._skill_dirs[skill_id] = skill_dir
         # Reset sandbox to recreate with new mount
+        if self._sandbox is not None:
+            self._sandbox.close()
         self._sandbox = None
 
     def get_skill_sandbox_path(self, skill_id: str) -> str:
@@ -476,10 +503,10 @@ class SkillContainer:
             return True, ''
 
         # Use stricter patterns for local execution
-        patterns = LOCAL_DANGEROUS_PATTERNS if is_local else DANGEROUS_PATTERNS
+        patterns = _LOCAL_DANGEROUS_RES if is_local else _DANGEROUS_RES
 
-        for pattern in patterns:
-            if re.search(pattern, code, re.IGNORECASE):
+        for pattern, regex in patterns:
+            if regex.search(code):
                 return False, f'Dangerous pattern detected: {pattern}'
 
         return True, ''
@@ -567,6 +594,8 @@ class SkillContainer:
         # Setup environment
         run_env = os.environ.copy()
         run_env['SKILL_OUTPUT_DIR'] = str(self.output_dir)
+        # Keep the output written before a crash or a timeout kill
+        run_env.setdefault('PYTHONUNBUFFERED', '1')
         if env:
             run_env.update(env)
 
@@ -574,22 +603,66 @@ class SkillContainer:
         work_dir = cwd or self.workspace_dir
 
         try:
-            result = subprocess.run(
+            # Run in its own session, so that a timeout also stops whatever
+            # the command spawned, e.g. the children of `sh -c`
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE if stdin_input else None,
                 text=True,
-                timeout=self.timeout,
                 cwd=str(work_dir),
                 env=run_env,
-                stdin=subprocess.PIPE if stdin_input else None,
-                input=stdin_input,
+                start_new_session=platform.system() != 'Windows',
             )
-            return result.stdout, result.stderr, result.returncode
+        except Exception as e:
+            return '', str(e), -1
+
+        try:
+            stdout, stderr = proc.communicate(
+                input=stdin_input, timeout=self.timeout)
+            return stdout, stderr, proc.returncode
         except subprocess.TimeoutExpired:
-            return '', f'Execution timed out after {self.timeout}s', -1
+            self._kill_process_tree(proc)
+            # Keep what was written before the kill
+            try:
+                stdout, stderr = proc.communicate(timeout=5)
+            except subprocess.TimeoutExpired:
+                stdout, stderr = '', ''
+            message = f'Execution timed out after {self.timeout}s'
+            if stderr:
+                message = f'{stderr}\n{message}'
+            return stdout or '', message, -1
         except Exception as e:
+            self._kill_process_tree(proc)
             return '', str(e), -1
 
+    @staticmethod
+    def _kill_process_tree(proc: subprocess.Popen):
+        """Kill a process started by `_local_run_subprocess` and its children."""
+        if platform.system() == 'Windows':
+            proc.kill()
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            proc.kill()
+
+    async def _local_run_subprocess_async(
+            self,
+            cmd: List[str],
+            env: Dict[str, str] = None,
+            cwd: Path = None,
+            stdin_input: str = None) -> tuple[str, str, int]:
+        """
+        Run `_local_run_subprocess` in a worker thread.
+
+        Keeps the event loop free, so that the skills of a parallel group
+        run their subprocesses concurrently instead of one after another.
+        """
+        return await asyncio.to_thread(self._local_run_subprocess, cmd, env,
+                                       cwd, stdin_input)
+
     def _get_python_executable(self) -> str:
         """Get the Python executable for the current platform."""
         return sys.executable
@@ -607,37 +680,73 @@ class SkillContainer:
             return 'node.exe'
         return 'node'
 
+    @classmethod
+    def _is_requirement_satisfied(cls, requirement: str) -> bool:
+        """
+        Check whether a requirement needs no pip run.
+
+        True if it was installed earlier in this process, or if it is a bare
+        distribution name that is already installed. Requirements with
+        version specifiers are left for pip to resolve.
+        """
+        if requirement in cls._installed_requirements:
+            return True
+        if not _BARE_REQUIREMENT_RE.match(requirement):
+            return False
+        try:
+            importlib.metadata.distribution(requirement)
+            return True
+        except importlib.metadata.PackageNotFoundError:
+            return False
+
     async def _local_install_requirements(
             self, requirements: List[str]) -> tuple[bool, str]:
         """
         Install Python requirements locally using pip.
 
+        Satisfied requirements are skipped, the rest is installed in a
+        single pip run.
+
         Args:
             requirements: List of packages to install.
 
         Returns:
             Tuple of (success, error_message).
         """
-        if not requirements:
-            return True, ''
+        return await asyncio.to_thread(self._install_requirements_blocking,
+                                       requirements)
 
-        try:
-            cmd = [
-                self._get_python_executable(), '-m', 'pip', 'install',
-                '--quiet', '--disable-pip-version-check'
-            ] + requirements
+    def _install_requirements_blocking(
+            self, requirements: List[str]) -> tuple[bool, str]:
+        """Blocking body of `_local_install_requirements`."""
+        # Checked under the lock, a concurrent run may just have installed
+        # some of the requirements
+        with SkillContainer._install_lock:
+            pending = [
+                req for req in dict.fromkeys(requirements)
+                if not self._is_requirement_satisfied(req)
+            ]
+            if not pending:
+                return True, ''
 
-            stdout, stderr, exit_code = self._local_run_subprocess(cmd)
+            try:
+                cmd = [
+                    self._get_python_executable(), '-m', 'pip', 'install',
+                    '--quiet', '--disable-pip-version-check'
+                ] + pending
 
-            if exit_code != 0:
-                logger.warning(f'Failed to install requirements: {stderr}')
-                return False, stderr
+                stdout, stderr, exit_code = self._local_run_subprocess(cmd)
 
-            logger.info(f'Installed requirements: {requirements}')
-            return True, ''
-        except Exception as e:
-            logger.error(f'Error installing requirements: {e}')
-            return False, str(e)
+                if exit_code != 0:
+                    logger.warning(f'Failed to install requirements: {stderr}')
+                    return False, stderr
+
+                SkillContainer._installed_requirements.update(pending)
+                logger.info(f'Installed requirements: {pending}')
+                return True, ''
+            except Exception as e:
+                logger.error(f'Error installing requirements: {e}')
+                return False, str(e)
 
     async def _local_execute_python_code(
             self, code: str,
@@ -676,7 +785,7 @@ class SkillContainer:
             # Use working_dir from input_spec for proper resource access
             cwd = input_spec.working_dir if input_spec.working_dir else None
 
-            stdout, stderr, exit_code = self._local_run_subprocess(
+            stdout, stderr, exit_code = await self._local_run_subprocess_async(
                 cmd,
                 env=input_spec.env_vars,
                 cwd=cwd,
@@ -713,7 +822,8 @@ class SkillContainer:
         else:
             # Unix: use export
             env_cmds = [
-                f"export {k}='{v}'" for k, v in input_spec.env_vars.items()
+                f'export {k}={shlex.quote(str(v))}'
+                for k, v in input_spec.env_vars.items()
             ]
             full_cmd = ' && '.join(env_cmds
                                    + [command]) if env_cmds else command
@@ -722,7 +832,7 @@ class SkillContainer:
         # Use working_dir from input_spec for proper resource access
         cwd = input_spec.working_dir if input_spec.working_dir else None
 
-        return self._local_run_subprocess(
+        return await self._local_run_subprocess_async(
             cmd,
             env=input_spec.env_vars,
             cwd=cwd,
@@ -759,7 +869,7 @@ class SkillContainer:
             cwd = input_spec.working_dir if input_spec.working_dir else None
 
             # Keep script in scripts folder for logging/debugging
-            return self._local_run_subprocess(
+            return await self._local_run_subprocess_async(
                 cmd,
                 env=input_spec.env_vars,
                 cwd=cwd,
@@ -1181,9 +1291,10 @@ class SkillContainer:
                 env_exports = [
                     f"export SKILL_OUTPUT_DIR='{self.SANDBOX_OUTPUT_DIR}'",
                 ]
+                # Values such as upstream stdout may hold any quote
                 for key, value in input_spec.env_vars.items():
-                    safe_value = value.replace("'", "\\'")
-                    env_exports.append(f"export {key}='{safe_value}'")
+                    env_exports.append(
+                        f'export {key}={shlex.quote(str(value))}')
 
                 full_cmd = ' && '.join(env_exports + [cmd_str])
 
@@ -1438,6 +1549,9 @@ class SkillContainer:
         """
         if keep_spec:
             self.save_spec_log()
+        if self._sandbox is not None:
+            self._sandbox.close()
+            self._sandbox = None
         if self.workspace_dir.exists():
             shutil.rmtree(self.workspace_dir)
             logger.info(f'Cleaned up workspace: {self.workspace_dir}')
@@ -99,8 +99,7 @@ class SkillLoader:
         Returns:
             True if directory contains SKILL.md file
         """
-        skill_md = path / 'SKILL.md'
-        return skill_md.exists() and skill_md.is_file()
+        return (path / 'SKILL.md').is_file()
 
     def _load_single_skill(self, skill_dir: Path) -> Optional[SkillSchema]:
         """
@@ -147,8 +146,11 @@ class SkillLoader:
             logger.warning(f'Not a valid directory: {base_path}')
             return skills
 
-        for item in base_path.iterdir():
-            if item.is_dir() and self._is_skill_directory(item):
+        with os.scandir(base_path) as it:
+            skill_dirs = sorted(
+                Path(entry.path) for entry in it if entry.is_dir())
+        for item in skill_dirs:
+            if self._is_skill_directory(item):
                 skill = self._load_single_skill(item)
                 if skill:
                     skill_key = self._get_skill_key(skill=skill)
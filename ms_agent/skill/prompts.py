@@ -270,7 +270,20 @@ Output in JSON format:
 # Progressive Skill Analysis Prompts
 # ============================================================
 
-PROMPT_SKILL_ANALYSIS_PLAN = """You are analyzing a skill to create an execution plan.
+# Shared by the plan and command prompts and sent ahead of them as its own
+# message, so the provider side prompt cache can reuse the common prefix
+PROMPT_SKILL_CONTEXT = """User Query: {query}
+
+Skill Information:
+- Skill ID: {skill_id}
+- Name: {skill_name}
+- Description: {skill_description}
+
+Skill Content (SKILL.md):
+{skill_content}
+"""
+
+PROMPT_SKILL_ANALYSIS_PLAN = """You are analyzing the skill above to create an execution plan.
 
 **IMPORTANT CONTEXT**:
 This skill may be ONE OF SEVERAL skills in a execution chain. It does NOT need to fulfill
@@ -281,16 +294,6 @@ For example:
 - If query is "Analyze data and visualize results", a chart skill only needs visualization
 - Each skill contributes its specialized capability to the overall task
 
-User Query: {query}
-
-Skill Information:
-- Skill ID: {skill_id}
-- Name: {skill_name}
-- Description: {skill_description}
-
-Skill Content (SKILL.md):
-{skill_content}
-
 Available Resources Overview:
 - Scripts: {scripts_list}
 - References: {references_list}
@@ -332,10 +335,77 @@ Notes:
 - Extract Python package dependencies from skill content (e.g., reportlab, pandas, numpy).
 """
 
-PROMPT_SKILL_EXECUTION_COMMAND = """Based on the execution plan and loaded resources, generate the execution command(s).
+# Batched plan analysis of a parallel group. The instructions hold no
+# placeholders and are sent first, so they stay prompt cached across groups
+PROMPT_SKILLS_BATCH_ANALYSIS_PLAN = """You are analyzing several skills to create one execution plan per skill.
 
-User Query: {query}
-Skill ID: {skill_id}
+**IMPORTANT CONTEXT**:
+The skills run in parallel as part of an execution chain. Each skill does NOT need to fulfill
+the ENTIRE user query - it only needs to handle its specific sub-task/capability.
+
+The user query and the skills follow in the next message.
+
+Tasks, for EACH skill:
+1. Understand what this specific skill can do based on its description and content
+2. Determine if this skill can contribute to the user's query (even partially)
+3. Create a step-by-step execution plan for this skill's specific capability
+4. Identify which scripts, references, and resources are needed
+
+Output in JSON format, with one entry per skill:
+{
+    "plans": [
+        {
+            "skill_id": "The Skill ID exactly as given",
+            "can_handle": true/false,
+            "contribution": "What specific part of the query this skill handles",
+            "plan_summary": "Brief summary of the execution plan",
+            "steps": [
+                {"step": 1, "action": "description", "type": "script|reference|resource|code"},
+                ...
+            ],
+            "required_scripts": ["script_name1", "script_name2", ...],
+            "required_references": ["ref_name1", ...],
+            "required_resources": ["resource_name1", ...],
+            "required_packages": ["python_package1", "python_package2", ...],
+            "parameters": {"param1": "value or <user_input>", ...},
+            "reasoning": "Why this plan will work"
+        },
+        ...
+    ]
+}
+
+**CRITICAL - When to set can_handle**:
+- Set `can_handle: true` if the skill can CONTRIBUTE to the query, even if it only handles a sub-task
+- Set `can_handle: false` ONLY if the skill has ZERO relevance to the query
+
+Notes:
+- Only include resources that are actually needed for execution.
+- Steps should be actionable and specific.
+- Parameters should include any values extracted from the query.
+- Extract Python package dependencies from skill content (e.g., reportlab, pandas, numpy).
+"""
+
+PROMPT_SKILLS_BATCH_CONTEXT = """User Query: {query}
+
+Skills:
+
+{skills_context}
+"""
+
+PROMPT_SKILL_BATCH_ENTRY = """### Skill ID: {skill_id}
+- Name: {skill_name}
+- Description: {skill_description}
+
+Skill Content (SKILL.md):
+{skill_content}
+
+Available Resources Overview:
+- Scripts: {scripts_list}
+- References: {references_list}
+- Resources: {resources_list}
+"""
+
+PROMPT_SKILL_EXECUTION_COMMAND = """Based on the skill above, its execution plan and loaded resources, generate the execution command(s).
 
 Execution Plan:
 {execution_plan}
@@ -437,3 +507,20 @@ Output in JSON format:
 - If the error is about missing packages, add them to additional_requirements
 - If the error cannot be fixed (e.g., requires user input), set is_fixable to false
 """
+
+PROMPT_ANALYZE_EXECUTION_ERRORS_BATCH = """You are analyzing several independent failed code executions to diagnose and fix each error.
+
+The tasks follow in the next message, each under a "### Task <number>" heading with its own
+instructions and output format. Handle every task on its own, exactly as its instructions ask.
+
+Output in JSON format, with one entry per task:
+{
+    "results": [
+        {
+            "task": <task number>,
+            ...all fields of the JSON object the task asks for...
+        },
+        ...
+    ]
+}
+"""
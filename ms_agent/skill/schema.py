@@ -5,10 +5,13 @@ Skill Directory Schema
 Defines the data structure and validation logic for Agent Skills.
 Each Skill is represented as a self-contained directory with metadata.
 """
+import functools
+import os
 import re
+import stat
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import yaml
 from ms_agent.utils.logger import logger
@@ -19,6 +22,18 @@ SUPPORTED_SCRIPT_EXT = ('.py', '.sh', '.js')
 SUPPORTED_READ_EXT = ('.md', '.txt', '.py', '.json', '.yaml', '.yml', '.sh',
                       '.js', '.html', '.xml')
 
+_FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+# Larger files are read on every load instead of being kept in memory
+_MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=256)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Read a text file, cached until its modification time or size change."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
 
 @dataclass
 class SkillFile:
@@ -213,8 +228,7 @@ class SkillSchemaParser:
         Returns:
             Dictionary of frontmatter data, or None if not found
         """
-        pattern = r'^---\s*\n(.*?)\n---\s*\n'
-        match = re.match(pattern, content, re.DOTALL)
+        match = _FRONTMATTER_RE.match(content)
 
         if match:
             yaml_content = match.group(1)
@@ -237,12 +251,45 @@ class SkillSchemaParser:
         """
         ignored_names = {
             '.DS_Store', '__pycache__', '.git', '.gitignore', '.pytest_cache',
-            '.mypy_cache'
+            '.mypy_cache', 'node_modules'
         }
         ignored_suffixes = {'.pyc', '.pyo'}
 
         return (p.name in ignored_names) or (p.suffix in ignored_suffixes)
 
+    @staticmethod
+    def iter_skill_files(directory_path: Path) -> Iterator[Path]:
+        """
+        Walk a Skill directory and yield its files.
+
+        Ignored directories are pruned instead of walked, and the directory
+        entries from `os.scandir` spare a stat call per file. Files of a
+        directory come before those of its subdirectories, in name order.
+
+        Args:
+            directory_path: Path to Skill directory
+
+        Yields:
+            Paths of the files that are not ignored
+        """
+        stack = [directory_path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                path = Path(entry.path)
+                if SkillSchemaParser.is_ignored_path(path):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(path)
+                elif entry.is_file():
+                    yield path
+            stack.extend(reversed(subdirs))
+
     @staticmethod
     def parse_skill_directory(directory_path: Path) -> Optional[SkillSchema]:
         """
@@ -279,28 +326,23 @@ class SkillSchemaParser:
         references = []
         resources = []
 
-        for file_path in directory_path.rglob('*'):
-            if file_path.is_file():
-                if SkillSchemaParser.is_ignored_path(file_path):
-                    continue
-
-                file_type = file_path.suffix if file_path.suffix else '.unknown'
+        for file_path in SkillSchemaParser.iter_skill_files(directory_path):
+            file_type = file_path.suffix if file_path.suffix else '.unknown'
 
-                skill_file = SkillFile(
-                    name=file_path.name,
-                    type=file_type,
-                    path=file_path,
-                    required=(file_path.name == 'SKILL.md'))
-                files.append(skill_file)
+            skill_file = SkillFile(
+                name=file_path.name,
+                type=file_type,
+                path=file_path,
+                required=(file_path.name == 'SKILL.md'))
+            files.append(skill_file)
 
-                # Get scripts, references and resources
-                if skill_file.type in SUPPORTED_SCRIPT_EXT:
-                    scripts.append(skill_file)
-                elif skill_file.type in ['.md'
-                                         ] and skill_file.name != 'SKILL.md':
-                    references.append(skill_file)
-                else:
-                    resources.append(skill_file)
+            # Get scripts, references and resources
+            if skill_file.type in SUPPORTED_SCRIPT_EXT:
+                scripts.append(skill_file)
+            elif skill_file.type in ['.md'] and skill_file.name != 'SKILL.md':
+                references.append(skill_file)
+            else:
+                resources.append(skill_file)
 
         return SkillSchema(
             skill_id=skill_id,
@@ -430,19 +472,25 @@ class SkillContext:
         """
         file_path = Path(file_path)
 
-        if not file_path.exists() or not file_path.is_file():
+        if file_path.suffix.lower() not in SUPPORTED_READ_EXT:
             return ''
 
-        ext = file_path.suffix.lower()
-        if ext in SUPPORTED_READ_EXT:
-            try:
+        try:
+            st = file_path.stat()
+        except OSError:
+            return ''
+        if not stat.S_ISREG(st.st_mode):
+            return ''
+
+        try:
+            if st.st_size > _MAX_CACHED_FILE_SIZE:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     return f.read()
-            except Exception as e:
-                logger.error(f'Failed to read file {file_path}: {e}')
-                return ''
-
-        return ''
+            return _read_text_cached(
+                str(file_path), st.st_mtime_ns, st.st_size)
+        except Exception as e:
+            logger.error(f'Failed to read file {file_path}: {e}')
+            return ''
 
     def __post_init__(self):
         """Initialize SPEC context only, defer resource loading."""
@@ -469,7 +517,9 @@ class SkillContext:
             if r.name not in ['SKILL.md', 'LICENSE.txt']
         ]
 
-    def _get_resource_path(self, file_path: Path) -> str:
+    def _get_resource_path(self,
+                           file_path: Path,
+                           root_path: Optional[Path] = None) -> str:
         """
         Get path string for a resource file.
 
@@ -477,17 +527,43 @@ class SkillContext:
 
         Args:
             file_path: Path to the resource file.
+            root_path: The resolved root path, resolved here if None.
 
         Returns:
             Path string (relative if possible, absolute otherwise).
         """
         resolved_path = file_path.resolve()
         try:
-            return str(resolved_path.relative_to(self.root_path.resolve()))
+            return str(
+                resolved_path.relative_to(root_path
+                                          or self.root_path.resolve()))
         except ValueError:
             # Path is not under root_path, use absolute path
             return str(resolved_path)
 
+    def _load_files(self, files: List[SkillFile]) -> List[Dict[str, Any]]:
+        """
+        Load skill files into dictionaries with their path and content.
+
+        Args:
+            files: Skill files to load.
+
+        Returns:
+            List of loaded file dictionaries.
+        """
+        root_path = self.root_path.resolve()
+        loaded = []
+        for skill_file in files:
+            abs_path = skill_file.path.resolve()
+            loaded.append({
+                'name': skill_file.name,
+                'file': skill_file.to_dict(),
+                'path': self._get_resource_path(abs_path, root_path),
+                'abs_path': str(abs_path),
+                'content': self._read_file_content(abs_path),
+            })
+        return loaded
+
     def load_scripts(self, names: List[str] = None) -> List[Dict[str, Any]]:
         """
         Load specific scripts by name, or all if names is None.
@@ -502,16 +578,7 @@ class SkillContext:
         if names:
             target_scripts = [s for s in self.skill.scripts if s.name in names]
 
-        loaded = []
-        for script in target_scripts:
-            abs_path = script.path.resolve()
-            loaded.append({
-                'name': script.name,
-                'file': script.to_dict(),
-                'path': self._get_resource_path(script.path),
-                'abs_path': str(abs_path),
-                'content': self._read_file_content(abs_path),
-            })
+        loaded = self._load_files(target_scripts)
         self.scripts.extend(loaded)
         return loaded
 
@@ -529,16 +596,7 @@ class SkillContext:
         if names:
             target_refs = [r for r in self.skill.references if r.name in names]
 
-        loaded = []
-        for ref in target_refs:
-            abs_path = ref.path.resolve()
-            loaded.append({
-                'name': ref.name,
-                'file': ref.to_dict(),
-                'path': self._get_resource_path(ref.path),
-                'abs_path': str(abs_path),
-                'content': self._read_file_content(abs_path),
-            })
+        loaded = self._load_files(target_refs)
         self.references.extend(loaded)
         return loaded
 
@@ -559,16 +617,7 @@ class SkillContext:
         if names:
             target_res = [r for r in target_res if r.name in names]
 
-        loaded = []
-        for res in target_res:
-            abs_path = res.path.resolve()
-            loaded.append({
-                'name': res.name,
-                'file': res.to_dict(),
-                'path': self._get_resource_path(res.path),
-                'abs_path': str(abs_path),
-                'content': self._read_file_content(abs_path),
-            })
+        loaded = self._load_files(target_res)
         self.resources.extend(loaded)
         return loaded
 
@@ -601,29 +650,46 @@ class SkillContext:
         self.load_resources()
         self._resources_loaded = True
 
-    def get_loaded_scripts_content(self) -> str:
-        """Get formatted content of all loaded scripts."""
-        if not self.scripts:
-            return 'No scripts loaded.'
-        parts = []
-        for s in self.scripts:
-            parts.append(f"<!-- {s['path']} -->\n{s['content']}")
-        return '\n\n'.join(parts)
-
-    def get_loaded_references_content(self) -> str:
-        """Get formatted content of all loaded references."""
-        if not self.references:
-            return 'No references loaded.'
-        parts = []
-        for r in self.references:
-            parts.append(f"<!-- {r['path']} -->\n{r['content']}")
-        return '\n\n'.join(parts)
-
-    def get_loaded_resources_content(self) -> str:
-        """Get formatted content of all loaded resources."""
-        if not self.resources:
-            return 'No resources loaded.'
+    @staticmethod
+    def _format_loaded(items: List[Dict[str, Any]],
+                       empty_message: str,
+                       max_chars: Optional[int] = None) -> str:
+        """
+        Format loaded files as `<!-- path -->` headed blocks.
+
+        With `max_chars`, formatting stops once the limit is reached instead
+        of joining every file and truncating the result.
+        """
+        if not items:
+            return empty_message
         parts = []
-        for r in self.resources:
-            parts.append(f"<!-- {r['path']} -->\n{r['content']}")
-        return '\n\n'.join(parts)
+        size = 0
+        for item in items:
+            part = f"<!-- {item['path']} -->\n{item['content']}"
+            if max_chars is not None:
+                remaining = max_chars - size
+                if len(part) >= remaining:
+                    parts.append(part[:remaining])
+                    break
+                # Account for the separator joining this part to the next
+                size += len(part) + 2
+            parts.append(part)
+        return '\n\n'.join(parts)[:max_chars]
+
+    def get_loaded_scripts_content(self,
+                                   max_chars: Optional[int] = None) -> str:
+        """Get formatted content of loaded scripts, up to `max_chars`."""
+        return self._format_loaded(self.scripts, 'No scripts loaded.',
+                                   max_chars)
+
+    def get_loaded_references_content(self,
+                                      max_chars: Optional[int] = None) -> str:
+        """Get formatted content of loaded references, up to `max_chars`."""
+        return self._format_loaded(self.references, 'No references loaded.',
+                                   max_chars)
+
+    def get_loaded_resources_content(self,
+                                     max_chars: Optional[int] = None) -> str:
+        """Get formatted content of loaded resources, up to `max_chars`."""
+        return self._format_loaded(self.resources, 'No resources loaded.',
+                                   max_chars)
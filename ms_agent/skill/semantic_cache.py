@@ -0,0 +1,214 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import faiss
+import json
+import numpy as np
+from ms_agent.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class SemanticCache:
+    """
+    Query-level cache keyed by embedding similarity.
+
+    Queries are stored as L2-normalized embeddings in a FAISS inner product
+    index, so a lookup returns the value of the most similar stored query
+    when its cosine similarity reaches `tau`. Entries expire after `ttl`
+    seconds and the least recently used entry is evicted once `max_entries`
+    is exceeded. Values must be JSON serializable when `path` is given.
+
+    Changes are only written to `path` by `save()`, which does blocking file
+    I/O: call it from a worker thread when running inside an event loop.
+    """
+
+    def __init__(self,
+                 dim: int,
+                 tau: float = 0.85,
+                 max_entries: int = 1024,
+                 ttl: Optional[float] = None,
+                 path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            dim: Dimension of the query embeddings.
+            tau: Minimum cosine similarity for a cache hit.
+            max_entries: Maximum number of cached queries.
+            ttl: Time to live of an entry in seconds, None for no expiry.
+            path: Optional FAISS index file to persist the cache to, values
+                are stored next to it with a `.json` suffix.
+        """
+        self.dim = dim
+        self.tau = tau
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+
+        self._lock = threading.Lock()
+        # Serializes writers of the cache files, readers only take `_lock`
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self.index = faiss.IndexFlatIP(dim)
+        # Row i of the index belongs to the i-th key of `_entries`
+        self._entries: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self._next_key = 0
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _as_query(embedding: np.ndarray) -> np.ndarray:
+        query = np.ascontiguousarray(
+            np.asarray(embedding, dtype=np.float32).reshape(1, -1))
+        faiss.normalize_L2(query)
+        return query
+
+    def _rebuild_index(self):
+        self.index.reset()
+        if self._entries:
+            self.index.add(
+                np.stack([e['embedding'] for e in self._entries.values()]))
+
+    def _purge_expired(self) -> bool:
+        if self.ttl is None:
+            return False
+        deadline = time.time() - self.ttl
+        expired = [
+            k for k, e in self._entries.items() if e['created_at'] < deadline
+        ]
+        for key in expired:
+            del self._entries[key]
+        return bool(expired)
+
+    def get(self, embedding: np.ndarray) -> Tuple[Optional[Any], float]:
+        """
+        Look up the value cached for the most similar query.
+
+        Args:
+            embedding: Query embedding of shape (dim,) or (1, dim).
+
+        Returns:
+            Tuple of (value, similarity), value is None on a miss.
+        """
+        query = self._as_query(embedding)
+        with self._lock:
+            if self._purge_expired():
+                self._rebuild_index()
+            if not self._entries:
+                return None, 0.0
+            sims, rows = self.index.search(query, 1)
+            sim, row = float(sims[0][0]), int(rows[0][0])
+            if row < 0 or sim < self.tau:
+                return None, sim
+            key = list(self._entries)[row]
+            # Refresh recency without reordering the index rows
+            self._entries[key]['last_used'] = time.time()
+            return self._entries[key]['value'], sim
+
+    def put(self, embedding: np.ndarray, value: Any):
+        """
+        Cache `value` for the query embedded as `embedding`.
+
+        Args:
+            embedding: Query embedding of shape (dim,) or (1, dim).
+            value: Value to return for this and similar queries.
+        """
+        query = self._as_query(embedding)
+        now = time.time()
+        with self._lock:
+            self._entries[self._next_key] = {
+                'embedding': query[0],
+                'value': value,
+                'created_at': now,
+                'last_used': now,
+            }
+            self._next_key += 1
+            evicted = self._purge_expired()
+            while len(self._entries) > self.max_entries:
+                lru_key = min(
+                    self._entries, key=lambda k: self._entries[k]['last_used'])
+                del self._entries[lru_key]
+                evicted = True
+            if evicted:
+                self._rebuild_index()
+            else:
+                self.index.add(query)
+            self._dirty = True
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self.index.reset()
+            self._dirty = True
+
+    def _values_path(self) -> Path:
+        return self.path.with_suffix('.json')
+
+    def save(self):
+        """Write the cache to `path` if it changed since the last save."""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                # Snapshot, lookups and puts go on while the files are written
+                index = faiss.clone_index(self.index)
+                meta = [{
+                    'value': e['value'],
+                    'created_at': e['created_at'],
+                    'last_used': e['last_used'],
+                } for e in self._entries.values()]
+                self._dirty = False
+            try:
+                self._write(index, meta)
+            except Exception as e:
+                self._dirty = True
+                logger.warning(
+                    f'Failed to save semantic cache {self.path}: {e}')
+
+    def _write(self, index: faiss.Index, meta: List[Dict[str, Any]]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write both files aside and swap them in, a crash never leaves a
+        # half written cache behind
+        tmp_index = self.path.with_name(self.path.name + '.tmp')
+        tmp_values = self._values_path().with_name(self._values_path().name
+                                                   + '.tmp')
+        faiss.write_index(index, str(tmp_index))
+        with open(tmp_values, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_index, self.path)
+        os.replace(tmp_values, self._values_path())
+
+    def _load(self):
+        try:
+            index = faiss.read_index(str(self.path))
+            with open(self._values_path(), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.warning(f'Failed to load semantic cache {self.path}: {e}')
+            return
+        if index.d != self.dim or index.ntotal != len(meta):
+            logger.warning(
+                f'Ignoring stale semantic cache {self.path}: embedding '
+                f'dimension or entry count mismatch')
+            return
+        embeddings = index.reconstruct_n(0, index.ntotal)
+        for embedding, entry in zip(embeddings, meta):
+            self._entries[self._next_key] = {'embedding': embedding, **entry}
+            self._next_key += 1
+        if self._purge_expired():
+            self._rebuild_index()
+        else:
+            self.index = index
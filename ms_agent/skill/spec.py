@@ -5,6 +5,14 @@ from dataclasses import dataclass
 from .prompts import DEFAULT_IMPLEMENTATION, DEFAULT_PLAN, DEFAULT_TASKS
 
 
+def _write_atomic(path: str, content: str):
+    """Write `content` aside and swap it in, never leaving a partial file."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
 @dataclass
 class Spec:
     """
@@ -41,21 +49,11 @@ class Spec:
         output_path: str = os.path.join(output_dir, '.spec')
         os.makedirs(output_path, exist_ok=True)
 
-        with open(
-                os.path.join(output_path, 'plan.md'), 'w',
-                encoding='utf-8') as f:
-            f.write(self.plan)
-
-        with open(
-                os.path.join(output_path, 'tasks.md'), 'w',
-                encoding='utf-8') as f:
-            f.write(self.tasks)
-
-        with open(
-                os.path.join(output_path, 'implementation.md'),
-                'w',
-                encoding='utf-8') as f:
-            f.write(self.implementation)
+        _write_atomic(os.path.join(output_path, 'plan.md'), self.plan)
+        _write_atomic(os.path.join(output_path, 'tasks.md'), self.tasks)
+        _write_atomic(
+            os.path.join(output_path, 'implementation.md'),
+            self.implementation)
 
         return output_path
 
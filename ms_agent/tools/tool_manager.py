@@ -6,7 +6,7 @@ import os
 import sys
 from copy import copy
 from types import TracebackType
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import json
 from ms_agent.llm.utils import Tool, ToolCall
@@ -236,6 +236,34 @@ class ToolManager:
         result = await asyncio.gather(*tasks)
         return result
 
+    async def stream_call_tool(
+            self, tool_list: List[ToolCall]
+    ) -> AsyncGenerator[Tuple[int, Any], None]:
+        """Call tools concurrently and yield results as soon as each one finishes.
+
+        Args:
+            tool_list: The tool calls to execute.
+
+        Yields:
+            Tuples of `(index, result)` in completion order, `index` is the position
+            of the tool call in `tool_list`.
+        """
+
+        async def indexed_call(index: int, tool: ToolCall):
+            return index, await self.single_call_tool(tool)
+
+        tasks = [
+            asyncio.ensure_future(indexed_call(index, tool))
+            for index, tool in enumerate(tool_list)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer may stop early, do not leave tools running
+            for task in tasks:
+                task.cancel()
+
     async def __aenter__(self) -> 'ToolManager':
 
         return self
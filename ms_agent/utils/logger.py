@@ -13,6 +13,14 @@ logger_format = logging.Formatter('[%(levelname)s:%(name)s] %(message)s')
 info_set = set()
 warning_set = set()
 
+# Set `extra={CONSOLE: False}` on a record to only write it to the log file,
+# e.g. content which is already printed to stdout
+CONSOLE = 'console'
+
+
+def console_filter(record: logging.LogRecord) -> bool:
+    return getattr(record, CONSOLE, True)
+
 
 def info_once(self, msg, *args, **kwargs):
     hash_id = kwargs.get('hash_id') or msg
@@ -68,6 +76,7 @@ def get_logger(log_file: Optional[str] = None,
             handler.setLevel(logging.ERROR)
 
     stream_handler = logging.StreamHandler()
+    stream_handler.addFilter(console_filter)
     handlers = [stream_handler]
 
     # Always add file handler since log_file is set to default if None
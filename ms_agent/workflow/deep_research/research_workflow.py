@@ -1,6 +1,5 @@
 # flake8: noqa
 # yapf: disable
-import copy
 import os
 import re
 from typing import Any, Dict, List, Optional, Union
@@ -11,6 +10,9 @@ from ms_agent.utils import get_logger
 
 logger = get_logger()
 
+# First ```json...``` block of an LLM response
+_JSON_BLOCK_RE = re.compile(r'```json(.*?)```', re.DOTALL)
+
 
 class ResearchWorkflow:
     """
@@ -118,13 +120,10 @@ class ResearchWorkflow:
         stream: bool = kwargs.get('stream', True)
 
         if stream:
-            stream_chunks = self._client.chat_stream(
-                messages=messages, tools=tools, **kwargs)
-            chunk_list = []
-            for chunk in stream_chunks:
-                chunk_new = copy.deepcopy(
-                    chunk)  # Ensure we do not modify the original chunk
-                chunk_list.append(chunk_new)
+            # `chat_stream` yields a new dict per chunk, no copy is needed
+            chunk_list = list(
+                self._client.chat_stream(
+                    messages=messages, tools=tools, **kwargs))
 
             aggregated_chunks = self._client.aggregate_stream_chunks(chunk_list)
 
@@ -268,14 +267,12 @@ class ResearchWorkflow:
         Returns:
             list: A dict or list of dictionaries representing the parsed JSON data.
         """
-        # Try to find JSON embedded in ```json...```
-        pattern = r'```json(.*?)```'
-        matches = re.findall(pattern, text_content, re.DOTALL)
+        # Try to find JSON embedded in ```json...```, only the first is used
+        match = _JSON_BLOCK_RE.search(text_content)
 
         json_string = ''
-        if matches:
-            # If matches are found, use the first one
-            json_string = matches[0].strip()
+        if match:
+            json_string = match.group(1).strip()
         else:
             # If no ```json...``` block is found, assume the entire content is JSON
             json_string = text_content.strip()
@@ -0,0 +1,79 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import unittest
+from types import SimpleNamespace
+
+from ms_agent.llm.openai_llm import OpenAI
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(
+        id='chatcmpl-1',
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)],
+        usage=None)
+
+
+def _tool_call_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(
+        index=index,
+        id=id,
+        type='function',
+        function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class TestStreamMerge(unittest.TestCase):
+    """Merging of streamed chunks, no API calls involved"""
+
+    def setUp(self):
+        # The merge helpers do not touch the client or the config
+        self.llm = OpenAI.__new__(OpenAI)
+
+    def _merge(self, chunks):
+        message = None
+        for chunk in chunks:
+            message = self.llm._merge_stream_message(
+                message, self.llm._stream_format_output_message(chunk))
+        return message
+
+    def test_text_only_stream(self):
+        message = self._merge(
+            [_chunk('Hang'),
+             _chunk('zhou'),
+             _chunk('.', finish_reason='stop')])
+        self.assertEqual(message.content, 'Hangzhou.')
+        self.assertFalse(message.tool_calls)
+
+    def test_tool_call_stream(self):
+        message = self._merge([
+            _chunk('Let me check.'),
+            _chunk(tool_calls=[
+                _tool_call_delta(0, id='call_0', name='maps', arguments='{"a"')
+            ]),
+            _chunk(tool_calls=[_tool_call_delta(0, arguments=': 1}')]),
+            _chunk(tool_calls=[
+                _tool_call_delta(1, id='call_1', name='mkdir', arguments='{}')
+            ]),
+        ])
+        self.assertEqual(message.content, 'Let me check.')
+        self.assertEqual(len(message.tool_calls), 2)
+        self.assertEqual(message.tool_calls[0]['id'], 'call_0')
+        self.assertEqual(message.tool_calls[0]['tool_name'], 'maps')
+        self.assertEqual(message.tool_calls[0]['arguments'], '{"a": 1}')
+        self.assertEqual(message.tool_calls[1]['tool_name'], 'mkdir')
+
+    def test_merge_does_not_modify_previous_message(self):
+        first = self._merge([
+            _chunk(tool_calls=[
+                _tool_call_delta(0, id='call_0', name='maps', arguments='{')
+            ])
+        ])
+        merged = self.llm._merge_stream_message(
+            first,
+            self.llm._stream_format_output_message(
+                _chunk(tool_calls=[_tool_call_delta(0, arguments='}')])))
+        self.assertEqual(first.tool_calls[0]['arguments'], '{')
+        self.assertEqual(merged.tool_calls[0]['arguments'], '{}')
+
+
+if __name__ == '__main__':
+    unittest.main()
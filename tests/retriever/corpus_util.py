@@ -0,0 +1,14 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import numpy as np
+
+
+def random_corpus(num_docs, vocab_size=200, seed=0):
+    """Tokenized documents shared by the retriever tests."""
+    rng = np.random.default_rng(seed)
+    # Zipf-like term frequencies, as in natural text
+    probs = 1.0 / np.arange(1, vocab_size + 1)
+    probs /= probs.sum()
+    return [[
+        f'w{term}'
+        for term in rng.choice(vocab_size, size=rng.integers(5, 40), p=probs)
+    ] for _ in range(num_docs)]
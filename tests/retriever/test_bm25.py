@@ -0,0 +1,113 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import importlib.util
+import math
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from corpus_util import random_corpus
+from ms_agent.retriever.hybrid_retriever import BM25Retriever
+
+
+def _reference_scores(corpus, query, k1=1.5, b=0.75):
+    """Textbook BM25, one document and one query term at a time."""
+    n = len(corpus)
+    avgdl = sum(map(len, corpus)) / n
+    scores = []
+    for doc in corpus:
+        score = 0.0
+        for term in query:
+            df = sum(term in d for d in corpus)
+            if not df:
+                continue
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1)
+            tf = doc.count(term)
+            score += idf * tf * (k1 + 1) / (
+                tf + k1 * (1 - b + b * len(doc) / avgdl))
+        scores.append(score)
+    return np.asarray(scores)
+
+
+class TestBM25(unittest.TestCase):
+    """Inverted index scoring and MaxScore top-k"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = random_corpus(400)
+        cls.bm25 = BM25Retriever(cls.corpus)
+
+    def test_scores_match_reference(self):
+        for query in (['w1'], ['w2', 'w40', 'w150'], ['w3', 'w3',
+                                                      'w9'], ['unknown'], []):
+            np.testing.assert_allclose(
+                self.bm25.get_scores(query),
+                _reference_scores(self.corpus, query),
+                rtol=1e-5,
+                atol=1e-6)
+
+    def test_parameters(self):
+        bm25 = BM25Retriever(self.corpus, k1=0.9, b=0.4)
+        np.testing.assert_allclose(
+            bm25.get_scores(['w5', 'w60']),
+            _reference_scores(self.corpus, ['w5', 'w60'], k1=0.9, b=0.4),
+            rtol=1e-5)
+
+    def test_topk_matches_full_scoring(self):
+        for query in (['w1', 'w2'], ['w3', 'w70', 'w120',
+                                     'w199'], ['w4', 'w4', 'w90'], ['w150']):
+            scores = self.bm25.get_scores(query)
+            for k in (1, 5, 20, 400):
+                doc_ids, top_scores = self.bm25.get_topk(query, k)
+                expected = np.sort(scores[scores > 0])[::-1][:k]
+                np.testing.assert_allclose(top_scores, expected, rtol=1e-5)
+                np.testing.assert_allclose(
+                    scores[doc_ids], top_scores, rtol=1e-5)
+                self.assertEqual(len(set(doc_ids.tolist())), len(doc_ids))
+
+    def test_topk_edge_cases(self):
+        for query, k in ((['unknown'], 5), ([], 5), (['w1'], 0)):
+            doc_ids, top_scores = self.bm25.get_topk(query, k)
+            self.assertEqual(len(doc_ids), 0)
+            self.assertEqual(len(top_scores), 0)
+
+    def test_tokenized_corpus_is_not_kept(self):
+        self.assertFalse(hasattr(self.bm25, 'tokenized_corpus'))
+        self.assertEqual(self.bm25.corpus_size, len(self.corpus))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            BM25Retriever(self.corpus, backend='cuda')
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec('numba'), 'numba is not installed')
+class TestBM25Numba(unittest.TestCase):
+    """The numba backend scores like the NumPy one"""
+
+    @classmethod
+    def setUpClass(cls):
+        corpus = random_corpus(3000)
+        cls.numpy_bm25 = BM25Retriever(corpus)
+        cls.numba_bm25 = BM25Retriever(corpus, backend='numba')
+        # Start numba's thread pool from the main thread, some tbb builds
+        # hang at exit when it is first started from a worker thread
+        cls.numba_bm25.get_scores(['w1'])
+
+    def test_scores_match_numpy(self):
+        for query in (['w1', 'w2'], ['w1', 'w7', 'w1'], ['w5', 'unknown'], []):
+            np.testing.assert_allclose(
+                self.numba_bm25.get_scores(query),
+                self.numpy_bm25.get_scores(query),
+                rtol=1e-5)
+
+    def test_concurrent_calls(self):
+        queries = [[f'w{i % 60}', 'w3'] for i in range(200)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(self.numba_bm25.get_scores, queries))
+        for query, scores in zip(queries, results):
+            np.testing.assert_allclose(
+                scores, self.numpy_bm25.get_scores(query), rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import asyncio
+import functools
+import threading
+import unittest
+import zlib
+from types import SimpleNamespace
+from unittest import mock
+
+import faiss
+import numpy as np
+from ms_agent.retriever import hybrid_retriever
+from ms_agent.retriever.hybrid_retriever import (_SCORING_POOL,
+                                                 HybridRetriever,
+                                                 clear_dense_index_cache,
+                                                 set_dense_index_cache_size)
+
+CORPUS = [
+    'convert pdf files to word documents',
+    'merge several pdf files into one',
+    'create excel spreadsheets with charts',
+    'resize and crop png images',
+    'send messages to a slack channel',
+    'build react web artifacts',
+    'write unit tests with pytest',
+    'generate powerpoint slides from markdown',
+]
+
+
+def make_retriever(corpus=CORPUS, dim=64, **kwargs):
+    """HybridRetriever over a hashed bag of words encoder, no model download.
+    """
+    retriever = HybridRetriever.__new__(HybridRetriever)
+    retriever.corpus = None
+    retriever._corpus_sig = None
+    retriever.bm25_backend = 'numpy'
+    retriever.bm25_top_k = None
+    retriever.index_type = kwargs.get('index_type', 'flat')
+    retriever.hnsw_ef_search = 64
+    retriever.use_gpu = False
+    retriever._gpu_res = None
+    retriever._corpus_lock = threading.Lock()
+    retriever._pool = _SCORING_POOL
+    retriever.tokenizer_util = SimpleNamespace(segment=str.split)
+    retriever._segment_query = str.split
+    retriever._doc_segments = {}
+    retriever._embed_model_path = f'hashed-bow-{dim}'
+    retriever.index = None
+
+    def get_embeddings(texts):
+        embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.split():
+                embeddings[row, zlib.crc32(token.encode()) % dim] += 1
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-6)
+
+    retriever._get_embeddings = get_embeddings
+    retriever._embed_query = functools.lru_cache(
+        maxsize=512)(lambda query: get_embeddings([query]))
+    retriever._init_corpus(corpus)
+    return retriever
+
+
+class TestHybridSearch(unittest.TestCase):
+    """Single, batched and async search agree, with a fake encoder"""
+
+    def setUp(self):
+        self.retriever = make_retriever()
+        self.queries = ['pdf to word', 'slack message', 'png images crop']
+
+    def test_search_finds_relevant_document(self):
+        results = self.retriever.search(
+            'merge pdf files', top_k=2, min_score=0)
+        self.assertEqual(results[0][0], 'merge several pdf files into one')
+        self.assertEqual(len(results), 2)
+
+    def test_batch_search_matches_search(self):
+        expected = [
+            self.retriever.search(query, top_k=3, min_score=0)
+            for query in self.queries
+        ]
+        results = self.retriever.batch_search(
+            self.queries, top_k=3, min_score=0)
+        self.assertEqual([[doc for doc, _ in r] for r in results],
+                         [[doc for doc, _ in r] for r in expected])
+        for result, exp in zip(results, expected):
+            np.testing.assert_allclose([score for _, score in result],
+                                       [score for _, score in exp],
+                                       rtol=1e-5)
+
+    def test_async_variants_match_sync(self):
+        self.assertEqual(
+            asyncio.run(
+                self.retriever.async_batch_search(
+                    self.queries, top_k=3, min_score=0)),
+            self.retriever.batch_search(self.queries, top_k=3, min_score=0))
+        self.assertEqual(
+            asyncio.run(
+                self.retriever.async_search(
+                    self.queries[0], top_k=3, min_score=0)),
+            self.retriever.search(self.queries[0], top_k=3, min_score=0))
+
+    def test_retrievers_share_scoring_threads(self):
+        for _ in range(5):
+            make_retriever().search('pdf', min_score=0)
+        scoring_threads = [
+            t for t in threading.enumerate()
+            if t.name.startswith('HybridRetriever')
+        ]
+        self.assertLessEqual(len(scoring_threads), _SCORING_POOL._max_workers)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.retriever.batch_search([]), [])
+
+
+class TestDenseIndexTypes(unittest.TestCase):
+    """FAISS index selection and recall, on random embeddings"""
+
+    @staticmethod
+    def _embeddings(num_docs, dim=32, seed=0):
+        embeddings = np.random.default_rng(seed).standard_normal(
+            (num_docs, dim)).astype(np.float32)
+        faiss.normalize_L2(embeddings)
+        return embeddings
+
+    def _index(self, index_type, embeddings):
+        retriever = HybridRetriever.__new__(HybridRetriever)
+        retriever.index_type = index_type
+        index = retriever._create_dense_index(embeddings)
+        index.add(embeddings)
+        return index
+
+    def test_index_types(self):
+        embeddings = self._embeddings(1000)
+        expected = {
+            'flat': faiss.IndexFlatIP,
+            'hnsw': faiss.IndexHNSWFlat,
+            'ivf': faiss.IndexIVFFlat,
+            'ivfpq': faiss.IndexIVFPQ,
+            'auto': faiss.IndexFlatIP,
+        }
+        for index_type, index_class in expected.items():
+            index = self._index(index_type, embeddings)
+            self.assertIsInstance(index, index_class, index_type)
+            self.assertEqual(index.metric_type, faiss.METRIC_INNER_PRODUCT)
+            self.assertEqual(index.ntotal, len(embeddings))
+
+    def test_auto_uses_hnsw_on_large_corpora(self):
+        index = self._index(
+            'auto', self._embeddings(HybridRetriever.HNSW_MIN_DOCS, dim=8))
+        self.assertIsInstance(index, faiss.IndexHNSWFlat)
+
+    def test_ivfpq_falls_back_to_flat_on_small_corpora(self):
+        self.assertIsInstance(
+            self._index('ivfpq', self._embeddings(100)), faiss.IndexFlatIP)
+
+    def test_recall(self):
+        embeddings = self._embeddings(1000)
+        # Approximate indices find a document from its own embedding
+        min_recall = {'flat': 1.0, 'hnsw': 0.95, 'ivf': 0.8, 'ivfpq': 0.5}
+        for index_type, expected in min_recall.items():
+            _, ids = self._index(index_type,
+                                 embeddings).search(embeddings[:200], 1)
+            recall = np.mean(ids[:, 0] == np.arange(200))
+            self.assertGreaterEqual(recall, expected, index_type)
+
+
+class TestDenseIndexCache(unittest.TestCase):
+    """Sharing of dense indices between retrievers"""
+
+    def setUp(self):
+        clear_dense_index_cache()
+        self.addCleanup(clear_dense_index_cache)
+        self.addCleanup(set_dense_index_cache_size,
+                        hybrid_retriever._DENSE_INDEX_CACHE_SIZE)
+
+    def test_same_corpus_reuses_index(self):
+        first, second = make_retriever(), make_retriever()
+        self.assertIs(first.index, second.index)
+        self.assertIsNot(make_retriever(CORPUS[:-1]).index, first.index)
+
+    def test_gpu_copies_are_not_shared(self):
+        copies = []
+
+        def to_gpu(retriever, index):
+            copies.append(index)
+            return faiss.clone_index(index)
+
+        with mock.patch.object(HybridRetriever, '_maybe_to_gpu', to_gpu):
+            first, second = make_retriever(), make_retriever()
+        # Both copies are made from the one shared CPU index
+        self.assertIs(copies[0], copies[1])
+        self.assertIsNot(first.index, second.index)
+
+    def test_clear(self):
+        first = make_retriever()
+        clear_dense_index_cache()
+        self.assertIsNot(make_retriever().index, first.index)
+
+    def test_size(self):
+        set_dense_index_cache_size(1)
+        first = make_retriever()
+        make_retriever(CORPUS[:-1])
+        self.assertIsNot(make_retriever().index, first.index)
+        set_dense_index_cache_size(0)
+        self.assertIsNot(make_retriever().index, make_retriever().index)
+
+
+if __name__ == '__main__':
+    unittest.main()
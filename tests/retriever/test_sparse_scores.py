@@ -0,0 +1,53 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import unittest
+
+import numpy as np
+from corpus_util import random_corpus
+from ms_agent.retriever.hybrid_retriever import BM25Retriever, HybridRetriever
+
+
+class TestSparseScores(unittest.TestCase):
+    """BM25 scores fed to the hybrid fusion, without embedding models"""
+
+    def setUp(self):
+        self.tokenized_corpus = random_corpus(800)
+        # Only the state used by sparse scoring and fusion
+        self.retriever = HybridRetriever.__new__(HybridRetriever)
+        self.retriever.corpus = [
+            ' '.join(doc) for doc in self.tokenized_corpus
+        ]
+        self.retriever.bm25 = BM25Retriever(self.tokenized_corpus)
+        self.retriever.bm25_top_k = None
+        self.retriever._segment_query = str.split
+        self.query = 'w3 w17 w42 w150'
+
+    def test_full_corpus_is_scored_by_default(self):
+        scores = self.retriever._compute_sparse_scores(self.query)
+        np.testing.assert_array_equal(
+            scores, self.retriever.bm25.get_scores(self.query.split()))
+
+    def test_ranking_parity_with_exact_scoring(self):
+        rng = np.random.default_rng(1)
+        dense = rng.random(len(self.retriever.corpus)).astype(np.float32)
+        exact = self.retriever._fuse_and_normalize_scores(
+            dense, self.retriever.bm25.get_scores(self.query.split()), 0.5)
+        fused = self.retriever._fuse_and_normalize_scores(
+            dense, self.retriever._compute_sparse_scores(self.query), 0.5)
+        self.assertEqual(
+            self.retriever._filter_and_rank(fused, 10, 0.0),
+            self.retriever._filter_and_rank(exact, 10, 0.0))
+
+    def test_top_k_option_scores_top_documents_exactly(self):
+        self.retriever.bm25_top_k = 50
+        scores = self.retriever._compute_sparse_scores(self.query)
+        exact = self.retriever.bm25.get_scores(self.query.split())
+        top = np.flatnonzero(scores)
+        self.assertLessEqual(len(top), 50)
+        np.testing.assert_allclose(scores[top], exact[top], rtol=1e-5)
+        self.assertEqual(
+            set(top.tolist()),
+            set(np.argsort(-exact, kind='stable')[:len(top)].tolist()))
+
+
+if __name__ == '__main__':
+    unittest.main()
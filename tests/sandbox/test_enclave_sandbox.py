@@ -0,0 +1,156 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import asyncio
+import sys
+import threading
+import types
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from ms_agent.sandbox.sandbox import EnclaveSandbox
+
+
+class FakeDockerSandbox:
+    """In-memory stand-in for an `ms-enclave` Docker sandbox."""
+
+    instances = []
+
+    def __init__(self):
+        self.loop = None
+        self.closed = False
+        self.commands = []
+        self.calls = []
+        self.events = []
+        self.files = set()
+        FakeDockerSandbox.instances.append(self)
+
+    def _check_loop(self):
+        # The real sandbox is bound to the loop it was opened on
+        assert asyncio.get_running_loop() is self.loop, 'used on another loop'
+        assert not self.closed, 'used after close'
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._check_loop()
+        self.closed = True
+
+    async def execute_tool(self, tool_name, params):
+        self._check_loop()
+        self.calls.append(params.get('code'))
+        self.events.append(f'start {params.get("code")}')
+        await asyncio.sleep(0.01)
+        self.events.append(f'end {params.get("code")}')
+        return SimpleNamespace(
+            output=f'ran {params.get("code")}', error='', status=0)
+
+    async def execute_command(self, command):
+        self._check_loop()
+        self.commands.append(command)
+        exit_code = 0
+        if command.startswith('test -f '):
+            exit_code = 0 if command.split()[-1] in self.files else 1
+        elif 'touch ' in command:
+            self.files.add(command.split('touch ')[1].split()[0])
+        return SimpleNamespace(
+            stdout=command, stderr='', status=exit_code, exit_code=exit_code)
+
+
+def _fake_enclave_modules():
+    sandbox_module = types.ModuleType('ms_enclave.sandbox')
+    sandbox_module.SandboxFactory = SimpleNamespace(
+        create_sandbox=lambda sandbox_type, config: FakeDockerSandbox())
+    model_module = types.ModuleType('ms_enclave.sandbox.model')
+    model_module.SandboxType = SimpleNamespace(DOCKER='docker')
+    return {
+        'ms_enclave': types.ModuleType('ms_enclave'),
+        'ms_enclave.sandbox': sandbox_module,
+        'ms_enclave.sandbox.model': model_module,
+    }
+
+
+class TestEnclaveSandboxReuse(unittest.TestCase):
+    """Container lifecycle of EnclaveSandbox, without Docker"""
+
+    def setUp(self):
+        FakeDockerSandbox.instances = []
+        patcher = mock.patch.dict(sys.modules, _fake_enclave_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Skip the ms-enclave install and config of __init__
+        self.sandbox = EnclaveSandbox.__new__(EnclaveSandbox)
+        self.sandbox.sandbox_config = None
+        self.sandbox._owner = None
+        self.sandbox._owner_lock = threading.Lock()
+        self.addCleanup(self.sandbox.close)
+
+    def test_sync_calls_reuse_container(self):
+        first = self.sandbox.execute(python_code='a = 1')
+        second = self.sandbox.execute(python_code='print(a)')
+        self.assertEqual(first['python_executor'][0]['output'], 'ran a = 1')
+        self.assertEqual(second['python_executor'][0]['output'],
+                         'ran print(a)')
+        self.assertEqual(len(FakeDockerSandbox.instances), 1)
+
+    def test_sync_and_async_calls_share_container(self):
+        self.sandbox.execute(shell_command='ls')
+        asyncio.run(self.sandbox.async_execute(shell_command='pwd'))
+        asyncio.run(self.sandbox.async_execute(shell_command='id'))
+        self.sandbox.execute(shell_command='env')
+        self.assertEqual(len(FakeDockerSandbox.instances), 1)
+        self.assertEqual(FakeDockerSandbox.instances[0].commands,
+                         ['ls', 'pwd', 'id', 'env'])
+
+    def test_close_after_caller_loop_is_gone(self):
+        asyncio.run(self.sandbox.async_execute(python_code='x'))
+        owner = self.sandbox._owner
+        self.sandbox.close()
+        container = FakeDockerSandbox.instances[0]
+        self.assertTrue(container.closed)
+        owner.thread.join(timeout=5)
+        self.assertFalse(owner.thread.is_alive())
+        # A later call starts a fresh container
+        self.sandbox.execute(python_code='y')
+        self.assertEqual(len(FakeDockerSandbox.instances), 2)
+        self.assertEqual(container.calls, ['x'])
+
+    def test_items_run_in_order_by_default(self):
+        self.sandbox.execute(python_code=['write', 'read'])
+        self.assertEqual(
+            FakeDockerSandbox.instances[0].events,
+            ['start write', 'end write', 'start read', 'end read'])
+
+    def test_parallel_items_overlap(self):
+        self.sandbox.execute(python_code=['a', 'b'], parallel=True)
+        self.assertEqual(FakeDockerSandbox.instances[0].events[:2],
+                         ['start a', 'start b'])
+
+    def test_requirements_installed_once(self):
+        self.sandbox.execute(python_code='x', requirements=['numpy', 'rich'])
+        self.sandbox.execute(python_code='y', requirements=['rich', 'numpy'])
+        commands = FakeDockerSandbox.instances[0].commands
+        pip_commands = [c for c in commands if c.startswith('pip install')]
+        self.assertEqual(len(pip_commands), 1)
+        marker = commands[0].split()[-1]
+        self.assertEqual(commands[0], f'test -f {marker}')
+        # Writable for non-root container users
+        self.assertTrue(marker.startswith('/tmp/'))
+        self.assertIn(f'touch {marker}', pip_commands[0])
+
+    def test_async_context_manager(self):
+
+        async def run():
+            async with self.sandbox as sandbox:
+                await sandbox.async_execute(python_code='x')
+                await sandbox.async_execute(python_code='y')
+
+        asyncio.run(run())
+        self.assertEqual(len(FakeDockerSandbox.instances), 1)
+        self.assertTrue(FakeDockerSandbox.instances[0].closed)
+        self.assertIsNone(self.sandbox._owner)
+
+
+if __name__ == '__main__':
+    unittest.main()
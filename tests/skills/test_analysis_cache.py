@@ -0,0 +1,92 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import tempfile
+import unittest
+from pathlib import Path
+
+import json
+from ms_agent.skill.auto_skills import SkillAnalyzer
+
+
+class FakeLLM:
+    """Answers every prompt with the same plan, counting the calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, messages, **kwargs):
+        self.calls += 1
+        return type('Message', (), {'content': '{"can_handle": true}'})()
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """Bounding and deferred persistence of SkillAnalyzer analyses"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+        self.cache_file = self.cache_dir / 'analysis_cache.json'
+        self.llm = FakeLLM()
+
+    def _analyzer(self, **kwargs):
+        analyzer = SkillAnalyzer(
+            self.llm, cache_dir=self.cache_dir, cache_flush_delay=60, **kwargs)
+        self.addCleanup(analyzer.flush)
+        return analyzer
+
+    def test_repeated_prompt_is_cached(self):
+        analyzer = self._analyzer()
+        self.assertEqual(
+            analyzer._llm_generate_json('plan a'), {'can_handle': True})
+        self.assertEqual(
+            analyzer._llm_generate_json('plan a'), {'can_handle': True})
+        self.assertEqual(self.llm.calls, 1)
+
+    def test_least_recently_used_is_dropped(self):
+        analyzer = self._analyzer(max_cache_entries=2)
+        for prompt in ('a', 'b', 'a', 'c'):
+            analyzer._llm_generate_json(prompt)
+        self.assertEqual(self.llm.calls, 3)
+        self.assertEqual(len(analyzer._cache), 2)
+        # 'b' was evicted, 'a' was used again before 'c' came in
+        analyzer._llm_generate_json('a')
+        self.assertEqual(self.llm.calls, 3)
+        analyzer._llm_generate_json('b')
+        self.assertEqual(self.llm.calls, 4)
+
+    def test_writes_are_deferred_and_batched(self):
+        analyzer = self._analyzer()
+        analyzer._llm_generate_json('a')
+        analyzer._llm_generate_json('b')
+        self.assertFalse(self.cache_file.exists())
+        analyzer.flush()
+        with open(self.cache_file, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+        reloaded = self._analyzer()
+        reloaded._llm_generate_json('a')
+        reloaded._llm_generate_json('b')
+        self.assertEqual(self.llm.calls, 2)
+
+    def test_reload_keeps_most_recent_entries(self):
+        analyzer = self._analyzer()
+        for prompt in ('a', 'b', 'c'):
+            analyzer._llm_generate_json(prompt)
+        analyzer.flush()
+        reloaded = self._analyzer(max_cache_entries=2)
+        reloaded._llm_generate_json('c')
+        self.assertEqual(self.llm.calls, 3)
+        reloaded._llm_generate_json('a')
+        self.assertEqual(self.llm.calls, 4)
+
+    def test_timer_flushes_without_explicit_call(self):
+        analyzer = SkillAnalyzer(
+            self.llm, cache_dir=self.cache_dir, cache_flush_delay=0.01)
+        analyzer._llm_generate_json('a')
+        timer = analyzer._flush_timer
+        timer.join(timeout=5)
+        self.assertTrue(self.cache_file.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
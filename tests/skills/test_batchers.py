@@ -0,0 +1,164 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import asyncio
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import json
+from ms_agent.skill.auto_skills import SkillAnalyzer, _ErrorAnalysisBatcher
+from ms_agent.skill.schema import SkillFile, SkillSchema
+
+
+class ScriptedLLM:
+    """Records the requests and answers them with `respond(messages)`"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+
+    async def agenerate(self, messages):
+        self.requests.append(messages)
+        await asyncio.sleep(0)
+        return SimpleNamespace(content=json.dumps(self.respond(messages)))
+
+
+def _batch_answer(messages, skip=()):
+    """Answer a batched error analysis, echoing each task's id."""
+    tasks = re.findall(r'### Task (\d+)\n(\w+)', messages[-1].content)
+    return {
+        'results': [{
+            'task': int(number),
+            'fixed_code': prompt
+        } for number, prompt in tasks if prompt not in skip]
+    }
+
+
+def _single_answer(messages):
+    return {'fixed_code': messages[-1].content}
+
+
+def _respond(messages, skip=()):
+    if len(messages) > 1:
+        return _batch_answer(messages, skip)
+    return _single_answer(messages)
+
+
+class TestErrorAnalysisBatcher(unittest.TestCase):
+    """Batching of error analysis prompts submitted together"""
+
+    def _submit_all(self, batcher, prompts):
+
+        async def run():
+            return await asyncio.gather(
+                *[batcher.submit(prompt) for prompt in prompts])
+
+        return asyncio.run(run())
+
+    def test_concurrent_prompts_share_one_request(self):
+        llm = ScriptedLLM(_respond)
+        results = self._submit_all(_ErrorAnalysisBatcher(llm), ['a', 'b', 'c'])
+        self.assertEqual(len(llm.requests), 1)
+        self.assertEqual([r['fixed_code'] for r in results], ['a', 'b', 'c'])
+
+    def test_single_prompt_is_sent_as_is(self):
+        llm = ScriptedLLM(_respond)
+        results = self._submit_all(_ErrorAnalysisBatcher(llm), ['a'])
+        self.assertEqual(len(llm.requests[0]), 1)
+        self.assertEqual(results, [{'fixed_code': 'a'}])
+
+    def test_max_batch_splits_requests(self):
+        llm = ScriptedLLM(_respond)
+        results = self._submit_all(
+            _ErrorAnalysisBatcher(llm, max_batch=2), ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(len(llm.requests), 3)
+        self.assertEqual([r['fixed_code'] for r in results],
+                         ['a', 'b', 'c', 'd', 'e'])
+
+    def test_missing_tasks_fall_back_to_single_requests(self):
+        llm = ScriptedLLM(lambda messages: _respond(messages, skip=('b', )))
+        results = self._submit_all(_ErrorAnalysisBatcher(llm), ['a', 'b', 'c'])
+        self.assertEqual([r['fixed_code'] for r in results], ['a', 'b', 'c'])
+        self.assertEqual(len(llm.requests), 2)
+
+    def test_failed_request_resolves_every_prompt(self):
+
+        async def fail(messages):
+            raise RuntimeError('unavailable')
+
+        llm = SimpleNamespace(agenerate=fail)
+        results = self._submit_all(_ErrorAnalysisBatcher(llm), ['a', 'b'])
+        self.assertEqual(results, [{}, {}])
+
+
+class TestSkillPlanBatch(unittest.TestCase):
+    """One plan request for the skills of a parallel group"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.skills = []
+        for skill_id in ('pdf', 'xlsx', 'pptx'):
+            skill_path = Path(tmp.name) / skill_id
+            skill_path.mkdir()
+            (skill_path / 'SKILL.md').write_text(f'# {skill_id}')
+            self.skills.append(
+                SkillSchema(
+                    skill_id=skill_id,
+                    name=skill_id,
+                    description=f'Work with {skill_id} files',
+                    content=f'# {skill_id}',
+                    files=[
+                        SkillFile(
+                            name='SKILL.md',
+                            type='.md',
+                            path=skill_path / 'SKILL.md')
+                    ],
+                    skill_path=skill_path))
+
+    def _analyze(self, respond):
+        llm = ScriptedLLM(respond)
+        contexts = asyncio.run(
+            SkillAnalyzer(llm).async_analyze_skills_batch(
+                self.skills, 'make a report'))
+        return llm, contexts
+
+    @staticmethod
+    def _plans(skill_ids):
+        return {
+            'plans': [{
+                'skill_id': skill_id,
+                'can_handle': True,
+                'plan_summary': f'use {skill_id}'
+            } for skill_id in skill_ids]
+        }
+
+    def test_one_request_for_all_skills(self):
+        llm, contexts = self._analyze(
+            lambda messages: self._plans(['pdf', 'xlsx', 'pptx']))
+        self.assertEqual(len(llm.requests), 1)
+        self.assertEqual(
+            {sid: c.plan.plan_summary
+             for sid, c in contexts.items()}, {
+                 'pdf': 'use pdf',
+                 'xlsx': 'use xlsx',
+                 'pptx': 'use pptx'
+             })
+
+    def test_missing_plans_are_analyzed_one_by_one(self):
+
+        def respond(messages):
+            prompt = messages[-1].content
+            if 'xlsx' in prompt and 'pptx' in prompt:
+                return self._plans(['pdf', 'xlsx'])
+            return {'can_handle': False, 'plan_summary': 'single'}
+
+        llm, contexts = self._analyze(respond)
+        self.assertEqual(len(llm.requests), 2)
+        self.assertEqual(contexts['pptx'].plan.plan_summary, 'single')
+        self.assertEqual(contexts['pdf'].plan.plan_summary, 'use pdf')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import json
+from ms_agent.skill import auto_skills
+from ms_agent.skill.auto_skills import DAGExecutor
+from ms_agent.skill.container import ExecutionInput, ExecutionOutput
+
+
+class FakeLLM:
+    """Answers every error analysis with a fix, counting the calls"""
+
+    def __init__(self, is_fixable=True):
+        self.is_fixable = is_fixable
+        self.calls = 0
+
+    async def agenerate(self, messages):
+        self.calls += 1
+        return SimpleNamespace(
+            content=json.dumps({
+                'error_analysis': {
+                    'error_type': 'NameError',
+                    'is_fixable': self.is_fixable
+                },
+                'fixed_code': 'print(1)'
+            }))
+
+
+class TestErrorAnalysisCache(unittest.TestCase):
+    """Reuse and invalidation of error analyses, no sandbox involved"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.workspace = Path(self._tmp.name)
+        self.cache_file = self.workspace / '.cache' / 'error_analysis_cache.json'
+        self.executor = self._make_executor()
+        self.skill = SimpleNamespace(skill_id='s1', name='s1')
+        self.runs = []
+
+    def _make_executor(self, cache_flush_delay=60):
+        # No container is used, the commands are patched in _run()
+        executor = DAGExecutor(
+            SimpleNamespace(workspace_dir=self.workspace), {},
+            llm=FakeLLM(),
+            enable_progressive_analysis=False,
+            max_retries=2,
+            cache_flush_delay=cache_flush_delay)
+        # No timer outlives the workspace
+        self.addCleanup(executor.flush)
+        return executor
+
+    def _run(self, results):
+        """Run `print(a)` once, the attempts exit with `results` in order."""
+        results = iter(results)
+
+        async def execute_command(cmd, cmd_type, skill_id, exec_input,
+                                  context):
+            self.runs.append(cmd['code'])
+            exit_code = next(results)
+            return ExecutionOutput(
+                stderr='' if exit_code == 0 else
+                'File "/tmp/run_1.py", line 3\nNameError: a',
+                exit_code=exit_code)
+
+        with mock.patch.object(self.executor, '_execute_command',
+                               execute_command):
+            return asyncio.run(
+                self.executor._execute_command_with_retry({'code': 'print(a)'},
+                                                          'python_code', 's1',
+                                                          ExecutionInput(),
+                                                          None, self.skill,
+                                                          'query'))
+
+    def test_fix_is_reused(self):
+        self._run([1, 0])
+        self._run([1, 0])
+        self.assertEqual(self.executor.llm.calls, 1)
+        self.assertEqual(self.runs, ['print(a)', 'print(1)'] * 2)
+
+    def test_failed_fix_is_dropped(self):
+        self._run([1, 1])
+        self.assertEqual(len(self.executor._analysis_cache), 0)
+        self._run([1, 0])
+        self.assertEqual(self.executor.llm.calls, 2)
+
+    def test_fix_is_reused_by_next_process(self):
+        self._run([1, 0])
+        # Written by the flush timer or at the end of execute(), not inline
+        self.assertFalse(self.cache_file.exists())
+        self.executor.flush()
+        self.assertTrue(self.cache_file.exists())
+
+        self.executor = self._make_executor()
+        self._run([1, 0])
+        self.assertEqual(self.executor.llm.calls, 0)
+
+    def test_failed_fix_is_dropped_from_disk(self):
+        self._run([1, 0])
+        self.executor.flush()
+        self.executor = self._make_executor()
+        self._run([1, 1])
+        self.assertEqual(self.executor.llm.calls, 0)
+        self.executor.flush()
+
+        self.assertEqual(len(self._make_executor()._analysis_cache), 0)
+
+    def test_flush_timer(self):
+        self.executor = self._make_executor(cache_flush_delay=0.01)
+        self._run([1, 0])
+        # None if it already fired
+        timer = self.executor._analysis_flush_timer
+        if timer is not None:
+            timer.join(timeout=5)
+        self.assertTrue(self.cache_file.exists())
+
+    def test_unfixable_verdict_is_not_cached(self):
+        self.executor.llm = FakeLLM(is_fixable=False)
+        self._run([1, 1])
+        self._run([1, 1])
+        self.assertEqual(self.executor.llm.calls, 2)
+        self.assertEqual(len(self.executor._analysis_cache), 0)
+
+    def test_cache_size_is_bounded(self):
+        output = ExecutionOutput(stderr='NameError', exit_code=1)
+        with mock.patch.object(auto_skills, '_ERROR_ANALYSIS_CACHE_SIZE', 2):
+            for code in ('a', 'b', 'a', 'c'):
+                asyncio.run(
+                    self.executor._analyze_execution_error(
+                        self.skill, code, output, 'query', 1, 'python_code'))
+        self.assertEqual(self.executor.llm.calls, 3)
+        # 'b' is the least recently used one
+        cached_codes = [
+            code
+            for code in ('a', 'b', 'c') if self.executor._error_analysis_key(
+                's1', 'python_code', code, 'NameError') in
+            self.executor._analysis_cache
+        ]
+        self.assertEqual(cached_codes, ['a', 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import tempfile
+import unittest
+import asyncio
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from ms_agent.skill.auto_skills import AutoSkills, SkillDAGResult
+from ms_agent.skill.semantic_cache import SemanticCache
+
+
+def _unit(*values):
+    vec = np.asarray(values, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+class TestSemanticCache(unittest.TestCase):
+    """Lookups, expiry, eviction and persistence of SemanticCache"""
+
+    def test_hit(self):
+        cache = SemanticCache(dim=3, tau=0.9)
+        cache.put(_unit(1, 0, 0), 'dag')
+        value, sim = cache.get(_unit(1, 0.1, 0))
+        self.assertEqual(value, 'dag')
+        self.assertGreaterEqual(sim, 0.9)
+
+    def test_miss(self):
+        cache = SemanticCache(dim=3, tau=0.9)
+        self.assertEqual(cache.get(_unit(1, 0, 0)), (None, 0.0))
+        cache.put(_unit(1, 0, 0), 'dag')
+        value, sim = cache.get(_unit(0, 1, 0))
+        self.assertIsNone(value)
+        self.assertLess(sim, 0.9)
+
+    def test_most_similar_entry_wins(self):
+        cache = SemanticCache(dim=3, tau=0.5)
+        cache.put(_unit(1, 0, 0), 'x')
+        cache.put(_unit(0, 1, 0), 'y')
+        self.assertEqual(cache.get(_unit(0.2, 1, 0))[0], 'y')
+
+    def test_ttl(self):
+        cache = SemanticCache(dim=3, tau=0.9, ttl=10)
+        with mock.patch('time.time', return_value=1000.0):
+            cache.put(_unit(1, 0, 0), 'old')
+        with mock.patch('time.time', return_value=1005.0):
+            cache.put(_unit(0, 1, 0), 'new')
+            self.assertEqual(cache.get(_unit(1, 0, 0))[0], 'old')
+        with mock.patch('time.time', return_value=1011.0):
+            self.assertIsNone(cache.get(_unit(1, 0, 0))[0])
+            self.assertEqual(cache.get(_unit(0, 1, 0))[0], 'new')
+        self.assertEqual(len(cache), 1)
+
+    def test_lru_eviction(self):
+        cache = SemanticCache(dim=3, tau=0.9, max_entries=2)
+        with mock.patch('time.time', return_value=1.0):
+            cache.put(_unit(1, 0, 0), 'x')
+        with mock.patch('time.time', return_value=2.0):
+            cache.put(_unit(0, 1, 0), 'y')
+        # Using 'x' makes 'y' the least recently used entry
+        with mock.patch('time.time', return_value=3.0):
+            self.assertEqual(cache.get(_unit(1, 0, 0))[0], 'x')
+        with mock.patch('time.time', return_value=4.0):
+            cache.put(_unit(0, 0, 1), 'z')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(_unit(0, 1, 0))[0])
+        self.assertEqual(cache.get(_unit(1, 0, 0))[0], 'x')
+        self.assertEqual(cache.get(_unit(0, 0, 1))[0], 'z')
+
+    def test_put_does_not_write_until_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'semcache.faiss'
+            cache = SemanticCache(dim=3, tau=0.9, path=path)
+            cache.put(_unit(1, 0, 0), {'dag': ['a']})
+            self.assertFalse(path.exists())
+            cache.save()
+            self.assertTrue(path.exists())
+
+            reloaded = SemanticCache(dim=3, tau=0.9, path=path)
+            self.assertEqual(reloaded.get(_unit(1, 0, 0))[0], {'dag': ['a']})
+
+    def test_reload_ignores_dimension_mismatch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'semcache.faiss'
+            cache = SemanticCache(dim=3, path=path)
+            cache.put(_unit(1, 0, 0), 'x')
+            cache.save()
+            self.assertEqual(len(SemanticCache(dim=4, path=path)), 0)
+
+
+class FakeRetriever:
+
+    def embed_query(self, query):
+        return _unit(1, 0, 0)
+
+
+class TestAutoSkillsSemanticCache(unittest.TestCase):
+    """Only skill DAGs are stored in the semantic cache of AutoSkills"""
+
+    def setUp(self):
+        self.auto = AutoSkills.__new__(AutoSkills)
+        self.auto.all_skills = {'pdf': object()}
+        self.auto.retriever = FakeRetriever()
+        self.auto._semantic_cache = SemanticCache(dim=3, tau=0.9)
+
+    def _get_dag(self, result):
+        with mock.patch.object(
+                self.auto,
+                '_get_skill_dag',
+                new=mock.AsyncMock(return_value=result)) as planner:
+            dag = asyncio.run(self.auto.get_skill_dag('query'))
+        return dag, planner.await_count
+
+    def test_skill_dag_cached(self):
+        result = SkillDAGResult(
+            dag={'pdf': []},
+            execution_order=['pdf'],
+            selected_skills={'pdf': self.auto.all_skills['pdf']},
+            is_complete=True)
+        self.assertEqual(self._get_dag(result)[1], 1)
+        dag, calls = self._get_dag(None)
+        self.assertEqual(calls, 0)
+        self.assertEqual(dag.execution_order, ['pdf'])
+        self.assertNotIn('chat_response',
+                         self.auto._semantic_cache.get(_unit(1, 0, 0))[0])
+
+    def test_chat_response_not_cached(self):
+        result = SkillDAGResult(is_complete=True, chat_response='Hello!')
+        self._get_dag(result)
+        self.assertEqual(len(self.auto._semantic_cache), 0)
+        self.assertEqual(self._get_dag(result)[1], 1)
+
+    def test_chat_entry_on_disk_not_replayed(self):
+        self.auto._semantic_cache.put(
+            _unit(1, 0, 0), {
+                'dag': {},
+                'execution_order': [],
+                'selected_skill_ids': [],
+                'is_complete': True,
+                'chat_response': 'Hello!',
+            })
+        result = SkillDAGResult(is_complete=True, chat_response='Hi again')
+        dag, calls = self._get_dag(result)
+        self.assertEqual(calls, 1)
+        self.assertEqual(dag.chat_response, 'Hi again')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# Copyright (c) ModelScope Contributors. All rights reserved.
+import unittest
+
+import json
+from ms_agent.skill import auto_skills
+from ms_agent.skill.auto_skills import DAGExecutor
+from ms_agent.skill.container import ExecutionOutput
+
+
+class TestUpstreamOutputs(unittest.TestCase):
+    """Size of the UPSTREAM_OUTPUTS environment variable"""
+
+    def setUp(self):
+        # Only the state used to link upstream outputs
+        self.executor = DAGExecutor.__new__(DAGExecutor)
+        self.executor._outputs = {}
+        self.executor._upstream_cache = {}
+
+    def _upstream_outputs(self, outputs):
+        self.executor._outputs.update(outputs)
+        dag = {'sink': list(outputs)}
+        env_vars = self.executor._build_execution_input('sink', dag).env_vars
+        return env_vars['UPSTREAM_OUTPUTS']
+
+    def test_small_outputs_are_passed_as_is(self):
+        value = self._upstream_outputs(
+            {'a': ExecutionOutput(stdout='hello', return_value={'n': 1})})
+        data = json.loads(value)['a']
+        self.assertEqual(data['stdout'], 'hello')
+        self.assertEqual(data['return_value'], {'n': 1})
+        self.assertNotIn('truncated', data)
+
+    def test_whole_value_is_capped(self):
+        # Escaped and multi-byte text, and a large return value
+        outputs = {
+            f'skill-{i}': ExecutionOutput(
+                stdout='"\\n' * 5000,
+                stderr='错误' * 5000,
+                return_value=list(range(20000)))
+            for i in range(12)
+        }
+        value = self._upstream_outputs(outputs)
+        self.assertLessEqual(
+            len(value.encode('utf-8')), auto_skills._UPSTREAM_OUTPUTS_LIMIT)
+        data = json.loads(value)
+        self.assertEqual(set(data), set(outputs))
+        for entry in data.values():
+            self.assertTrue(entry['truncated'])
+            self.assertTrue(entry['stdout'].startswith('"\\n'))
+
+    def test_only_oversized_outputs_are_shrunk(self):
+        value = self._upstream_outputs({
+            'big':
+            ExecutionOutput(return_value='x' * 200000),
+            'small':
+            ExecutionOutput(stdout='ok', return_value=[1, 2]),
+        })
+        data = json.loads(value)
+        self.assertTrue(data['big']['truncated'])
+        self.assertEqual(data['small']['return_value'], [1, 2])
+        self.assertNotIn('truncated', data['small'])
+
+
+if __name__ == '__main__':
+    unittest.main()